@@ -0,0 +1,248 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import asyncio
+import datetime
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List, Optional
+
+from bs4 import Tag
+
+from amazonorders import constants, css
+from amazonorders.async_session import AsyncAmazonSession
+from amazonorders.conf import DEFAULT_OUTPUT_DIR
+from amazonorders.entity.compact import compact
+from amazonorders.entity.order import Order
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.orders import parse_order_details_page
+from amazonorders.session import validate_html_parser
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAmazonOrders:
+    """
+    An ``asyncio`` equivalent of :class:`~amazonorders.orders.AmazonOrders`. Using an authenticated
+    :class:`~amazonorders.async_session.AsyncAmazonSession`, can be used to query Amazon for Order details and
+    history.
+    """
+
+    def __init__(self,
+                 amazon_session: AsyncAmazonSession,
+                 debug: bool = False,
+                 output_dir: Optional[str] = None,
+                 max_workers: int = 10,
+                 html_parser: Optional[str] = None,
+                 keep_parsed: bool = False,
+                 compact: bool = False,
+                 parse_processes: int = 0) -> None:
+        if not output_dir:
+            output_dir = DEFAULT_OUTPUT_DIR
+
+        #: The AsyncAmazonSession to use for requests.
+        self.amazon_session: AsyncAmazonSession = amazon_session
+
+        #: Set logger ``DEBUG`` and send output to ``stderr``.
+        self.debug: bool = debug
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+        #: The directory where any output files will be produced, defaults to ``conf.DEFAULT_OUTPUT_DIR``.
+        self.output_dir = output_dir
+        #: The maximum number of Order details requests that will be awaited concurrently.
+        self.max_workers: int = max_workers
+        #: The BeautifulSoup parser to build Orders with, defaults to the ``AsyncAmazonSession``'s ``html_parser``.
+        self.html_parser: str = validate_html_parser(html_parser) if html_parser else amazon_session.html_parser
+        #: Keep the pages Orders from history crawls are parsed from, and ``parsed`` on the Orders, for debugging.
+        #: Otherwise, each Order is detached (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it is
+        #: parsed, and its page is decomposed, so memory doesn't grow with every page crawled.
+        self.keep_parsed: bool = keep_parsed
+        #: Return Orders from history crawls as compact entities (see
+        #: :func:`~amazonorders.entity.compact.compact`), which take a fraction of the memory. Ignored when
+        #: ``keep_parsed`` is set.
+        self.compact: bool = compact
+        #: The number of processes to parse Order details pages from history crawls in. When greater than ``0``, the
+        #: HTML of each details page is sent to a :class:`~concurrent.futures.ProcessPoolExecutor`, so parsing doesn't
+        #: block the event loop, and scales with cores. A single Order from :func:`get_order` is parsed in process.
+        #: See :attr:`~amazonorders.orders.AmazonOrders.parse_processes`. Call :func:`close` to shut the pool down.
+        self.parse_processes: int = parse_processes
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
+        if self.parse_processes > 0:
+            # Processes are only started once pages are submitted. They are spawned, rather than forked, as forking
+            # while other threads hold locks can deadlock the child. Each worker compiles the selectors
+            # when it starts, as it can't share those compiled here
+            self._parse_executor = ProcessPoolExecutor(max_workers=self.parse_processes,
+                                                       mp_context=multiprocessing.get_context("spawn"),
+                                                       initializer=css.precompile)
+
+        # Selectors are compiled up front (once per process, as they are cached), so the first page parsed doesn't
+        # pay for them
+        css.precompile()
+
+    async def close(self) -> None:
+        """
+        Shut down the pool of processes Order details pages are parsed in, if ``parse_processes`` is set.
+        """
+        if self._parse_executor:
+            self._parse_executor.shutdown()
+            self._parse_executor = None
+
+    async def get_order_history(self,
+                                year: int = datetime.date.today().year,
+                                start_index: Optional[int] = None,
+                                full_details: bool = False,
+                                stop_before_date: datetime.date = None) -> List[Order]:
+        """
+        Get the Amazon order history for the given year.
+
+        :param year: The year for which to get history.
+        :param start_index: The index to start at within the history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it. Up to ``max_workers`` of these requests are awaited concurrently.
+        :param stop_before_date: Stop paging when an Order placed before this date is reached.
+        :return: A list of the requested Orders.
+        """
+        return [order async for order in self.iter_order_history(year=year,
+                                                                 start_index=start_index,
+                                                                 full_details=full_details,
+                                                                 stop_before_date=stop_before_date)]
+
+    async def iter_order_history(self,
+                                 year: int = datetime.date.today().year,
+                                 start_index: Optional[int] = None,
+                                 full_details: bool = False,
+                                 stop_before_date: datetime.date = None) -> AsyncIterator[Order]:
+        """
+        Iterate the Amazon order history for the given year, yielding each Order as soon as it has been parsed.
+        Pages of history are only requested as the iterator is consumed.
+
+        :param year: The year for which to get history.
+        :param start_index: The index to start at within the history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it. Up to ``max_workers`` of these requests are awaited concurrently.
+        :param stop_before_date: Stop paging when an Order placed before this date is reached.
+        :return: An async iterator of the requested Orders.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AsyncAmazonSession.login() to authenticate first.")
+
+        await self.amazon_session.get(constants.ORDER_HISTORY_LANDING_URL)
+        if not css.select_one(self.amazon_session.last_response_parsed, "select[name='timeFilter']"):
+            constants.HISTORY_FILTER_QUERY_PARAM = "orderFilter"
+
+        optional_start_index = f"&startIndex={start_index}" if start_index else ""
+        next_page = ("{url}?{query_param}=year-{year}"
+                     "{optional_start_index}").format(url=constants.ORDER_HISTORY_URL,
+                                                      query_param=constants.HISTORY_FILTER_QUERY_PARAM,
+                                                      year=year,
+                                                      optional_start_index=optional_start_index)
+        parse_only = css.compile_strainer(*constants.ORDER_HISTORY_PARSE_ONLY_SELECTORS)
+        while next_page:
+            await self.amazon_session.get(next_page, parse_only=parse_only)
+            response_parsed = self.amazon_session.last_response_parsed
+
+            page_orders = []
+            stop = False
+            for order_tag in css.select(response_parsed, constants.ORDER_HISTORY_ENTITY_SELECTOR):
+                order = Order(order_tag, html_parser=self.html_parser)
+
+                if (stop_before_date is not None) and order.order_placed_date < stop_before_date:
+                    stop = True
+                    break
+
+                page_orders.append(order)
+
+            next_page_link = None
+            next_page_tag = css.select_one(response_parsed, constants.NEXT_PAGE_LINK_SELECTOR)
+            if next_page_tag:
+                next_page_link = next_page_tag["href"]
+                if not next_page_link.startswith("http"):
+                    next_page_link = f"{constants.BASE_URL}{next_page_link}"
+
+            page_orders = self._detach(page_orders, response_parsed)
+
+            if full_details:
+                page_orders = await self._get_orders_full_details(page_orders)
+
+            for order in page_orders:
+                yield order
+
+            if stop:
+                return
+
+            next_page = None
+            if start_index is None:
+                next_page = next_page_link
+                if not next_page:
+                    logger.debug("No next page")
+            else:
+                logger.debug("start_index is given, not paging")
+
+    async def _get_orders_full_details(self,
+                                       orders: List[Order]) -> List[Order]:
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def get_order_full_details(order: Order) -> Order:
+            async with semaphore:
+                return await self._get_order_full_details(order)
+
+        # gather() returns results in the order given, so Orders are returned as they would be serially
+        return list(await asyncio.gather(*[get_order_full_details(order) for order in orders]))
+
+    async def _get_order_full_details(self,
+                                      order: Order) -> Order:
+        if "order-details" not in order.order_details_link:
+            return order
+
+        if self._parse_executor:
+            await self.amazon_session.get(order.order_details_link)
+
+            return await asyncio.get_running_loop().run_in_executor(self._parse_executor, parse_order_details_page,
+                                                                    self.amazon_session.last_response.text,
+                                                                    self.html_parser, order, self.compact)
+
+        await self.amazon_session.get(order.order_details_link,
+                                      parse_only=css.compile_strainer(*constants.ORDER_DETAILS_PARSE_ONLY_SELECTORS))
+        # No await between the request and reading its parsed response, so no other coroutine can replace it
+        order_details_tag = css.select_one(self.amazon_session.last_response_parsed,
+                                           constants.ORDER_DETAILS_ENTITY_SELECTOR)
+
+        order = Order(order_details_tag, full_details=True, clone=order, html_parser=self.html_parser)
+        order = self._detach([order], self.amazon_session.last_response_parsed)[0]
+
+        return order
+
+    def _detach(self,
+                orders: List[Order],
+                response_parsed: Tag) -> List[Order]:
+        if self.keep_parsed:
+            return orders
+
+        for order in orders:
+            order.detach()
+        response_parsed.decompose()
+
+        return compact(orders) if self.compact else orders
+
+    async def get_order(self,
+                        order_id: str) -> Order:
+        """
+        Get the Amazon order represented by the ID.
+
+        :param order_id: The Amazon Order ID to lookup.
+        :return: The requested Order.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AsyncAmazonSession.login() to authenticate first.")
+
+        url = f"{constants.ORDER_DETAILS_URL}?orderID={order_id}"
+        # A single page is parsed here, as waiting on the parse pool for it would only add the cost of sending it
+        await self.amazon_session.get(url,
+                                      parse_only=css.compile_strainer(*constants.ORDER_DETAILS_PARSE_ONLY_SELECTORS))
+
+        order_details_tag = css.select_one(self.amazon_session.last_response_parsed,
+                                           constants.ORDER_DETAILS_ENTITY_SELECTOR)
+        order = Order(order_details_tag, full_details=True, html_parser=self.html_parser)
+
+        return order
@@ -0,0 +1,373 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Optional, Any, Dict
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from requests.utils import dict_from_cookiejar
+
+from amazonorders import constants
+from amazonorders.conf import DEFAULT_COOKIE_JAR_PATH, DEFAULT_OUTPUT_DIR, DEFAULT_HTML_PARSER
+from amazonorders.exception import AmazonOrdersAuthError
+from amazonorders.ratelimit import RateLimiter
+from amazonorders.retry import RetryPolicy
+from amazonorders.session import AUTH_FORMS, IODefault, validate_html_parser, get_rate_limit_state_path, \
+    supports_parse_only
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    raise ImportError("The async API requires `httpx`, install it with `pip install amazon-orders[async]`.")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAmazonSession:
+    """
+    An ``asyncio`` equivalent of :class:`~amazonorders.session.AmazonSession`, backed by an
+    :class:`httpx.AsyncClient`. The client's connection pool is shared across all requests made on the session, so
+    many requests can be awaited concurrently.
+
+    Session cookies are persisted to the same cookie jar format as :class:`~amazonorders.session.AmazonSession`, so
+    the two can be used interchangeably.
+
+    To get started, call the :func:`login` function.
+    """
+
+    def __init__(self,
+                 username: str,
+                 password: str,
+                 debug: bool = False,
+                 max_auth_attempts: int = 10,
+                 cookie_jar_path: str = None,
+                 io: IODefault = IODefault(),
+                 output_dir: str = None,
+                 max_connections: int = 10,
+                 html_parser: str = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None) -> None:
+        if not cookie_jar_path:
+            cookie_jar_path = DEFAULT_COOKIE_JAR_PATH
+        if not output_dir:
+            output_dir = DEFAULT_OUTPUT_DIR
+        if not html_parser:
+            html_parser = DEFAULT_HTML_PARSER
+
+        #: An Amazon username.
+        self.username: str = username
+        #: An Amazon password.
+        self.password: str = password
+
+        #: Set logger ``DEBUG``, send output to ``stderr``, and write an HTML file for requests made on the session.
+        self.debug: bool = debug
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+        #: Will continue in :func:`login`'s auth flow this many times (successes and failures).
+        self.max_auth_attempts: int = max_auth_attempts
+        #: The path to persist session cookies, defaults to ``conf.DEFAULT_COOKIE_JAR_PATH``.
+        self.cookie_jar_path: str = cookie_jar_path
+        #: The I/O handler for echoes and prompts.
+        self.io: IODefault = io
+        #: The directory where any output files will be produced, defaults to ``conf.DEFAULT_OUTPUT_DIR``.
+        self.output_dir = output_dir
+        #: The maximum number of connections the shared connection pool will open.
+        self.max_connections: int = max_connections
+        #: The BeautifulSoup parser to build trees with, defaults to ``conf.DEFAULT_HTML_PARSER``.
+        self.html_parser: str = validate_html_parser(html_parser)
+        #: If set, each request will first take a token from this limiter, awaiting if necessary. If its
+        #: ``state_path`` is not set, it is set alongside ``cookie_jar_path``.
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        if self.rate_limiter and not self.rate_limiter.state_path:
+            self.rate_limiter.state_path = get_rate_limit_state_path(self.cookie_jar_path)
+        #: If set, requests that fail with a transient error will be retried as determined by this policy.
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        #: Seconds to wait for a connection to be established, or ``None`` to use the ``httpx`` default.
+        self.connect_timeout: Optional[float] = connect_timeout
+        #: Seconds to wait for the server to send data, or ``None`` to use the ``httpx`` default.
+        self.read_timeout: Optional[float] = read_timeout
+
+        #: The shared client to be used across all requests.
+        self.session: httpx.AsyncClient = self._build_client()
+        #: If :func:`login` has been executed and successfully logged in the session.
+        self.is_authenticated: bool = False
+
+        self._last_response: Optional[httpx.Response] = None
+        self._last_response_parsed: Optional[Tag] = None
+        self._last_response_parse_only: Optional[SoupStrainer] = None
+
+        self._requests: int = 0
+        self._total_elapsed: float = 0.0
+        self._max_elapsed: float = 0.0
+
+        cookie_dir = os.path.dirname(self.cookie_jar_path)
+        if not os.path.exists(cookie_dir):
+            os.makedirs(cookie_dir)
+        if os.path.exists(self.cookie_jar_path):
+            with open(self.cookie_jar_path, "r", encoding="utf-8") as f:
+                data = json.loads(f.read())
+                cookies = requests.utils.cookiejar_from_dict(data)
+                self.session.cookies.update(cookies)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def last_response(self) -> Optional[httpx.Response]:
+        """
+        The last response executed on the Session.
+        """
+        return self._last_response
+
+    @last_response.setter
+    def last_response(self,
+                      value: Optional[httpx.Response]) -> None:
+        self._last_response = value
+        self._last_response_parsed = None
+        self._last_response_parse_only = None
+
+    @property
+    def last_response_parsed(self) -> Optional[Tag]:
+        """
+        A parsed representation of the last response executed on the Session. The response is only parsed the first
+        time this is accessed. If the request was given ``parse_only``, only the parts of the response it matches are
+        built.
+        """
+        if self._last_response_parsed is None and self._last_response is not None:
+            parse_only = self._last_response_parse_only if supports_parse_only(self.html_parser) else None
+            self._last_response_parsed = BeautifulSoup(self._last_response.text,
+                                                       self.html_parser,
+                                                       parse_only=parse_only)
+
+        return self._last_response_parsed
+
+    @last_response_parsed.setter
+    def last_response_parsed(self,
+                             value: Optional[Tag]) -> None:
+        self._last_response_parsed = value
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      parse_only: Optional[SoupStrainer] = None,
+                      **kwargs: Any) -> httpx.Response:
+        """
+        Execute the request against Amazon with base headers, storing the response (which is parsed lazily, see
+        ``last_response_parsed``) and persisting response cookies. If a ``retry_policy`` is set, transient failures
+        are retried before the response is returned.
+
+        Once awaited, ``last_response`` and ``last_response_parsed`` can be read before the next ``await`` without
+        another coroutine on the session replacing them.
+
+        :param method: The request method to execute.
+        :param url: The URL to execute ``method`` on.
+        :param parse_only: Only build the parts of the response this matches when it's parsed, see
+            :func:`~amazonorders.css.compile_strainer`.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`httpx.AsyncClient.request`.
+        :return: The Response from the executed request.
+        """
+        if "headers" not in kwargs:
+            kwargs["headers"] = {}
+        kwargs["headers"].update(constants.BASE_HEADERS)
+
+        logger.debug(f"{method} request to {url}")
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    logger.debug(f"Waiting {wait:.2f}s for the rate limiter")
+
+                    await asyncio.sleep(wait)
+
+            start = time.perf_counter()
+            response = await self.session.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - start
+            self._requests += 1
+            self._total_elapsed += elapsed
+            self._max_elapsed = max(self._max_elapsed, elapsed)
+
+            if not self.retry_policy:
+                break
+
+            backoff = self.retry_policy.next_backoff(method, url, attempt, response.status_code, response.text,
+                                                     response.headers.get("Retry-After"))
+            if backoff is None:
+                break
+
+            await asyncio.sleep(backoff)
+            attempt += 1
+
+        self.last_response = response
+        self._last_response_parse_only = parse_only
+
+        cookies = dict_from_cookiejar(self.session.cookies.jar)
+        if os.path.exists(self.cookie_jar_path):
+            os.remove(self.cookie_jar_path)
+        with open(self.cookie_jar_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(cookies))
+
+        logger.debug(f"Response: {response.url} - {response.status_code} in {elapsed:.3f}s")
+
+        if self.debug:
+            page_name = self._get_page_from_url(str(response.url))
+            with open(os.path.join(self.output_dir, page_name), "w",
+                      encoding="utf-8") as html_file:
+                logger.debug(
+                    f"Response written to file: {html_file.name}")
+                html_file.write(response.text)
+
+        return response
+
+    async def get(self,
+                  url: str,
+                  **kwargs: Any) -> httpx.Response:
+        """
+        Perform a GET request.
+
+        :param url: The URL to GET on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`AsyncAmazonSession.request`.
+        :return: The Response from the executed GET request.
+        """
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self,
+                   url,
+                   **kwargs: Any) -> httpx.Response:
+        """
+        Perform a POST request.
+
+        :param url: The URL to POST on.
+        :param kwargs: Remaining ``kwargs`` will be passed to :func:`AsyncAmazonSession.request`.
+        :return: The Response from the executed POST request.
+        """
+        return await self.request("POST", url, **kwargs)
+
+    def auth_cookies_stored(self):
+        cookies = dict_from_cookiejar(self.session.cookies.jar)
+        return cookies.get("session-token") and cookies.get("x-main")
+
+    async def login(self) -> None:
+        """
+        Execute an Amazon login process, following the same auth flow as
+        :func:`~amazonorders.session.AmazonSession.login`.
+
+        If successful, ``is_authenticated`` will be set to ``True``.
+        """
+        await self.get(constants.SIGN_IN_URL)
+
+        # If our local session data is stale, Amazon will redirect us to the signin page
+        if self.auth_cookies_stored() and \
+                str(self.last_response.url).split("?")[0] == constants.SIGN_IN_REDIRECT_URL:
+            await self.logout()
+            await self.get(constants.SIGN_IN_URL)
+
+        attempts = 0
+        while not self.is_authenticated and attempts < self.max_auth_attempts:
+            if self.auth_cookies_stored() or \
+                    ("Hello, sign in" not in self.last_response.text and
+                     "nav-item-signout" in self.last_response.text):
+                self.is_authenticated = True
+                break
+
+            form_found = False
+            for form in AUTH_FORMS:
+                if form.select_form(self, self.last_response_parsed):
+                    form_found = True
+
+                    form.fill_form()
+                    await form.submit_async()
+
+                    break
+
+            if not form_found:
+                self._raise_auth_error()
+
+            attempts += 1
+
+        if attempts == self.max_auth_attempts:
+            raise AmazonOrdersAuthError(
+                "Max authentication flow attempts reached.")
+
+    async def logout(self) -> None:
+        """
+        Logout of the existing Amazon session and clear cookies.
+        """
+        await self.get(constants.SIGN_OUT_URL)
+
+        if os.path.exists(self.cookie_jar_path):
+            os.remove(self.cookie_jar_path)
+
+        # Only cookies are cleared, so pooled connections can be reused by the next login
+        self.session.cookies.clear()
+
+        self.is_authenticated = False
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the session's counters for this process, suitable for exporting as metrics.
+
+        :return: The number of ``requests`` sent, and their ``total_elapsed`` and ``max_elapsed`` in seconds.
+        """
+        return {
+            "requests": self._requests,
+            "total_elapsed": self._total_elapsed,
+            "max_elapsed": self._max_elapsed,
+        }
+
+    async def close(self) -> None:
+        """
+        Close the underlying client and its connection pool.
+        """
+        await self.session.aclose()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        default_timeout = 5.0
+        timeout = httpx.Timeout(default_timeout,
+                                connect=self.connect_timeout if self.connect_timeout is not None else default_timeout,
+                                read=self.read_timeout if self.read_timeout is not None else default_timeout)
+
+        return httpx.AsyncClient(follow_redirects=True,
+                                 limits=httpx.Limits(max_connections=self.max_connections,
+                                                     max_keepalive_connections=self.max_connections),
+                                 timeout=timeout)
+
+    def _get_page_from_url(self,
+                           url: str) -> str:
+        page_name = os.path.splitext(os.path.basename(urlparse(url).path))[0]
+        if not page_name:
+            page_name = "index"
+
+        i = 0
+        filename_frmt = "{page_name}_{index}.html"
+        while os.path.isfile(filename_frmt.format(page_name=page_name, index=i)):
+            i += 1
+        return filename_frmt.format(page_name=page_name, index=i)
+
+    def _raise_auth_error(self):
+        debug_str = " To capture the page to a file, set the `debug` flag." if not self.debug else ""
+        if not self.last_response.is_error:
+            error_msg = (f"An error occurred, this is an unknown page, or its parsed contents don't match a "
+                         f"known auth flow: {self.last_response.url}.{debug_str}")
+        else:
+            error_msg = "An error occurred, the page {url} returned {status_code}."
+            if 500 <= self.last_response.status_code < 600:
+                error_msg += (" Amazon had an issue on their end, or may be temporarily blocking your requests. "
+                              "Wait a bit before trying again.")
+
+            error_msg = error_msg.format(url=self.last_response.url,
+                                         status_code=self.last_response.status_code) + debug_str
+
+        raise AmazonOrdersAuthError(error_msg)
@@ -0,0 +1,205 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+from amazonorders import constants
+from amazonorders.conf import DEFAULT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+#: Order details pages are cached, but revalidated on every request unless pinned, see
+#: :func:`ResponseCache.pin`.
+DEFAULT_CACHE_RULES = {
+    re.escape(constants.ORDER_DETAILS_URL): datetime.timedelta(0),
+}
+
+
+class ResponseCache:
+    """
+    A persistent, size-bounded cache of response bodies, keyed by URL and stored in SQLite. When given to an
+    :class:`~amazonorders.session.AmazonSession`, ``GET`` requests for cacheable URLs are served from the cache while
+    they are fresh.
+
+    Whether a URL is cacheable, and how long its response stays fresh, is determined by the first matching pattern in
+    ``rules``. An entry can also be pinned, meaning it is always fresh. :class:`~amazonorders.orders.AmazonOrders`
+    pins the details page of any Order placed more than ``immutable_after_days`` ago, as these rarely change.
+
+    When the total size of the cached bodies exceeds ``max_size``, the least recently used entries are evicted.
+    """
+
+    def __init__(self,
+                 cache_path: Optional[str] = None,
+                 max_size: int = 100 * 1024 * 1024,
+                 rules: Optional[Dict[str, datetime.timedelta]] = None,
+                 immutable_after_days: int = 90) -> None:
+        if not cache_path:
+            cache_path = DEFAULT_CACHE_PATH
+        if rules is None:
+            rules = DEFAULT_CACHE_RULES
+
+        #: The path to the SQLite cache file, defaults to ``conf.DEFAULT_CACHE_PATH``.
+        self.cache_path: str = cache_path
+        #: The maximum total size, in bytes, of cached bodies before the least recently used are evicted.
+        self.max_size: int = max_size
+        #: A ``dict`` of URL regex patterns to how long a matching response stays fresh. URLs that match no pattern
+        #: are not cached.
+        self.rules: Dict[str, datetime.timedelta] = rules
+        #: Orders placed more than this many days ago will have their details page pinned in the cache.
+        self.immutable_after_days: int = immutable_after_days
+        #: The number of requests served from the cache.
+        self.hits: int = 0
+        #: The number of requests for cacheable URLs that could not be served from the cache.
+        self.misses: int = 0
+
+        cache_dir = os.path.dirname(self.cache_path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.cache_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses ("
+                                     "url TEXT PRIMARY KEY, "
+                                     "body TEXT NOT NULL, "
+                                     "size INTEGER NOT NULL, "
+                                     "fetched_at REAL NOT NULL, "
+                                     "accessed_at REAL NOT NULL, "
+                                     "pinned INTEGER NOT NULL DEFAULT 0)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                                     "ON responses (accessed_at)")
+
+    def max_age(self,
+                url: str) -> Optional[datetime.timedelta]:
+        """
+        Get how long a response for the given URL stays fresh.
+
+        :param url: The URL to check.
+        :return: The max age of the first matching rule, or ``None`` if the URL is not cacheable.
+        """
+        for pattern, max_age in self.rules.items():
+            if re.match(pattern, url):
+                return max_age
+
+        return None
+
+    def get(self,
+            url: str) -> Optional[str]:
+        """
+        Get the cached body for the given URL, if it is cacheable and fresh.
+
+        :param url: The URL to lookup.
+        :return: The cached body, or ``None``.
+        """
+        max_age = self.max_age(url)
+        if max_age is None:
+            return None
+
+        key = self._get_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT body, fetched_at, pinned FROM responses WHERE url = ?",
+                                           (key,)).fetchone()
+            if row and (row[2] or now - row[1] <= max_age.total_seconds()):
+                with self._connection:
+                    self._connection.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, key))
+                self.hits += 1
+
+                logger.debug(f"Cache hit for {url}")
+
+                return row[0]
+
+            self.misses += 1
+
+        return None
+
+    def put(self,
+            url: str,
+            body: str) -> None:
+        """
+        Cache the body for the given URL, if it is cacheable, evicting the least recently used entries if the
+        cache is now too large. An existing pin on the URL is kept.
+
+        :param url: The URL the body was fetched from.
+        :param body: The body to cache.
+        """
+        if self.max_age(url) is None:
+            return
+
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute("INSERT INTO responses (url, body, size, fetched_at, accessed_at) "
+                                     "VALUES (?, ?, ?, ?, ?) "
+                                     "ON CONFLICT(url) DO UPDATE SET body = excluded.body, size = excluded.size, "
+                                     "fetched_at = excluded.fetched_at, accessed_at = excluded.accessed_at",
+                                     (self._get_key(url), body, len(body.encode("utf-8")), now, now))
+            self._evict()
+
+    def pin(self,
+            url: str) -> None:
+        """
+        Pin the entry for the given URL, so it is always fresh.
+
+        :param url: The URL to pin.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE responses SET pinned = 1 WHERE url = ?", (self._get_key(url),))
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache, and reset its counters.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache's counters, suitable for exporting as metrics.
+
+        :return: The ``hits``, ``misses``, number of ``entries``, and total ``size`` of the cache.
+        """
+        with self._lock:
+            entries, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) "
+                                                     "FROM responses").fetchone()
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "size": size,
+            }
+
+    def _evict(self) -> None:
+        size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if size <= self.max_size:
+            return
+
+        evicted = []
+        for url, entry_size in self._connection.execute("SELECT url, size FROM responses "
+                                                        "ORDER BY accessed_at").fetchall():
+            if size <= self.max_size:
+                break
+
+            evicted.append((url,))
+            size -= entry_size
+
+        self._connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+
+        logger.debug(f"Evicted {len(evicted)} responses from the cache")
+
+    def _get_key(self,
+                 url: str) -> str:
+        # Amazon adds "ref" tracking params to links, which don't change the page
+        parsed_url = urlparse(url)
+        query = [(k, v) for k, v in parse_qsl(parsed_url.query) if k not in ("ref", "ref_")]
+        return urlunparse(parsed_url._replace(query=urlencode(query)))
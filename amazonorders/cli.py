@@ -13,9 +13,11 @@ import click
 from click.core import Context
 
 from amazonorders import __version__
-from amazonorders.conf import DEFAULT_OUTPUT_DIR
+from amazonorders.conf import DEFAULT_OUTPUT_DIR, DEFAULT_HTML_PARSER, DEFAULT_SYNC_STATE_PATH
 from amazonorders.exception import AmazonOrdersError
 from amazonorders.orders import AmazonOrders
+from amazonorders.ratelimit import RateLimiter
+from amazonorders.retry import RetryPolicy
 from amazonorders.session import AmazonSession, IODefault
 
 logger = logging.getLogger("amazonorders")
@@ -50,6 +52,22 @@ class IOClick(IODefault):
               help="Will continue in the login auth loop this many times (successes and failures).")
 @click.option('--output-dir', default=DEFAULT_OUTPUT_DIR,
               help="The directory where any output files should be produced.")
+@click.option('--html-parser', default=DEFAULT_HTML_PARSER,
+              help="The BeautifulSoup parser to use, for example \"lxml\" (if installed) for faster parsing.")
+@click.option('--requests-per-second', type=float,
+              help="Limit the rate of requests, shared by all processes using the same cookie jar.")
+@click.option('--burst', default=1,
+              help="When --requests-per-second is given, the number of requests that can be made at once.")
+@click.option('--max-retries', default=3,
+              help="Retry requests that fail with a transient error up to this many times.")
+@click.option('--pool-connections', default=10,
+              help="The number of hosts to keep a pool of connections open to.")
+@click.option('--pool-maxsize', default=10,
+              help="The maximum number of connections to keep open to Amazon, should be at least --workers.")
+@click.option('--connect-timeout', type=float,
+              help="Seconds to wait for a connection to Amazon to be established.")
+@click.option('--read-timeout', type=float,
+              help="Seconds to wait for Amazon to send a response.")
 @click.pass_context
 def amazon_orders_cli(ctx: Context,
                       **kwargs: Any):
@@ -81,13 +99,25 @@ def amazon_orders_cli(ctx: Context,
     username = kwargs.get("username")
     password = kwargs.get("password")
 
+    rate_limiter = None
+    if kwargs["requests_per_second"]:
+        rate_limiter = RateLimiter(requests_per_second=kwargs["requests_per_second"],
+                                   burst=kwargs["burst"])
+
     amazon_session = AmazonSession(username,
                                    password,
                                    debug=kwargs["debug"],
                                    io=IOClick(),
                                    max_auth_attempts=kwargs[
                                        "max_auth_attempts"],
-                                   output_dir=kwargs["output_dir"])
+                                   output_dir=kwargs["output_dir"],
+                                   html_parser=kwargs["html_parser"],
+                                   rate_limiter=rate_limiter,
+                                   retry_policy=RetryPolicy(max_retries=kwargs["max_retries"]),
+                                   pool_connections=kwargs["pool_connections"],
+                                   pool_maxsize=kwargs["pool_maxsize"],
+                                   connect_timeout=kwargs["connect_timeout"],
+                                   read_timeout=kwargs["read_timeout"])
 
     ctx.obj["amazon_session"] = amazon_session
 
@@ -96,22 +126,35 @@ def amazon_orders_cli(ctx: Context,
 @click.pass_context
 @click.option('--year', default=datetime.date.today().year,
               help="The year for which to get order history, defaults to the current year.")
+@click.option('--all-years', is_flag=True, default=False,
+              help="Retrieve order history for every available year, ignoring --year.")
 @click.option('--start-index',
               help="Retrieve the single page of history at the given index.")
+@click.option('--start-date', type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Only retrieve orders placed on or after this date within the year.")
+@click.option('--end-date', type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Only retrieve orders placed on or before this date within the year.")
 @click.option('--full-details', is_flag=True, default=False,
               help="Retrieve the full details for each order in the history.")
+@click.option('--workers', default=1,
+              help="The number of concurrent requests to make when retrieving full details.")
+@click.option('--parse-processes', default=0,
+              help="The number of processes to parse full details in, so parsing scales with cores.")
 def history(ctx: Context,
             **kwargs: Any):
     """
-    Retrieve Amazon order history for a given year.
+    Retrieve Amazon order history for a given year, or for all years.
     """
+    if kwargs["all_years"] and (kwargs["start_date"] or kwargs["end_date"]):
+        ctx.fail("--start-date and --end-date can't be given with --all-years.")
+
     amazon_session = ctx.obj["amazon_session"]
 
     try:
         _authenticate(ctx, amazon_session)
 
-        year = kwargs["year"]
-        start_index = kwargs["start_index"]
+        year = "all years" if kwargs["all_years"] else kwargs["year"]
+        start_index = kwargs["start_index"] if not kwargs["all_years"] else None
         full_details = kwargs["full_details"]
 
         optional_start_index = f", startIndex={start_index}, one page" if start_index else ", all pages"
@@ -126,16 +169,66 @@ Order History for {year}{optional_start_index}{optional_full_details}
 
         amazon_orders = AmazonOrders(amazon_session,
                                      debug=amazon_session.debug,
-                                     output_dir=ctx.obj["output_dir"])
+                                     output_dir=ctx.obj["output_dir"],
+                                     max_workers=kwargs["workers"],
+                                     parse_processes=kwargs["parse_processes"])
+
+        try:
+            if kwargs["all_years"]:
+                orders = amazon_orders.get_all_order_history(full_details=full_details)
+            else:
+                orders = amazon_orders.get_order_history(year=kwargs["year"],
+                                                         start_index=kwargs[
+                                                             "start_index"],
+                                                         full_details=kwargs[
+                                                             "full_details"],
+                                                         start_date=_to_date(kwargs["start_date"]),
+                                                         end_date=_to_date(kwargs["end_date"]))
+        finally:
+            amazon_orders.close()
+
+        for order in orders:
+            click.echo(f"{_order_output(order)}\n")
+    except AmazonOrdersError as e:
+        logger.debug("An error occurred.", exc_info=True)
+        ctx.fail(str(e))
 
-        orders = amazon_orders.get_order_history(year=kwargs["year"],
-                                                 start_index=kwargs[
-                                                     "start_index"],
-                                                 full_details=kwargs[
-                                                     "full_details"], )
+
+@amazon_orders_cli.command()
+@click.pass_context
+@click.option('--state-path', default=DEFAULT_SYNC_STATE_PATH,
+              help="The path where sync state is persisted between runs.")
+@click.option('--workers', default=1,
+              help="The number of concurrent requests to make when retrieving full details.")
+@click.option('--parse-processes', default=0,
+              help="The number of processes to parse full details in, so parsing scales with cores.")
+def sync(ctx: Context,
+         **kwargs: Any):
+    """
+    Retrieve full details for Amazon orders placed, or changed, since the last sync.
+    """
+    amazon_session = ctx.obj["amazon_session"]
+
+    try:
+        _authenticate(ctx, amazon_session)
+
+        click.echo("Info: This might take a minute ...\n")
+
+        amazon_orders = AmazonOrders(amazon_session,
+                                     debug=amazon_session.debug,
+                                     output_dir=ctx.obj["output_dir"],
+                                     max_workers=kwargs["workers"],
+                                     parse_processes=kwargs["parse_processes"])
+
+        try:
+            orders = amazon_orders.sync(state_path=kwargs["state_path"])
+        finally:
+            amazon_orders.close()
 
         for order in orders:
             click.echo(f"{_order_output(order)}\n")
+
+        click.echo(f"Info: Synced {len(orders)} new or changed orders.\n")
     except AmazonOrdersError as e:
         logger.debug("An error occurred.", exc_info=True)
         ctx.fail(str(e))
@@ -240,6 +333,10 @@ def _authenticate(ctx: Context,
     amazon_session.login()
 
 
+def _to_date(value: Optional[datetime.datetime]) -> Optional[datetime.date]:
+    return value.date() if value else None
+
+
 def _order_output(order):
     order_str = """-----------------------------------------------------------------------
 Order #{}
@@ -2,4 +2,11 @@ import os
 
 DEFAULT_COOKIE_JAR_PATH = os.path.join(os.path.expanduser("~"), ".config",
                                        "amazon-orders", "cookies.json")
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".config",
+                                  "amazon-orders", "cache.sqlite3")
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".config",
+                                  "amazon-orders", "orders.sqlite3")
+DEFAULT_SYNC_STATE_PATH = os.path.join(os.path.expanduser("~"), ".config",
+                                       "amazon-orders", "sync.json")
 DEFAULT_OUTPUT_DIR = os.getcwd()
+DEFAULT_HTML_PARSER = "html.parser"
@@ -52,6 +52,21 @@ BASE_HEADERS = {
                   "Chrome/120.0.0.0 Safari/537.36",
 }
 
+##########################################################################
+# Transient error pages
+##########################################################################
+
+# Amazon serves these interstitials with a 200 when it has a transient issue, and the request should be retried
+TRANSIENT_ERROR_PAGE_TEXTS = ["Sorry! Something went wrong!",
+                              "We're sorry. An error occurred when we tried to process your request."]
+
+##########################################################################
+# Shipment delivery statuses
+##########################################################################
+
+# A Shipment whose delivery status starts with one of these is not expected to change
+SETTLED_DELIVERY_STATUS_PREFIXES = ["Delivered", "Return complete", "Refunded", "Cancelled"]
+
 ##########################################################################
 # CSS selectors for AuthForms
 ##########################################################################
@@ -72,6 +87,24 @@ CAPTCHA_2_ERROR_SELECTOR = "div.a-alert-info"
 ##########################################################################
 
 NEXT_PAGE_LINK_SELECTOR = "ul.a-pagination li.a-last a"
+HISTORY_ORDER_COUNT_SELECTOR = "span.num-orders"
+HISTORY_PAGE_SIZE = 10
+HISTORY_YEAR_OPTION_SELECTOR = "select[name='timeFilter'] option, select[name='orderFilter'] option"
+
+##########################################################################
+# CSS selectors for partially parsing pages
+#
+# Only the tags these match (and everything within them) are built when
+# the page is parsed. Each must be a simple selector, see
+# ``css.compile_strainer()``. Set one to an empty ``list`` to build the
+# whole page.
+##########################################################################
+
+# The Order cards (each with the shipToData script the Recipient fallback reads), the pagination strip, and the
+# Order count
+ORDER_HISTORY_PARSE_ONLY_SELECTORS = ["div.order-card", "div.order", "ul.a-pagination", "span.num-orders",
+                                      "script[id^='shipToData']"]
+ORDER_DETAILS_PARSE_ONLY_SELECTORS = ["div#orderDetails", "script[id^='shipToData']"]
 
 ##########################################################################
 # CSS selectors for Entities and Fields
@@ -111,6 +144,7 @@ FIELD_ORDER_PAYMENT_METHOD_SELECTOR = "img.pmts-payment-credit-card-instrument-l
 FIELD_ORDER_PAYMENT_METHOD_LAST_4_SELECTOR = "img.pmts-payment-credit-card-instrument-logo"
 FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR = "div#od-subtotals div.a-row"
 FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR = "div.a-span-last"
+FIELD_ORDER_SUBTOTALS_NESTED_ROW_SELECTOR = "div.a-row"
 FIELD_ORDER_ADDRESS_SELECTOR = "div.displayAddressDiv"
 FIELD_ORDER_ADDRESS_FALLBACK_1_SELECTOR = "div.recipient span.a-declarative"
 FIELD_ORDER_ADDRESS_FALLBACK_2_SELECTOR = "script[id^='shipToData']"
@@ -145,8 +179,21 @@ FIELD_SELLER_NAME_SELECTOR = ["a", "span"]
 FIELD_SELLER_LINK_SELECTOR = "a"
 
 #####################################
-# CSS selectors for Transaction fields
+# Patterns for Transaction fields
 #####################################
 
-# FIELD_TRANSACTION_PURPOSE_SELECTOR = "span:nth-child(1)"
-# FIELD_TRANSACTION_DETAILS_SELECTOR = "span:nth-child(2)"
+# Matches the text of a Transaction row, with whitespace collapsed, for example "Items shipped: December 7, 2023 -
+# AmericanExpress ending in 1234: $46.26" or "Refund: Completed November 2, 2020 - $76.11"
+FIELD_TRANSACTION_REGEX = (r"(?P<purpose>[^:]+?):\s*(?:(?:Completed|Pending)\s+)?"
+                           r"(?P<date>[A-Za-z]+\.?\s+\d{1,2},\s*\d{4})\s+-\s+"
+                           r"(?:(?P<source>[^:]+?):\s*)?(?P<amount>[^\s:]+)")
+# Transaction purposes (the row's label), in lowercase, to the Transaction type
+TRANSACTION_TYPES = {
+    "items shipped": "purchase",
+    "charge": "charge",
+    "partial charge": "charge",
+    "refund": "refund",
+    "gift card": "gift card",
+    "gift card balance": "gift card",
+    "promotion": "promotion",
+}
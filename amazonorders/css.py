@@ -0,0 +1,183 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import functools
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import soupsieve
+from bs4 import SoupStrainer, Tag
+
+from amazonorders import constants
+
+logger = logging.getLogger(__name__)
+
+_STRAINER_SELECTOR_REGEX = re.compile(r"(?P<name>[\w-]+)?"
+                                      r"(?P<qualifiers>(?:[#.][\w-]+|\[[\w-]+(?:\^?=(?:'[^']*'|\"[^\"]*\"))?\])*)")
+_STRAINER_QUALIFIER_REGEX = re.compile(r"([#.])([\w-]+)|\[([\w-]+)(?:(\^?=)(?:'([^']*)'|\"([^\"]*)\"))?\]")
+
+# A rule is a tag name (or None for any) and a list of (attribute, operator, value) conditions
+StrainerRule = Tuple[Optional[str], List[Tuple[str, Optional[str], Optional[str]]]]
+
+
+class PageStrainer(SoupStrainer):
+    """
+    A :class:`~bs4.SoupStrainer` that only builds the tags that match one of a list of simple CSS selectors (and
+    everything within them), so the rest of a page is skipped while it's parsed. Build them with
+    :func:`compile_strainer`.
+
+    Only compound selectors made of a tag name, ``#id``, ``.class``, ``[attr]``, ``[attr='value']``, and
+    ``[attr^='value']`` are supported, as they're matched against each tag before it is built.
+    """
+
+    def __init__(self,
+                 rules: List[StrainerRule]) -> None:
+        super().__init__()
+
+        #: The rules a tag must match one of to be built.
+        self.rules: List[StrainerRule] = rules
+
+    def allow_tag_creation(self,
+                           nsprefix: Optional[str],
+                           name: str,
+                           attrs: Optional[Dict[str, Any]]) -> bool:
+        return self._matches(name, attrs)
+
+    def search_tag(self,
+                   markup_name: Any = None,
+                   markup_attrs: Any = None) -> Any:
+        # BeautifulSoup before 4.13 asks this, rather than allow_tag_creation(), whether to build a tag
+        if isinstance(markup_name, str) and self._matches(markup_name, markup_attrs):
+            return markup_name
+
+        return None
+
+    def _matches(self,
+                 name: str,
+                 attrs: Optional[Dict[str, Any]]) -> bool:
+        attrs = attrs or {}
+
+        for rule_name, conditions in self.rules:
+            if rule_name is not None and rule_name != name:
+                continue
+
+            for attr, operator, value in conditions:
+                attr_value = attrs.get(attr)
+                if attr_value is None:
+                    break
+                if isinstance(attr_value, list):
+                    attr_value = " ".join(attr_value)
+
+                if attr == "class" and operator == "~=":
+                    if value not in attr_value.split():
+                        break
+                elif operator == "=":
+                    if attr_value != value:
+                        break
+                elif operator == "^=":
+                    if not attr_value.startswith(value):
+                        break
+            else:
+                return True
+
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """
+    Compile a CSS selector, or get it from the registry if it has already been compiled.
+
+    Selectors are registered by their text, so overriding a selector in ``amazonorders.constants`` at runtime (or
+    passing a different one where a method accepts it) compiles and registers the new selector on its first use.
+
+    :param selector: The CSS selector.
+    :return: The compiled selector.
+    """
+    return soupsieve.compile(selector)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_strainer(*selectors: str) -> Optional[PageStrainer]:
+    """
+    Compile simple CSS selectors into a :class:`PageStrainer` that only builds the parts of a page they match, or
+    get it from the registry if it has already been compiled. Like :func:`compile_selector`, strainers are registered
+    by the text of their selectors.
+
+    :param selectors: The CSS selectors, each a compound selector like ``div.order-card`` or
+        ``script[id^='shipToData']``.
+    :return: The compiled strainer, or ``None`` if no selectors are given, as the whole page should be built.
+    """
+    if not selectors:
+        return None
+
+    rules = []
+    for selector in selectors:
+        match = _STRAINER_SELECTOR_REGEX.fullmatch(selector.strip())
+        if not match or not selector.strip():
+            raise ValueError(f"`{selector}` is not a simple selector, so it can't be used to strain a page")
+
+        conditions = []
+        for qualifier in _STRAINER_QUALIFIER_REGEX.finditer(match.group("qualifiers")):
+            symbol, identifier, attr, operator, single_quoted, double_quoted = qualifier.groups()
+            if symbol == "#":
+                conditions.append(("id", "=", identifier))
+            elif symbol == ".":
+                conditions.append(("class", "~=", identifier))
+            else:
+                conditions.append((attr, operator, single_quoted if single_quoted is not None else double_quoted))
+        rules.append((match.group("name"), conditions))
+
+    return PageStrainer(rules)
+
+
+def select(tag: Tag,
+           selector: str) -> List[Tag]:
+    """
+    Select all matches for a CSS selector, compiled once through :func:`compile_selector`. Equivalent to
+    :meth:`~bs4.Tag.select`.
+
+    :param tag: The ``Tag`` to select from.
+    :param selector: The CSS selector.
+    :return: The matching ``Tag``\\s.
+    """
+    return compile_selector(selector).select(tag)
+
+
+def select_one(tag: Tag,
+               selector: str) -> Optional[Tag]:
+    """
+    Select the first match for a CSS selector, compiled once through :func:`compile_selector`. Equivalent to
+    :meth:`~bs4.Tag.select_one`.
+
+    :param tag: The ``Tag`` to select from.
+    :param selector: The CSS selector.
+    :return: The first matching ``Tag``, or ``None``.
+    """
+    return compile_selector(selector).select_one(tag)
+
+
+def precompile() -> int:
+    """
+    Compile every ``*_SELECTOR`` in ``amazonorders.constants`` now, rather than on first use, so their cost isn't
+    paid by the first page parsed. Selectors overridden since are still compiled on their first use. This is called
+    when :class:`~amazonorders.orders.AmazonOrders` (or :class:`~amazonorders.async_orders.AsyncAmazonOrders`) is
+    created, and by each process Order details pages are parsed in.
+
+    :return: The number of selectors compiled.
+    """
+    count = 0
+
+    for name in dir(constants):
+        if not name.endswith("_SELECTOR"):
+            continue
+
+        value = getattr(constants, name)
+        for selector in value if isinstance(value, list) else [value]:
+            compile_selector(selector)
+            count += 1
+
+    logger.debug(f"Precompiled {count} selectors")
+
+    return count
@@ -0,0 +1,166 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from amazonorders.entity.item import Item
+from amazonorders.entity.order import Order
+from amazonorders.entity.parsable import Parsable
+from amazonorders.entity.recipient import Recipient
+from amazonorders.entity.seller import Seller
+from amazonorders.entity.shipment import Shipment
+from amazonorders.entity.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+
+class CompactEntity:
+    """
+    A base class for the compact equivalent of a :class:`~amazonorders.entity.parsable.Parsable` entity. Compact
+    entities have the same fields (and ``__repr__``) as the entity they are built from, but store them in
+    ``__slots__`` instead of a ``__dict__``, and keep nothing from parsing, so tens of thousands of them take a
+    fraction of the memory. Build them with :func:`compact`.
+    """
+
+    __slots__ = ()
+
+    #: Compact entities are never parsed, so always have no parsed data.
+    parsed = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._get_field_names() if hasattr(self, name)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def detach(self) -> None:
+        """
+        Compact entities are already detached, so this does nothing.
+        """
+
+    @classmethod
+    def _get_field_names(cls) -> List[str]:
+        return [name for klass in reversed(cls.__mro__) for name in getattr(klass, "__slots__", ())]
+
+
+class CompactSeller(CompactEntity):
+    """
+    A compact :class:`~amazonorders.entity.seller.Seller`.
+    """
+
+    __slots__ = ("name", "link")
+
+    __repr__ = Seller.__repr__
+    __str__ = Seller.__str__
+
+
+class CompactRecipient(CompactEntity):
+    """
+    A compact :class:`~amazonorders.entity.recipient.Recipient`.
+    """
+
+    __slots__ = ("name", "address")
+
+    __repr__ = Recipient.__repr__
+    __str__ = Recipient.__str__
+
+
+class CompactItem(CompactEntity):
+    """
+    A compact :class:`~amazonorders.entity.item.Item`.
+    """
+
+    __slots__ = ("title", "link", "price", "seller", "condition", "return_eligible_date", "image_link", "quantity",
+                 "shipment")
+
+    __repr__ = Item.__repr__
+    __str__ = Item.__str__
+    __lt__ = Item.__lt__
+
+
+class CompactShipment(CompactEntity):
+    """
+    A compact :class:`~amazonorders.entity.shipment.Shipment`.
+    """
+
+    __slots__ = ("items", "delivery_status", "tracking_link")
+
+    __repr__ = Shipment.__repr__
+    __str__ = Shipment.__str__
+    __lt__ = Shipment.__lt__
+
+
+class CompactTransaction(CompactEntity):
+    """
+    A compact :class:`~amazonorders.entity.transaction.Transaction`.
+    """
+
+    __slots__ = ("text", "purpose", "type", "date", "source", "amount")
+
+    __repr__ = Transaction.__repr__
+    __str__ = Transaction.__str__
+    __lt__ = Transaction.__lt__
+
+
+class CompactOrder(CompactEntity):
+    """
+    A compact :class:`~amazonorders.entity.order.Order`.
+    """
+
+    __slots__ = ("full_details", "html_parser", "shipments", "items", "order_number", "order_details_link",
+                 "grand_total", "order_placed_date", "recipient", "payment_method", "payment_method_last_4",
+                 "subtotals", "subtotal", "shipping_total", "subscription_discount", "total_before_tax",
+                 "estimated_tax", "refund_total", "order_shipped_date", "refund_completed_date", "transactions")
+
+    __repr__ = Order.__repr__
+    __str__ = Order.__str__
+
+
+COMPACT_ENTITY_CLASSES = {
+    Order: CompactOrder,
+    Shipment: CompactShipment,
+    Item: CompactItem,
+    Seller: CompactSeller,
+    Recipient: CompactRecipient,
+    Transaction: CompactTransaction,
+}
+
+
+def compact(entity: Any,
+            memo: Optional[Dict[int, CompactEntity]] = None) -> Any:
+    """
+    Build the compact equivalent of an entity, and of the entities in its fields. Any fields not yet accessed are
+    parsed first. Entities shared between fields (like an Item in both ``Order.items`` and ``Shipment.items``) are
+    still shared in the compact equivalent.
+
+    :param entity: The entity (or a list of entities) to compact.
+    :param memo: Compact entities already built, by the ``id()`` of their entity.
+    :return: The compact equivalent.
+    """
+    if memo is None:
+        memo = {}
+
+    if isinstance(entity, list):
+        return [compact(e, memo) for e in entity]
+    if not isinstance(entity, (Parsable, CompactEntity)):
+        return entity
+    if id(entity) in memo:
+        return memo[id(entity)]
+
+    if isinstance(entity, CompactEntity):
+        # Already compact, but its fields may not be (for example, an Order's full details are built from a compact
+        # clone's Shipments), so they are compacted in place
+        compact_entity = entity
+    else:
+        compact_entity = COMPACT_ENTITY_CLASSES[type(entity)].__new__(COMPACT_ENTITY_CLASSES[type(entity)])
+    # Registered before its fields are built, as they may refer back to it
+    memo[id(entity)] = compact_entity
+
+    state = entity.__getstate__()
+    for name in compact_entity._get_field_names():
+        if name in state:
+            setattr(compact_entity, name, compact(state[name], memo))
+
+    return compact_entity
@@ -2,14 +2,18 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import logging
-from datetime import datetime, date
-from typing import Optional
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from bs4 import Tag
 
-from amazonorders import constants
-from amazonorders.entity.parsable import Parsable
+from amazonorders import constants, css
+from amazonorders.entity.parsable import LazyField, Parsable
 from amazonorders.entity.seller import Seller
+from amazonorders.parsing import parse_date, parse_money
+
+if TYPE_CHECKING:  # pragma: no cover
+    from amazonorders.entity.shipment import Shipment
 
 logger = logging.getLogger(__name__)
 
@@ -19,28 +23,16 @@ class Item(Parsable):
     An Item in an Amazon :class:`~amazonorders.entity.order.Order`.
     """
 
+    _parse_only_attributes = ("_rows",)
+
     def __init__(self,
                  parsed: Tag) -> None:
         super().__init__(parsed)
 
-        #: The Item title.
-        self.title: str = self.safe_simple_parse(selector=constants.FIELD_ITEM_TITLE_SELECTOR, required=True)
-        #: The Item link.
-        self.link: str = self.safe_simple_parse(selector=constants.FIELD_ITEM_LINK_SELECTOR, link=True, required=True)
-        #: The Item price.
-        self.price: Optional[float] = self.safe_parse(self._parse_price)
-        #: The Item Seller.
-        self.seller: Optional[Seller] = self.safe_parse(self._parse_seller)
-        #: The Item condition.
-        self.condition: Optional[str] = self.safe_parse(self._parse_condition)
-        #: The Item return eligible date.
-        self.return_eligible_date: Optional[date] = self.safe_parse(self._parse_return_eligible_date)
-        #: The Item image URL.
-        self.image_link: Optional[str] = self.safe_simple_parse(selector=constants.FIELD_ITEM_IMG_LINK_SELECTOR,
-                                                                link=True)
-        #: The Item quantity.
-        self.quantity: Optional[int] = self.safe_simple_parse(selector=constants.FIELD_ITEM_QUANTITY_SELECTOR,
-                                                              return_type=int)
+        self._rows: Optional[Dict[str, List[Tag]]] = None
+
+        #: The Shipment this Item belongs to, if any. The Item is the same object in the Shipment's ``items``.
+        self.shipment: Optional["Shipment"] = None
 
     def __repr__(self) -> str:
         return f"<Item: \"{self.title}\">"
@@ -51,46 +43,129 @@ class Item(Parsable):
     def __lt__(self, other):
         return self.title < other.title
 
-    def _parse_price(self) -> Optional[float]:
+    @LazyField
+    def title(self) -> str:
+        """
+        The Item title.
+        """
+        return self.safe_simple_parse(selector=constants.FIELD_ITEM_TITLE_SELECTOR, required=True)
+
+    @LazyField
+    def link(self) -> str:
+        """
+        The Item link.
+        """
+        return self.safe_simple_parse(selector=constants.FIELD_ITEM_LINK_SELECTOR, link=True, required=True)
+
+    @LazyField
+    def price(self) -> Optional[float]:
+        """
+        The Item price.
+        """
+        return self.safe_parse(self._parse_price, rows=self._get_rows()["price"])
+
+    @LazyField
+    def seller(self) -> Optional[Seller]:
+        """
+        The Item Seller.
+        """
+        return self.safe_parse(self._parse_seller, rows=self._get_rows()["seller"])
+
+    @LazyField
+    def condition(self) -> Optional[str]:
+        """
+        The Item condition.
+        """
+        return self.safe_parse(self._parse_condition, rows=self._get_rows()["condition"])
+
+    @LazyField
+    def return_eligible_date(self) -> Optional[date]:
+        """
+        The Item return eligible date.
+        """
+        return self.safe_parse(self._parse_return_eligible_date, rows=self._get_rows()["return_eligible_date"])
+
+    @LazyField
+    def image_link(self) -> Optional[str]:
+        """
+        The Item image URL.
+        """
+        return self.safe_simple_parse(selector=constants.FIELD_ITEM_IMG_LINK_SELECTOR, link=True)
+
+    @LazyField
+    def quantity(self) -> Optional[int]:
+        """
+        The Item quantity.
+        """
+        return self.safe_simple_parse(selector=constants.FIELD_ITEM_QUANTITY_SELECTOR, return_type=int)
+
+    def _get_rows(self) -> Dict[str, List[Tag]]:
+        if self._rows is None:
+            self._rows = self._classify_rows()
+
+        return self._rows
+
+    def _classify_rows(self) -> Dict[str, List[Tag]]:
+        # The rows are walked (and their text built) once, and each is assigned to every field it could populate.
+        # Fields are then parsed from their rows in order, so the last match still wins.
+        rows = {
+            "price": [],
+            "seller": [],
+            "condition": [],
+            "return_eligible_date": [],
+        }
+
+        for tag in css.select(self.parsed, constants.FIELD_ITEM_TAG_ITERATOR_SELECTOR):
+            text = tag.text
+            if text.strip().startswith("$"):
+                rows["price"].append(text)
+            if "Sold by:" in text:
+                rows["seller"].append(tag)
+            if "Condition:" in text:
+                rows["condition"].append(text)
+            if "Return" in text:
+                rows["return_eligible_date"].append(text)
+
+        return rows
+
+    def _parse_price(self,
+                     rows: List[str]) -> Optional[float]:
         value = None
 
-        for tag in self.parsed.select(constants.FIELD_ITEM_TAG_ITERATOR_SELECTOR):
-            price = tag.text.strip()
-            if price.startswith("$"):
-                value = float(price.replace("$", ""))
+        for text in rows:
+            value = parse_money(text)
 
         return value
 
-    def _parse_seller(self) -> Optional[Seller]:
+    def _parse_seller(self,
+                      rows: List[Tag]) -> Optional[Seller]:
         value = None
 
-        for tag in self.parsed.select(constants.FIELD_ITEM_TAG_ITERATOR_SELECTOR):
-            if "Sold by:" in tag.text:
-                value = Seller(tag)
+        if rows:
+            value = Seller(rows[-1])
 
         return value
 
-    def _parse_condition(self) -> Optional[str]:
+    def _parse_condition(self,
+                         rows: List[str]) -> Optional[str]:
         value = None
 
-        for tag in self.parsed.select(constants.FIELD_ITEM_TAG_ITERATOR_SELECTOR):
-            split_str = "Condition:"
-            if split_str in tag.text:
-                value = tag.text.split(split_str)[1].strip()
+        for text in rows:
+            value = text.split("Condition:")[1].strip()
 
         return value
 
-    def _parse_return_eligible_date(self) -> Optional[date]:
+    def _parse_return_eligible_date(self,
+                                    rows: List[str]) -> Optional[date]:
         value = None
 
-        for tag in self.parsed.select(constants.FIELD_ITEM_TAG_ITERATOR_SELECTOR):
-            if "Return" in tag.text:
-                tag_str = tag.text.strip()
-                split_str = "through "
-                if "closed on " in tag.text:
-                    split_str = "closed on "
-                if split_str in tag_str:
-                    date_str = tag_str.split(split_str)[1]
-                    value = datetime.strptime(date_str, "%b %d, %Y").date()
+        for text in rows:
+            tag_str = text.strip()
+            split_str = "through "
+            if "closed on " in text:
+                split_str = "closed on "
+            if split_str in tag_str:
+                date_str = tag_str.split(split_str)[1]
+                value = parse_date(date_str)
 
         return value
@@ -1,20 +1,23 @@
 __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
+import copy
 import json
 import logging
-from datetime import datetime, date
-from typing import List, Optional, TypeVar
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from urllib.parse import urlparse, parse_qs
 
 from bs4 import BeautifulSoup, Tag
 
-from amazonorders import constants
+from amazonorders import constants, css
+from amazonorders.conf import DEFAULT_HTML_PARSER
 from amazonorders.entity.item import Item
-from amazonorders.entity.parsable import Parsable
+from amazonorders.entity.parsable import LazyField, Parsable
 from amazonorders.entity.recipient import Recipient
 from amazonorders.entity.shipment import Shipment
 from amazonorders.entity.transaction import Transaction
+from amazonorders.parsing import parse_date, parse_money
 
 logger = logging.getLogger(__name__)
 
@@ -26,56 +29,22 @@ class Order(Parsable):
     An Amazon Order.
     """
 
+    _parse_only_attributes = ("_clone", "_subtotal_rows")
+
     def __init__(self,
                  parsed: Tag,
                  full_details: bool = False,
-                 clone: Optional[Entity] = None) -> None:
+                 clone: Optional[Entity] = None,
+                 html_parser: str = DEFAULT_HTML_PARSER) -> None:
         super().__init__(parsed)
 
+        self._clone: Optional[Entity] = clone
+        self._subtotal_rows: Optional[List[Tuple[str, Optional[str], float]]] = None
+
         #: If the Orders full details were populated from its details page.
         self.full_details: bool = full_details
-
-        #: The Order Shipments.
-        self.shipments: List[Shipment] = clone.shipments if clone else self._parse_shipments()
-        #: The Order Items.
-        self.items: List[Item] = clone.items if clone and not full_details else self._parse_items()
-        #: The Order number.
-        self.order_number: str = clone.order_number if clone else self.safe_parse(self._parse_order_number)
-        #: The Order details link.
-        self.order_details_link: Optional[str] = clone.order_details_link if clone else self.safe_parse(
-            self._parse_order_details_link)
-        #: The Order grand total.
-        self.grand_total: float = clone.grand_total if clone else self.safe_parse(self._parse_grand_total)
-        #: The Order placed date.
-        self.order_placed_date: date = clone.order_placed_date if clone else self.safe_parse(
-            self._parse_order_placed_date)
-        #: The Order Recipients.
-        self.recipient: Recipient = clone.recipient if clone else self.safe_parse(self._parse_recipient)
-
-        # Fields below this point are only populated if `full_details` is True
-
-        #: The Order payment method. Only populated when ``full_details`` is ``True``.
-        self.payment_method: Optional[str] = self._if_full_details(self._parse_payment_method())
-        #: The Order payment method's last 4 digits. Only populated when ``full_details`` is ``True``.
-        self.payment_method_last_4: Optional[str] = self._if_full_details(self._parse_payment_method_last_4())
-        #: The Order subtotal. Only populated when ``full_details`` is ``True``.
-        self.subtotal: Optional[float] = self._if_full_details(self._parse_subtotal())
-        #: The Order shipping total. Only populated when ``full_details`` is ``True``.
-        self.shipping_total: Optional[float] = self._if_full_details(self._parse_shipping_total())
-        #: The Order Subscribe & Save discount. Only populated when ``full_details`` is ``True``.
-        self.subscription_discount: Optional[float] = self._if_full_details(self._parse_subscription_discount())
-        #: The Order total before tax. Only populated when ``full_details`` is ``True``.
-        self.total_before_tax: Optional[float] = self._if_full_details(self._parse_total_before_tax())
-        #: The Order estimated tax. Only populated when ``full_details`` is ``True``.
-        self.estimated_tax: Optional[float] = self._if_full_details(self._parse_estimated_tax())
-        #: The Order refund total. Only populated when ``full_details`` is ``True``.
-        self.refund_total: Optional[float] = self._if_full_details(self._parse_refund_total())
-        #: The Order shipped date. Only populated when ``full_details`` is ``True``.
-        self.order_shipped_date: Optional[date] = self._if_full_details(self._parse_order_shipping_date())
-        #: The Order refund total. Only populated when ``full_details`` is ``True``.
-        self.refund_completed_date: Optional[date] = self._if_full_details(self._parse_refund_completed_date())
-        # The Order transactions. Only populated when ``full_details`` is ``True``.
-        self.transactions: Optional[List[Transaction]] = self._if_full_details(self._parse_transactions())
+        #: The BeautifulSoup parser used to build any trees for embedded HTML.
+        self.html_parser: str = html_parser
 
     def __repr__(self) -> str:
         return f"<Order #{self.order_number}: \"{self.items}\">"
@@ -83,15 +52,186 @@ class Order(Parsable):
     def __str__(self) -> str:  # pragma: no cover
         return f"Order #{self.order_number}: {self.items}"
 
-    def _parse_shipments(self) -> List[Shipment]:
-        shipments = [Shipment(x) for x in self.parsed.select(constants.SHIPMENT_ENTITY_SELECTOR)]
-        shipments.sort()
-        return shipments
+    @LazyField
+    def shipments(self) -> List[Shipment]:
+        """
+        The Order Shipments.
+        """
+        # Shipments and Items are parsed together, so they share the same Item objects
+        self.shipments, self.items = self._parse_shipments_and_items(self._clone)
+        return self.shipments
+
+    @LazyField
+    def items(self) -> List[Item]:
+        """
+        The Order Items. Each is the same object as in the ``items`` of the Shipment it belongs to.
+        """
+        self.shipments, self.items = self._parse_shipments_and_items(self._clone)
+        return self.items
+
+    @LazyField
+    def order_number(self) -> str:
+        """
+        The Order number.
+        """
+        return self._clone.order_number if self._clone else self.safe_parse(self._parse_order_number)
+
+    @LazyField
+    def order_details_link(self) -> Optional[str]:
+        """
+        The Order details link.
+        """
+        return self._clone.order_details_link if self._clone else self.safe_parse(self._parse_order_details_link)
+
+    @LazyField
+    def grand_total(self) -> float:
+        """
+        The Order grand total.
+        """
+        return self._clone.grand_total if self._clone else self.safe_parse(self._parse_grand_total)
+
+    @LazyField
+    def order_placed_date(self) -> date:
+        """
+        The Order placed date.
+        """
+        return self._clone.order_placed_date if self._clone else self.safe_parse(self._parse_order_placed_date)
+
+    @LazyField
+    def recipient(self) -> Recipient:
+        """
+        The Order Recipients.
+        """
+        return self._clone.recipient if self._clone else self.safe_parse(self._parse_recipient)
+
+    # Fields below this point are only populated if `full_details` is True
+
+    @LazyField
+    def payment_method(self) -> Optional[str]:
+        """
+        The Order payment method. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_payment_method)
+
+    @LazyField
+    def payment_method_last_4(self) -> Optional[str]:
+        """
+        The Order payment method's last 4 digits. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_payment_method_last_4)
+
+    @LazyField
+    def subtotals(self) -> Optional[Dict[str, float]]:
+        """
+        The Order subtotals, a ``dict`` of each line's label (for example, ``Item(s) Subtotal`` or ``Gift Card
+        Amount``) to its amount. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_subtotals)
+
+    @LazyField
+    def subtotal(self) -> Optional[float]:
+        """
+        The Order subtotal. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_subtotal)
+
+    @LazyField
+    def shipping_total(self) -> Optional[float]:
+        """
+        The Order shipping total. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_shipping_total)
+
+    @LazyField
+    def subscription_discount(self) -> Optional[float]:
+        """
+        The Order Subscribe & Save discount. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_subscription_discount)
+
+    @LazyField
+    def total_before_tax(self) -> Optional[float]:
+        """
+        The Order total before tax. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_total_before_tax)
+
+    @LazyField
+    def estimated_tax(self) -> Optional[float]:
+        """
+        The Order estimated tax. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_estimated_tax)
+
+    @LazyField
+    def refund_total(self) -> Optional[float]:
+        """
+        The Order refund total. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_refund_total)
+
+    @LazyField
+    def order_shipped_date(self) -> Optional[date]:
+        """
+        The Order shipped date. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_order_shipping_date)
+
+    @LazyField
+    def refund_completed_date(self) -> Optional[date]:
+        """
+        The Order refund total. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_refund_completed_date)
+
+    @LazyField
+    def transactions(self) -> Optional[List[Transaction]]:
+        """
+        The Order transactions. Only populated when ``full_details`` is ``True``.
+        """
+        return self._if_full_details(self._parse_transactions)
+
+    def _parse_shipments_and_items(self,
+                                   clone: Optional[Entity]) -> Tuple[List[Shipment], List[Item]]:
+        if clone and not self.full_details:
+            return clone.shipments, clone.items
+
+        # Each Item is parsed once, and shared with the Shipment it belongs to
+        item_tags = css.select(self.parsed, constants.ITEM_ENTITY_SELECTOR)
+        items = [Item(x) for x in item_tags]
+
+        if clone:
+            # Shipments are kept from the clone, so copies of them are given the matching Items from this page. Each
+            # Item from this page is matched at most once, so Items repeated across Shipments each get their own
+            unmatched_items = list(items)
+            shipments = []
+            for clone_shipment in clone.shipments:
+                shipment = copy.copy(clone_shipment)
+                shipment_items = []
+                for clone_item in clone_shipment.items:
+                    item = _pop_matching_item(unmatched_items, clone_item)
+                    if item is None:
+                        # The Item isn't on this page, so a copy of the clone's is kept (and added to the Order's
+                        # Items), rather than changing the clone
+                        item = copy.copy(clone_item)
+                        items.append(item)
+                    item.shipment = shipment
+                    shipment_items.append(item)
+                shipment.items = sorted(shipment_items)
+                shipments.append(shipment)
+        else:
+            shipment_tags = css.select(self.parsed, constants.SHIPMENT_ENTITY_SELECTOR)
+            shipment_items = {id(tag): [] for tag in shipment_tags}
+            for item_tag, item in zip(item_tags, items):
+                for parent_tag in item_tag.parents:
+                    if id(parent_tag) in shipment_items:
+                        shipment_items[id(parent_tag)].append(item)
+                        break
+            shipments = [Shipment(tag, items=shipment_items[id(tag)]) for tag in shipment_tags]
 
-    def _parse_items(self) -> List[Item]:
-        items = [Item(x) for x in self.parsed.select(constants.ITEM_ENTITY_SELECTOR)]
+        shipments.sort()
         items.sort()
-        return items
+        return shipments, items
 
     def _parse_order_details_link(self) -> Optional[str]:
         value = self.simple_parse(constants.FIELD_ORDER_DETAILS_LINK_SELECTOR, link=True)
@@ -103,7 +243,8 @@ class Order(Parsable):
 
     def _parse_order_number(self) -> str:
         try:
-            order_details_link = self._parse_order_details_link()
+            # The link is selected directly, as `_parse_order_details_link()` falls back to this field
+            order_details_link = self.simple_parse(constants.FIELD_ORDER_DETAILS_LINK_SELECTOR, link=True)
         except Exception:
             # We're not using safe_parse here because it's fine if this fails, no need for noise
             order_details_link = None
@@ -122,15 +263,10 @@ class Order(Parsable):
     def _parse_grand_total(self) -> float:
         value = self.simple_parse(constants.FIELD_ORDER_GRAND_TOTAL_SELECTOR)
 
-        if not value:
-            for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-                if "grand total" in tag.text.lower():
-                    inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                    if inner_tag:
-                        value = inner_tag.text.strip()
-                        break
-
-        value = float(value.replace("$", ""))
+        if value:
+            value = parse_money(value)
+        else:
+            value = self._get_subtotal("grand total")
 
         return value
 
@@ -143,33 +279,33 @@ class Order(Parsable):
             split_str = "Order placed"
 
         value = value.split(split_str)[1].strip()
-        value = datetime.strptime(value, "%B %d, %Y").date()
+        value = parse_date(value)
 
         return value
 
     def _parse_recipient(self) -> Recipient:
-        value = self.parsed.select_one(constants.FIELD_ORDER_ADDRESS_SELECTOR)
+        value = css.select_one(self.parsed, constants.FIELD_ORDER_ADDRESS_SELECTOR)
 
         if not value:
-            value = self.parsed.select_one(constants.FIELD_ORDER_ADDRESS_FALLBACK_1_SELECTOR)
+            value = css.select_one(self.parsed, constants.FIELD_ORDER_ADDRESS_FALLBACK_1_SELECTOR)
 
             if value:
                 inline_content = value.get("data-a-popover", {}).get("inlineContent")
                 if inline_content:
-                    value = BeautifulSoup(json.loads(inline_content), "html.parser")
+                    value = BeautifulSoup(json.loads(inline_content), self.html_parser)
 
         if not value:
             # TODO: there are multiple shipToData tags, we should double check we're picking the right one
             #  associated with the order
-            parent_tag = self.parsed.find_parent().select_one(constants.FIELD_ORDER_ADDRESS_FALLBACK_2_SELECTOR)
-            value = BeautifulSoup(str(parent_tag.contents[0]).strip(), "html.parser")
+            parent_tag = css.select_one(self.parsed.find_parent(), constants.FIELD_ORDER_ADDRESS_FALLBACK_2_SELECTOR)
+            value = BeautifulSoup(str(parent_tag.contents[0]).strip(), self.html_parser)
 
         return Recipient(value)
 
     def _parse_payment_method(self) -> Optional[str]:
         value = None
 
-        tag = self.parsed.select_one(constants.FIELD_ORDER_PAYMENT_METHOD_SELECTOR)
+        tag = css.select_one(self.parsed, constants.FIELD_ORDER_PAYMENT_METHOD_SELECTOR)
         if tag:
             value = tag["alt"]
 
@@ -178,7 +314,7 @@ class Order(Parsable):
     def _parse_payment_method_last_4(self) -> Optional[str]:
         value = None
 
-        tag = self.parsed.select_one(constants.FIELD_ORDER_PAYMENT_METHOD_LAST_4_SELECTOR)
+        tag = css.select_one(self.parsed, constants.FIELD_ORDER_PAYMENT_METHOD_LAST_4_SELECTOR)
         if tag:
             ending_sibling = tag.find_next_siblings()[-1]
             split_str = "ending in"
@@ -187,77 +323,32 @@ class Order(Parsable):
 
         return value
 
-    def _parse_subtotal(self) -> Optional[float]:
-        value = None
+    def _parse_subtotals(self) -> Dict[str, float]:
+        value = {}
 
-        for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if "subtotal" in tag.text.lower():
-                inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                if inner_tag:
-                    value = float(inner_tag.text.strip().replace("$", ""))
-                    break
+        for _, label, amount in self._get_subtotal_rows():
+            if label:
+                value.setdefault(label, amount)
 
         return value
 
-    def _parse_shipping_total(self) -> Optional[float]:
-        value = None
-
-        for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if "shipping" in tag.text.lower():
-                inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                if inner_tag:
-                    value = float(inner_tag.text.strip().replace("$", ""))
-                    break
+    def _parse_subtotal(self) -> Optional[float]:
+        return self._get_subtotal("subtotal")
 
-        return value
+    def _parse_shipping_total(self) -> Optional[float]:
+        return self._get_subtotal("shipping")
 
     def _parse_subscription_discount(self) -> Optional[float]:
-        value = None
-
-        for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if "subscribe" in tag.text.lower():
-                inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                if inner_tag:
-                    value = float(inner_tag.text.strip().replace("$", ""))
-                    break
-
-        return value
+        return self._get_subtotal("subscribe")
 
     def _parse_total_before_tax(self) -> Optional[float]:
-        value = None
-
-        for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if "before tax" in tag.text.lower():
-                inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                if inner_tag:
-                    value = float(inner_tag.text.strip().replace("$", ""))
-                    break
-
-        return value
+        return self._get_subtotal("before tax")
 
     def _parse_estimated_tax(self) -> Optional[float]:
-        value = None
-
-        for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if "estimated tax" in tag.text.lower():
-                inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                if inner_tag:
-                    value = float(inner_tag.text.strip().replace("$", ""))
-                    break
-
-        return value
+        return self._get_subtotal("estimated tax")
 
     def _parse_refund_total(self) -> Optional[float]:
-        value = None
-
-        for tag in self.parsed.select(constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
-            if "refund total" in tag.text.lower() and "tax refund" not in tag.text.lower():
-                inner_tag = tag.select_one(constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
-                if inner_tag:
-                    value = float(inner_tag.text.strip().replace("$", ""))
-                    break
-
-        return value
+        return self._get_subtotal("refund total", excluding="tax refund")
 
     def _parse_order_shipping_date(self) -> Optional[date]:
         match_text = "Items shipped:"
@@ -265,7 +356,7 @@ class Order(Parsable):
 
         if value:
             date_str = value.split(match_text)[1].strip().split("-")[0].strip()
-            value = datetime.strptime(date_str, "%B %d, %Y").date()
+            value = parse_date(date_str)
 
         return value
 
@@ -275,14 +366,73 @@ class Order(Parsable):
 
         if value:
             date_str = value.split(match_text)[1].strip().split("-")[0].strip()
-            value = datetime.strptime(date_str, "%B %d, %Y").date()
+            value = parse_date(date_str)
 
         return value
 
     def _parse_transactions(self) -> Optional[Transaction]:
-        transactions = [Transaction(x) for x in self.parsed.select(constants.FIELD_ORDER_TRANSACTIONS_SELECTOR)]
+        transactions = [Transaction(x) for x in
+                        css.select(self.parsed, constants.FIELD_ORDER_TRANSACTIONS_SELECTOR)]
         transactions.sort()
         return transactions
 
-    def _if_full_details(self, value):
-        return value if self.full_details else None
+    def _get_subtotal_rows(self) -> List[Tuple[str, Optional[str], float]]:
+        # The subtotals block is indexed once, as (lowercase row text, label, amount), and each subtotal field is
+        # read from the index
+        if self._subtotal_rows is None:
+            self._subtotal_rows = []
+            for tag in css.select(self.parsed, constants.FIELD_ORDER_SUBTOTALS_TAG_ITERATOR_SELECTOR):
+                inner_tag = css.select_one(tag, constants.FIELD_ORDER_SUBTOTALS_INNER_TAG_SELECTOR)
+                if not inner_tag:
+                    continue
+
+                try:
+                    amount = parse_money(inner_tag.text)
+                except ValueError:
+                    continue
+
+                label = None
+                # Rows that group other rows don't have a label of their own
+                if not css.select_one(tag, constants.FIELD_ORDER_SUBTOTALS_NESTED_ROW_SELECTOR):
+                    label = " ".join(tag.text.replace(inner_tag.text, "").split()).rstrip(":").strip()
+
+                self._subtotal_rows.append((tag.text.lower(), label, amount))
+
+        return self._subtotal_rows
+
+    def _get_subtotal(self,
+                      text: str,
+                      excluding: Optional[str] = None) -> Optional[float]:
+        for row_text, _, amount in self._get_subtotal_rows():
+            if text in row_text and (excluding is None or excluding not in row_text):
+                return amount
+
+        return None
+
+    def _if_full_details(self,
+                         parse_function: Callable[[], Any]) -> Any:
+        # Detail fields are only parsed from a details page
+        return parse_function() if self.full_details else None
+
+
+def _get_item_product_path(item: Any) -> Optional[str]:
+    # Item links differ between pages only by their "ref=" tracking, so the path before it identifies the product
+    if not getattr(item, "link", None):
+        return None
+
+    return urlparse(item.link).path.split("/ref=")[0]
+
+
+def _pop_matching_item(items: List[Item],
+                       clone_item: Any) -> Optional[Item]:
+    # Items are matched by their product first, then by their title, as titles aren't unique
+    for key in [_get_item_product_path, lambda i: getattr(i, "title", None)]:
+        clone_key = key(clone_item)
+        if clone_key is None:
+            continue
+
+        for i, item in enumerate(items):
+            if key(item) == clone_key:
+                return items.pop(i)
+
+    return None
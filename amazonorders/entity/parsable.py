@@ -2,32 +2,96 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import logging
-from typing import Callable, Any, Optional, Type, Union
+from typing import Callable, Any, List, Optional, Tuple, Type, Union
 
 from bs4 import Tag
 
+from amazonorders import css
 from amazonorders.constants import BASE_URL
 from amazonorders.exception import AmazonOrdersError, AmazonOrderEntityError
 
 logger = logging.getLogger(__name__)
 
 
+class LazyField:
+    """
+    Decorates a method of a :class:`Parsable` that parses one of its fields, so the field is parsed the first time
+    it is accessed, rather than when the entity is built. The value is then stored on the instance, so it is only
+    parsed once, and the field can be set like any other attribute.
+    """
+
+    def __init__(self,
+                 parse_function: Callable[[Any], Any]) -> None:
+        #: The method that parses the field.
+        self.parse_function: Callable[[Any], Any] = parse_function
+        #: The name of the field.
+        self.name: str = parse_function.__name__
+        self.__doc__ = parse_function.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        value = self.parse_function(instance)
+        # The value shadows this (non-data) descriptor, so later access is a plain attribute lookup
+        instance.__dict__[self.name] = value
+        return value
+
+
 class Parsable:
     """
     A base class that contains a parsed representation of the entity, and can be extended to
     be made up of the entities fields utilizing the helper methods.
     """
 
+    #: Attributes that are only needed while parsing, so are dropped when the entity is pickled or detached.
+    _parse_only_attributes: Tuple[str, ...] = ()
+
     def __init__(self,
                  parsed: Tag) -> None:
         #: Parsed HTML data that can be used to populate the fields of the entity.
         self.parsed: Tag = parsed
 
     def __getstate__(self):
+        # Any fields not yet accessed are parsed now, as the parsed data isn't kept
+        for name in self._get_lazy_field_names():
+            getattr(self, name)
+
         state = self.__dict__.copy()
-        state.pop("parsed")
+        state.pop("parsed", None)
+        for name in self._parse_only_attributes:
+            state.pop(name, None)
         return state
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # The parsed data isn't pickled, so an unpickled entity is detached
+        self.parsed = None
+
+    def detach(self) -> None:
+        """
+        Parse any fields not yet accessed, then drop ``parsed`` from this entity and the entities in its fields, so
+        they no longer keep the page they were parsed from in memory.
+        """
+        if getattr(self, "parsed", None) is None:
+            return
+
+        for name in self._get_lazy_field_names():
+            getattr(self, name)
+
+        self.parsed = None
+        for name in self._parse_only_attributes:
+            self.__dict__.pop(name, None)
+
+        for value in list(self.__dict__.values()):
+            for child in value if isinstance(value, list) else [value]:
+                if isinstance(child, Parsable):
+                    child.detach()
+
+    @classmethod
+    def _get_lazy_field_names(cls) -> List[str]:
+        return [name for klass in cls.__mro__ for name, value in vars(klass).items() if isinstance(value, LazyField)]
+
     def safe_parse(self,
                    parse_function: Callable[..., Any],
                    **kwargs: Any) -> Any:
@@ -78,7 +142,7 @@ class Parsable:
         value = None
 
         for s in selector:
-            tag = self.parsed.select_one(s)
+            tag = css.select_one(self.parsed, s)
             if tag:
                 if link:
                     key = "href"
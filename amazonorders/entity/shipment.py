@@ -6,10 +6,9 @@ from typing import List, Optional
 
 from bs4 import Tag
 
-from amazonorders import constants
-from amazonorders.constants import ITEM_ENTITY_SELECTOR
+from amazonorders import constants, css
 from amazonorders.entity.item import Item
-from amazonorders.entity.parsable import Parsable
+from amazonorders.entity.parsable import LazyField, Parsable
 
 logger = logging.getLogger(__name__)
 
@@ -20,18 +19,15 @@ class Shipment(Parsable):
     """
 
     def __init__(self,
-                 parsed: Tag) -> None:
+                 parsed: Tag,
+                 items: Optional[List[Item]] = None) -> None:
         super().__init__(parsed)
 
-        #: The Shipment Items.
-        self.items: List[Item] = self._parse_items()
-        #: The Shipment delivery status.
-        self.delivery_status: Optional[str] = self.safe_simple_parse(
-            selector=constants.FIELD_SHIPMENT_DELIVERY_STATUS_SELECTOR)
-        #: The Shipment tracking link.
-        self.tracking_link: Optional[str] = self.safe_simple_parse(
-            selector=constants.FIELD_SHIPMENT_TRACKING_LINK_SELECTOR,
-            link=True)
+        if items is not None:
+            # The Items were already parsed (for example, by the Order), so aren't parsed again
+            self.items = sorted(items)
+            for item in self.items:
+                item.shipment = self
 
     def __repr__(self) -> str:
         return f"<Shipment: \"{self.items}\">"
@@ -45,7 +41,31 @@ class Shipment(Parsable):
         else:
             return str(self.items) < str(other.items)
 
+    @LazyField
+    def items(self) -> List[Item]:
+        """
+        The Shipment Items.
+        """
+        items = self._parse_items()
+        for item in items:
+            item.shipment = self
+        return items
+
+    @LazyField
+    def delivery_status(self) -> Optional[str]:
+        """
+        The Shipment delivery status.
+        """
+        return self.safe_simple_parse(selector=constants.FIELD_SHIPMENT_DELIVERY_STATUS_SELECTOR)
+
+    @LazyField
+    def tracking_link(self) -> Optional[str]:
+        """
+        The Shipment tracking link.
+        """
+        return self.safe_simple_parse(selector=constants.FIELD_SHIPMENT_TRACKING_LINK_SELECTOR, link=True)
+
     def _parse_items(self) -> List[Item]:
-        items = [Item(x) for x in self.parsed.select(ITEM_ENTITY_SELECTOR)]
+        items = [Item(x) for x in css.select(self.parsed, constants.ITEM_ENTITY_SELECTOR)]
         items.sort()
         return items
@@ -1,55 +1,53 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import functools
 import logging
-from datetime import datetime, date
-from typing import Optional
 import re
+from datetime import date
+from typing import Optional
 
 from bs4 import Tag
 
 from amazonorders import constants
 from amazonorders.entity.parsable import Parsable
-from amazonorders.entity.seller import Seller
+from amazonorders.parsing import parse_date, parse_money
 
 logger = logging.getLogger(__name__)
 
 
-# FIELD_TRANSACTION_REGEX = r"\s*(?P<date>\w+\s\d{1,2},\s\d{4})\s+-\s+(?P<source>[^:]+)\:\s*\$(?P<amount>[0-9\.\-]+)\s*"
-ITEMS_SHIPPED_REGEX = r"Items shipped\:\s*(?P<date>\w+\s\d{1,2},\s\d{4})\s+-\s+(?P<source>[^:]+)\:\s*\$(?P<amount>[0-9\.\-]+)\s*"
-REFUND_REGEX = r"Refund\:\s*Completed\s+(?P<date>\w+\s\d{1,2},\s\d{4})\s+-\s+\$(?P<amount>[0-9\.\-]+)\s*"
-
 class Transaction(Parsable):
     """
     A Transaction in an Amazon :class:`~amazonorders.entity.order.Order`.
+
+    Every known kind of row (see ``constants.TRANSACTION_TYPES``) is matched in one pass by
+    ``constants.FIELD_TRANSACTION_REGEX``. A row that doesn't match, or whose purpose isn't known, is still recorded
+    (with its ``text``, and a ``type`` of ``None``), rather than failing the Order.
     """
 
-    def __init__(self, parsed: Tag) -> None:
+    _parse_only_attributes = ("_details_match",)
+
+    def __init__(self,
+                 parsed: Tag) -> None:
         super().__init__(parsed)
 
-        # print(f"Transaction text: [[{parsed.getText('\n', True)}]]")
-        # details_str = self.simple_parse(constants.FIELD_TRANSACTION_DETAILS_SELECTOR, required=True)
-        details_str = parsed.getText('\n', True)
-        # print("Transactions raw: [[[" + details_str + "]]]")
-
-        self._details_match = re.match(ITEMS_SHIPPED_REGEX, details_str, re.MULTILINE)
-        if (self._details_match):
-            self.type = "purchase"
-            self.purpose = "Items shipped"
-        else:
-            self._details_match = re.match(REFUND_REGEX, details_str, re.MULTILINE)
-            if (self._details_match):
-                self.type = "refund"
-                self.purpose = "Refund"
-            else:
-                # logger.error("Unable to parse order transactions")
-                raise Exception(f"Unable to parse order transaction [[{details_str}]]")
+        #: The Transaction row's text, with whitespace collapsed.
+        self.text: str = " ".join(parsed.getText(" ", True).split())
+
+        self._details_match: Optional[re.Match] = _compile(constants.FIELD_TRANSACTION_REGEX).fullmatch(self.text)
+        if not self._details_match:
+            logger.warning(f"When building Transaction, the row `{self.text}` could not be parsed.")
 
+        #: The Transaction purpose, for example ``Items shipped`` or ``Refund``.
+        self.purpose: Optional[str] = self.safe_parse(self._parse_purpose)
+        #: The Transaction type, for example ``purchase`` or ``refund``, or ``None`` if it is not known.
+        self.type: Optional[str] = self.safe_parse(self._parse_type)
         #: The Transaction date.
         self.date: Optional[date] = self.safe_parse(self._parse_date)
         #: The Transaction source.
-        self.source: str = self.safe_parse(self._parse_source)
+        self.source: Optional[str] = self.safe_parse(self._parse_source)
         #: The Transaction amount.
         self.amount: Optional[float] = self.safe_parse(self._parse_amount)
-        #: The Transaction purpose.
-        # self.purpose: Optional[str] = self.safe_parse(self._parse_purpose)
 
     def __repr__(self) -> str:
         return f"<Transaction: [{self.type}] {self.date} - \"{self.source}\": {self.amount}>"
@@ -58,29 +56,33 @@ class Transaction(Parsable):
         return f"Transaction: [{self.type}] {self.date} - {self.source}: {self.amount}"
 
     def __lt__(self, other):
-        return self.date < other.date
+        # Rows that couldn't be parsed have no date, and sort first
+        return (self.date or date.min) < (other.date or date.min)
 
-    def _parse_date(self) -> Optional[date]:
-        # value = None
-        value = datetime.strptime(self._details_match.group("date"), "%B %d, %Y").date()
+    def _parse_purpose(self) -> Optional[str]:
+        return self._details_match.group("purpose") if self._details_match else None
 
-        return value
-
-    def _parse_source(self) -> Optional[str]:
+    def _parse_type(self) -> Optional[str]:
         value = None
-        if "source" in self._details_match.groupdict():
-            value = self._details_match.group("source")
+
+        if self.purpose:
+            value = constants.TRANSACTION_TYPES.get(self.purpose.lower())
+            if not value:
+                logger.warning(f"When building Transaction, the purpose `{self.purpose}` is not a known type.")
 
         return value
 
+    def _parse_date(self) -> Optional[date]:
+        return parse_date(self._details_match.group("date")) if self._details_match else None
+
+    def _parse_source(self) -> Optional[str]:
+        return self._details_match.group("source") if self._details_match else None
+
     def _parse_amount(self) -> Optional[float]:
-        # value = None
-        value = float(self._details_match.group("amount"))
+        return parse_money(self._details_match.group("amount")) if self._details_match else None
 
-        return value
 
-    # def _parse_purpose(self) -> Optional[str]:
-    #     value = self.simple_parse(constants.FIELD_TRANSACTION_PURPOSE_SELECTOR).strip()
-    #     if (value[-1] == ":"):
-    #         value = value[:-1]
-    #     return value
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str) -> re.Pattern:
+    # Compiled once, but by its text, so the pattern in constants can still be overridden at runtime
+    return re.compile(pattern)
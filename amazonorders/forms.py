@@ -3,14 +3,14 @@ __license__ = "MIT"
 
 from abc import ABC
 from io import BytesIO
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from urllib.parse import urlparse
 
 from PIL import Image
 from amazoncaptcha import AmazonCaptcha
 from bs4 import Tag
 
-from amazonorders import constants
+from amazonorders import constants, css
 from amazonorders.exception import AmazonOrdersError, AmazonOrdersAuthError
 
 
@@ -51,7 +51,7 @@ class AuthForm(ABC):
         :return: Whether the ``<form>`` selection was successful.
         """
         self.amazon_session = amazon_session
-        self.form = parsed.select_one(self.selector)
+        self.form = css.select_one(parsed, self.selector)
 
         return self.form is not None
 
@@ -66,7 +66,7 @@ class AuthForm(ABC):
             raise AmazonOrdersError("Call AuthForm.select_form() first.")
 
         self.data = {}
-        for field in self.form.select("input"):
+        for field in css.select(self.form, "input"):
             try:
                 self.data[field["name"]] = field["value"]
             except Exception:
@@ -83,9 +83,7 @@ class AuthForm(ABC):
         elif not self.data:
             raise AmazonOrdersError("Call AuthForm.fill_form() first.")
 
-        method = self.form.get("method", "GET").upper()
-        action = self._get_form_action()
-        request_data = {"params" if method == "GET" else "data": self.data}
+        method, action, request_data = self._get_request_args()
         self.amazon_session.request(method,
                                     action,
                                     **request_data)
@@ -94,6 +92,24 @@ class AuthForm(ABC):
 
         self.clear_form()
 
+    async def submit_async(self) -> None:
+        """
+        Submit the populated ``<form>`` on an :class:`~amazonorders.async_session.AsyncAmazonSession`.
+        """
+        if not self.form:
+            raise AmazonOrdersError("Call AuthForm.select_form() first.")
+        elif not self.data:
+            raise AmazonOrdersError("Call AuthForm.fill_form() first.")
+
+        method, action, request_data = self._get_request_args()
+        await self.amazon_session.request(method,
+                                          action,
+                                          **request_data)
+
+        self._handle_errors()
+
+        self.clear_form()
+
     def clear_form(self) -> None:
         """
         Clear the populated ``<form>`` so this class can be reused.
@@ -107,33 +123,59 @@ class AuthForm(ABC):
         captcha_response = AmazonCaptcha.fromlink(url).solve()
         if not captcha_response or captcha_response.lower() == "not solved":
             img_response = self.amazon_session.session.get(url)
-            img = Image.open(BytesIO(img_response.content))
-            img.show()
+            captcha_response = self._prompt_captcha(url, img_response.content)
+
+        return captcha_response
+
+    async def _solve_captcha_async(self,
+                                   url: str) -> str:
+        # The image is fetched once, with the session's client, so the event loop isn't blocked
+        img_response = await self.amazon_session.session.get(url)
+        captcha_response = AmazonCaptcha(BytesIO(img_response.content)).solve()
+        if not captcha_response or captcha_response.lower() == "not solved":
+            captcha_response = self._prompt_captcha(url, img_response.content)
 
-            self.amazon_session.io.echo("Info: The Captcha couldn't be auto-solved.")
+        return captcha_response
+
+    def _prompt_captcha(self,
+                        url: str,
+                        content: bytes) -> str:
+        img = Image.open(BytesIO(content))
+        img.show()
 
-            captcha_response = self.amazon_session.io.prompt("Enter the characters shown in the image",
-                                                             captcha_img_url=url)
-            self.amazon_session.io.echo("")
+        self.amazon_session.io.echo("Info: The Captcha couldn't be auto-solved.")
+
+        captcha_response = self.amazon_session.io.prompt("Enter the characters shown in the image",
+                                                         captcha_img_url=url)
+        self.amazon_session.io.echo("")
 
         return captcha_response
 
+    def _get_request_args(self) -> Tuple[str, str, Dict[str, Any]]:
+        method = self.form.get("method", "GET").upper()
+        action = self._get_form_action()
+        request_data = {"params" if method == "GET" else "data": self.data}
+
+        return method, action, request_data
+
     def _get_form_action(self) -> str:
         action = self.form.get("action")
+        # Cast, since the URL on an async session's response is not a str
+        last_response_url = str(self.amazon_session.last_response.url)
         if not action:
-            return self.amazon_session.last_response.url
+            return last_response_url
         elif not action.startswith("http"):
             if action.startswith("/"):
-                parsed_url = urlparse(self.amazon_session.last_response.url)
+                parsed_url = urlparse(last_response_url)
                 return f"{parsed_url.scheme}://{parsed_url.netloc}{action}"
             else:
-                return "{url}/{path}".format(url="/".join(self.amazon_session.last_response.url.split("/")[:-1]),
+                return "{url}/{path}".format(url="/".join(last_response_url.split("/")[:-1]),
                                              path=action)
         else:
             return action
 
     def _handle_errors(self) -> None:
-        error_tag = self.amazon_session.last_response_parsed.select_one(self.error_selector)
+        error_tag = css.select_one(self.amazon_session.last_response_parsed, self.error_selector)
         if error_tag:
             error_msg = f"An error occurred: {error_tag.text.strip()}\n"
 
@@ -193,7 +235,7 @@ class MfaDeviceSelectForm(AuthForm):
             additional_attrs = {}
         super().fill_form()
 
-        contexts = self.form.select(constants.MFA_DEVICE_SELECT_INPUT_SELECTOR)
+        contexts = css.select(self.form, constants.MFA_DEVICE_SELECT_INPUT_SELECTOR)
         i = 1
         for field in contexts:
             self.amazon_session.io.echo(f"{i}: {field['value'].strip()}")
@@ -240,18 +282,33 @@ class CaptchaForm(AuthForm):
         super().__init__(selector, error_selector)
 
         self.solution_attr_key = solution_attr_key
+        #: The URL of the Captcha image, found when the form is filled. The Captcha is solved when the form is
+        #: submitted, so an async session can fetch the image without blocking.
+        self.img_url: Optional[str] = None
 
     def fill_form(self,
                   additional_attrs: Optional[Dict[str, Any]] = None) -> None:
-        if not additional_attrs:
-            additional_attrs = {}
         super().fill_form(additional_attrs)
 
         # TODO: eliminate the use of find_parent() here
-        img_url = self.form.find_parent().select_one("img")["src"]
+        img_url = css.select_one(self.form.find_parent(), "img")["src"]
         if not img_url.startswith("http"):
             img_url = f"{constants.BASE_URL}{img_url}"
-        solution = self._solve_captcha(img_url)
+        self.img_url = img_url
 
-        additional_attrs.update({self.solution_attr_key: solution})
-        self.data.update(additional_attrs)
+    def submit(self) -> None:
+        if self.img_url:
+            self.data[self.solution_attr_key] = self._solve_captcha(self.img_url)
+
+        super().submit()
+
+    async def submit_async(self) -> None:
+        if self.img_url:
+            self.data[self.solution_attr_key] = await self._solve_captcha_async(self.img_url)
+
+        await super().submit_async()
+
+    def clear_form(self) -> None:
+        super().clear_form()
+
+        self.img_url = None
@@ -2,17 +2,28 @@ __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
 import datetime
+import json
 import logging
-from typing import List, Optional
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
 
-from amazonorders import constants
-from amazonorders.conf import DEFAULT_OUTPUT_DIR
+from bs4 import BeautifulSoup, Tag
+
+from amazonorders import constants, css
+from amazonorders.conf import DEFAULT_OUTPUT_DIR, DEFAULT_SYNC_STATE_PATH
+from amazonorders.entity.compact import compact
 from amazonorders.entity.order import Order
 from amazonorders.exception import AmazonOrdersError
-from amazonorders.session import AmazonSession
+from amazonorders.session import AmazonSession, supports_parse_only, validate_html_parser
 
 logger = logging.getLogger(__name__)
 
+# A page of history's Orders, if paging stopped at stop_before_date, the next page link, and the number of Orders
+HistoryPage = Tuple[List[Order], bool, Optional[str], Optional[int]]
+
 
 class AmazonOrders:
     """
@@ -23,7 +34,12 @@ class AmazonOrders:
     def __init__(self,
                  amazon_session: AmazonSession,
                  debug: bool = False,
-                 output_dir: Optional[str] = None) -> None:
+                 output_dir: Optional[str] = None,
+                 max_workers: int = 1,
+                 html_parser: Optional[str] = None,
+                 keep_parsed: bool = False,
+                 compact: bool = False,
+                 parse_processes: int = 0) -> None:
         if not output_dir:
             output_dir = DEFAULT_OUTPUT_DIR
 
@@ -36,68 +52,521 @@ class AmazonOrders:
             logger.setLevel(logging.DEBUG)
         #: The directory where any output files will be produced, defaults to ``conf.DEFAULT_OUTPUT_DIR``.
         self.output_dir = output_dir
+        #: The maximum number of concurrent requests to make when fetching Order details. When ``1``, requests will
+        #: be made serially.
+        self.max_workers: int = max_workers
+        if self.max_workers > amazon_session.pool_maxsize:
+            logger.warning(f"max_workers ({self.max_workers}) is greater than the AmazonSession's pool_maxsize "
+                           f"({amazon_session.pool_maxsize}), so some connections won't be reused.")
+        #: The BeautifulSoup parser to build Orders with, defaults to the ``AmazonSession``'s ``html_parser``.
+        self.html_parser: str = validate_html_parser(html_parser) if html_parser else amazon_session.html_parser
+        #: Keep the pages Orders from history crawls are parsed from, and ``parsed`` on the Orders, for debugging.
+        #: Otherwise, each Order is detached (see :func:`~amazonorders.entity.parsable.Parsable.detach`) once it is
+        #: parsed, and its page is decomposed, so memory doesn't grow with every page crawled.
+        self.keep_parsed: bool = keep_parsed
+        #: Return Orders from history crawls as compact entities (see
+        #: :func:`~amazonorders.entity.compact.compact`), which take a fraction of the memory. Ignored when
+        #: ``keep_parsed`` is set.
+        self.compact: bool = compact
+        #: The number of processes to parse Order details pages from history crawls in. When greater than ``0``, the
+        #: HTML of each details page is sent to a :class:`~concurrent.futures.ProcessPoolExecutor`, whose workers
+        #: build the Order and return it detached, so parsing isn't bound by the GIL and scales with cores. While
+        #: pages are parsed, the next are fetched. Orders parsed in the pool are always detached, so ``keep_parsed``
+        #: is ignored. Workers are spawned as new processes, so selectors overridden in ``amazonorders.constants`` at
+        #: runtime aren't seen by them. Call :func:`close` to shut the pool down.
+        self.parse_processes: int = parse_processes
+        self._parse_executor: Optional[ProcessPoolExecutor] = None
+        if self.parse_processes > 0:
+            # Processes are only started once pages are submitted. They are spawned, rather than forked, as forking
+            # while other threads hold the session's locks can deadlock the child. Each worker compiles the selectors
+            # when it starts, as it can't share those compiled here
+            self._parse_executor = ProcessPoolExecutor(max_workers=self.parse_processes,
+                                                       mp_context=multiprocessing.get_context("spawn"),
+                                                       initializer=css.precompile)
+
+        # Selectors are compiled up front (once per process, as they are cached), so the first page parsed doesn't
+        # pay for them
+        css.precompile()
+
+    def close(self) -> None:
+        """
+        Shut down the pool of processes Order details pages are parsed in, if ``parse_processes`` is set.
+        """
+        if self._parse_executor:
+            self._parse_executor.shutdown()
+            self._parse_executor = None
 
     def get_order_history(self,
                           year: int = datetime.date.today().year,
                           start_index: Optional[int] = None,
                           full_details: bool = False,
-                          stop_before_date: datetime.date = None) -> List[Order]:
+                          stop_before_date: datetime.date = None,
+                          start_date: Optional[datetime.date] = None,
+                          end_date: Optional[datetime.date] = None) -> List[Order]:
         """
         Get the Amazon order history for the given year.
 
         :param year: The year for which to get history.
         :param start_index: The index to start at within the history.
         :param full_details: Will execute an additional request per Order in the retrieved history to fully
-            populate it.
+            populate it. These requests are made concurrently when ``max_workers`` is greater than ``1``.
+        :param stop_before_date: Stop paging when an Order placed before this date is reached.
+        :param start_date: Only get Orders placed on or after this date within the year.
+        :param end_date: Only get Orders placed on or before this date within the year.
         :return: A list of the requested Orders.
         """
+        return list(self.iter_order_history(year=year,
+                                            start_index=start_index,
+                                            full_details=full_details,
+                                            stop_before_date=stop_before_date,
+                                            start_date=start_date,
+                                            end_date=end_date))
+
+    def iter_order_history(self,
+                           year: int = datetime.date.today().year,
+                           start_index: Optional[int] = None,
+                           full_details: bool = False,
+                           stop_before_date: datetime.date = None,
+                           start_date: Optional[datetime.date] = None,
+                           end_date: Optional[datetime.date] = None) -> Iterator[Order]:
+        """
+        Iterate the Amazon order history for the given year, yielding each Order as soon as it has been parsed.
+        Pages of history (and Order details) are only requested as the iterator is consumed, so a caller can stop
+        early without making further requests. When ``max_workers`` is greater than ``1``, up to ``max_workers``
+        requests are made ahead of the caller, and those already in flight when it stops are still completed.
+
+        When ``max_workers`` is greater than ``1`` (and neither ``stop_before_date`` nor ``full_details`` is given),
+        the number of Orders is read from the first page, and the remaining pages are requested concurrently. If the
+        number can't be read, the next page links are followed instead. With ``full_details``, pages are requested
+        serially, as each page's details are requested concurrently, so no more than ``max_workers`` requests are
+        made at once.
+
+        When ``start_date`` or ``end_date`` is given, pages are sorted by date, so the first page in the window is
+        found with a binary search over page indexes, and only the pages that overlap the window are requested. If
+        the number of Orders can't be read, the next page links are followed from the first page until the window
+        is passed. A ``stop_before_date`` given with them is treated as a ``start_date``.
+
+        :param year: The year for which to get history.
+        :param start_index: The index to start at within the history.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it. These requests are made concurrently when ``max_workers`` is greater than ``1``.
+        :param stop_before_date: Stop paging when an Order placed before this date is reached.
+        :param start_date: Only get Orders placed on or after this date within the year.
+        :param end_date: Only get Orders placed on or before this date within the year.
+        :return: An iterator of the requested Orders.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
+
+        self._get_order_history_landing()
+
+        if start_date or end_date:
+            if start_index is not None:
+                raise AmazonOrdersError("start_index can't be given with start_date or end_date.")
+            # Both bound the window from below, so the later of the two applies
+            if stop_before_date is not None:
+                start_date = max(start_date or stop_before_date, stop_before_date)
+
+            yield from self._iter_order_history_window(year, start_date, end_date, full_details)
+
+            return
+
+        yield from self._iter_order_history_year(year, start_index, full_details, stop_before_date)
+
+    def get_available_years(self) -> List[int]:
+        """
+        Get the years for which the Amazon order history can be filtered, newest first.
+
+        :return: A list of the available years.
+        """
+        if not self.amazon_session.is_authenticated:
+            raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
+
+        return self._get_order_history_landing()
+
+    def get_all_order_history(self,
+                              years: Optional[List[int]] = None,
+                              full_details: bool = False) -> List[Order]:
+        """
+        Get the Amazon order history across multiple years. The landing page is requested once, and then each year's
+        history is crawled, concurrently when ``max_workers`` is greater than ``1``.
+
+        :param years: The years for which to get history, defaults to all available years.
+        :param full_details: Will execute an additional request per Order in the retrieved history to fully
+            populate it. These requests are made concurrently when ``max_workers`` is greater than ``1``.
+        :return: A list of the requested Orders, newest first.
+        """
         if not self.amazon_session.is_authenticated:
             raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
 
+        available_years = self._get_order_history_landing()
+        if years is None:
+            years = available_years
+
+        orders = []
+        # Full details are fetched after every year is crawled, so the number of concurrent requests is bounded by
+        # max_workers, rather than max_workers for each year
+        # Years are already crawled concurrently, so each year's pages are not
+        for year_orders in self._iter_concurrently(
+                lambda y: list(self._iter_order_history_year(y, paginate_concurrently=False)), years):
+            orders += year_orders
+        orders.sort(key=lambda o: o.order_placed_date or datetime.date.min, reverse=True)
+
+        if full_details:
+            orders = list(self._iter_orders_full_details(orders))
+
+        return orders
+
+    def _get_order_history_landing(self) -> List[int]:
         self.amazon_session.get(constants.ORDER_HISTORY_LANDING_URL)
-        if not self.amazon_session.last_response_parsed.select_one("select[name='timeFilter']"):
+        response_parsed = self.amazon_session.last_response_parsed
+
+        if not css.select_one(response_parsed, "select[name='timeFilter']"):
             constants.HISTORY_FILTER_QUERY_PARAM = "orderFilter"
 
-        orders = []
-        optional_start_index = f"&startIndex={start_index}" if start_index else ""
-        next_page = ("{url}?{query_param}=year-{year}"
-                     "{optional_start_index}").format(url=constants.ORDER_HISTORY_URL,
-                                                      query_param=constants.HISTORY_FILTER_QUERY_PARAM,
-                                                      year=year,
-                                                      optional_start_index=optional_start_index)
-        while next_page:
-            self.amazon_session.get(next_page)
-            response_parsed = self.amazon_session.last_response_parsed
+        years = []
+        for option_tag in css.select(response_parsed, constants.HISTORY_YEAR_OPTION_SELECTOR):
+            value = option_tag.get("value", "")
+            if value.startswith("year-"):
+                years.append(int(value.split("year-")[1]))
 
-            for order_tag in response_parsed.select(constants.ORDER_HISTORY_ENTITY_SELECTOR):
-                order = Order(order_tag)
+        return years
 
-                if (stop_before_date is not None) and order.order_placed_date < stop_before_date:
-                    return orders
+    def _iter_order_history_year(self,
+                                 year: int,
+                                 start_index: Optional[int] = None,
+                                 full_details: bool = False,
+                                 stop_before_date: datetime.date = None,
+                                 paginate_concurrently: bool = True) -> Iterator[Order]:
+        next_page = self._get_order_history_url(year, start_index)
+        while next_page:
+            page_orders, stop, next_page_link, count = self._get_order_history_page(next_page, stop_before_date)
 
-                if full_details:
-                    if "order-details" in order.order_details_link:
-                        self.amazon_session.get(order.order_details_link)
-                        order_details_tag = self.amazon_session.last_response_parsed.select_one(
-                            constants.ORDER_DETAILS_ENTITY_SELECTOR)
-                        order = Order(order_details_tag, full_details=True, clone=order)
+            yield from self._iter_page_orders(page_orders, full_details)
 
-                orders.append(order)
+            if stop:
+                return
 
             next_page = None
             if start_index is None:
-                next_page_tag = response_parsed.select_one(constants.NEXT_PAGE_LINK_SELECTOR)
-                if next_page_tag:
-                    next_page = next_page_tag["href"]
-                    if not next_page.startswith("http"):
-                        next_page = f"{constants.BASE_URL}{next_page}"
-                else:
+                # Paging concurrently would request pages past stop_before_date, so only do so without it. With
+                # full_details, each page's details are already requested concurrently, so pages are requested
+                # serially, and no more than max_workers requests are made at once
+                remaining_pages = None
+                if self.max_workers > 1 and paginate_concurrently and not full_details and stop_before_date is None:
+                    remaining_pages = self._get_remaining_page_urls(year, count)
+
+                if remaining_pages:
+                    for page_orders, _, _, _ in self._iter_concurrently(self._get_order_history_page,
+                                                                        remaining_pages):
+                        yield from self._iter_page_orders(page_orders, full_details)
+
+                    return
+
+                next_page = next_page_link
+                if not next_page:
                     logger.debug("No next page")
             else:
                 logger.debug("start_index is given, not paging")
 
+    def _get_order_history_page(self,
+                                url: str,
+                                stop_before_date: Optional[datetime.date] = None) -> HistoryPage:
+        # Everything needed from the page is read here, so the page can be decomposed before returning
+        self.amazon_session.get(url, parse_only=css.compile_strainer(*constants.ORDER_HISTORY_PARSE_ONLY_SELECTORS))
+        response_parsed = self.amazon_session.last_response_parsed
+
+        page_orders = []
+        stop = False
+        for order_tag in css.select(response_parsed, constants.ORDER_HISTORY_ENTITY_SELECTOR):
+            order = Order(order_tag, html_parser=self.html_parser)
+
+            if (stop_before_date is not None) and order.order_placed_date < stop_before_date:
+                stop = True
+                break
+
+            page_orders.append(order)
+
+        next_page = None
+        next_page_tag = css.select_one(response_parsed, constants.NEXT_PAGE_LINK_SELECTOR)
+        if next_page_tag:
+            next_page = next_page_tag["href"]
+            if not next_page.startswith("http"):
+                next_page = f"{constants.BASE_URL}{next_page}"
+        count = self._get_order_count(response_parsed)
+
+        page_orders = self._detach(page_orders, response_parsed)
+
+        return page_orders, stop, next_page, count
+
+    def _detach(self,
+                orders: List[Order],
+                response_parsed: Tag) -> List[Order]:
+        if self.keep_parsed:
+            return orders
+
+        for order in orders:
+            order.detach()
+        response_parsed.decompose()
+
+        return compact(orders) if self.compact else orders
+
+    def _get_remaining_page_urls(self,
+                                 year: int,
+                                 count: Optional[int]) -> Optional[List[str]]:
+        if count is None:
+            logger.debug("Order count could not be parsed, following next page links")
+
+            return None
+
+        return [self._get_order_history_url(year, start_index)
+                for start_index in range(constants.HISTORY_PAGE_SIZE, count, constants.HISTORY_PAGE_SIZE)]
+
+    def _iter_order_history_window(self,
+                                   year: int,
+                                   start_date: Optional[datetime.date],
+                                   end_date: Optional[datetime.date],
+                                   full_details: bool) -> Iterator[Order]:
+        first_page_orders, _, next_page_link, count = self._get_order_history_page(self._get_order_history_url(year))
+        # Pages requested by the search are kept, so none is requested twice
+        pages = {0: first_page_orders}
+
+        def get_page(page_index: int) -> List[Order]:
+            if page_index not in pages:
+                pages[page_index] = self._get_order_history_page(
+                    self._get_order_history_url(year, page_index * constants.HISTORY_PAGE_SIZE))[0]
+            return pages[page_index]
+
+        def get_window_orders(page_orders: List[Order]) -> List[Order]:
+            return [o for o in page_orders
+                    if (end_date is None or o.order_placed_date <= end_date) and
+                    (start_date is None or o.order_placed_date >= start_date)]
+
+        def is_past_window(page_orders: List[Order]) -> bool:
+            return not page_orders or (start_date is not None and page_orders[-1].order_placed_date < start_date)
+
+        if count is None:
+            logger.debug("Order count could not be parsed, following next page links")
+
+            page_orders = first_page_orders
+            while True:
+                yield from self._iter_page_orders(get_window_orders(page_orders), full_details)
+
+                if not next_page_link or is_past_window(page_orders):
+                    break
+
+                page_orders, _, next_page_link, _ = self._get_order_history_page(next_page_link)
+
+            return
+
+        page_count = -(-count // constants.HISTORY_PAGE_SIZE)
+
+        # Find the first page whose oldest Order is within the window
+        first_page = 0
+        if end_date is not None:
+            low, high = 0, page_count - 1
+            while low < high:
+                middle = (low + high) // 2
+                page_orders = get_page(middle)
+                if not page_orders or page_orders[-1].order_placed_date <= end_date:
+                    high = middle
+                else:
+                    low = middle + 1
+            first_page = low
+
+        logger.debug(f"Window starts on page {first_page} of {page_count}")
+
+        for page_index in range(first_page, page_count):
+            page_orders = get_page(page_index)
+
+            yield from self._iter_page_orders(get_window_orders(page_orders), full_details)
+
+            if is_past_window(page_orders):
+                break
+
+    def _get_order_count(self,
+                         response_parsed: Tag) -> Optional[int]:
+        count_tag = css.select_one(response_parsed, constants.HISTORY_ORDER_COUNT_SELECTOR)
+        try:
+            return int(count_tag.text.strip().split(" ")[0].replace(",", ""))
+        except (AttributeError, ValueError):
+            return None
+
+    def _get_order_history_url(self,
+                               year: int,
+                               start_index: Optional[int] = None) -> str:
+        optional_start_index = f"&startIndex={start_index}" if start_index else ""
+        return ("{url}?{query_param}=year-{year}"
+                "{optional_start_index}").format(url=constants.ORDER_HISTORY_URL,
+                                                 query_param=constants.HISTORY_FILTER_QUERY_PARAM,
+                                                 year=year,
+                                                 optional_start_index=optional_start_index)
+
+    def sync(self,
+             state_path: Optional[str] = None) -> List[Order]:
+        """
+        Incrementally sync the Amazon order history. The newest Order seen is persisted per account as a high-water
+        mark, and history is paged backwards from today only until that Order is reached. Full details are then
+        fetched for new Orders, and for any previously synced Orders that were not yet settled (for example, not yet
+        delivered), since those may have changed.
+
+        On the first sync for an account, the current year's history is synced. Only years listed in the history
+        filter are crawled, and the landing page they're read from is requested once.
+
+        :param state_path: The path to persist sync state, defaults to ``conf.DEFAULT_SYNC_STATE_PATH``.
+        :return: A list of the new and changed Orders, with full details.
+        """
+        if not state_path:
+            state_path = DEFAULT_SYNC_STATE_PATH
+
+        state = {}
+        if os.path.exists(state_path):
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.loads(f.read())
+        account = self.amazon_session.username or "default"
+        account_state = state.get(account, {})
+
+        known_order_number = account_state.get("order_number")
+        known_order_placed_date = None
+        if account_state.get("order_placed_date"):
+            known_order_placed_date = datetime.date.fromisoformat(account_state["order_placed_date"])
+        pending_order_numbers = account_state.get("pending_order_numbers", [])
+
+        new_orders = []
+        today = datetime.date.today()
+        first_year = known_order_placed_date.year if known_order_placed_date else today.year
+        years = list(range(today.year, first_year - 1, -1))
+        # The landing page is requested once, and only years that have history are crawled
+        available_years = self.get_available_years()
+        if available_years:
+            years = [year for year in years if year in available_years]
+        for year in years:
+            for order in self._iter_order_history_year(year, stop_before_date=known_order_placed_date):
+                if order.order_number == known_order_number:
+                    break
+
+                new_orders.append(order)
+            else:
+                continue
+            break
+
+        logger.debug(f"Sync found {len(new_orders)} new Orders")
+
+        new_order_numbers = [order.order_number for order in new_orders]
+        changed_order_numbers = [n for n in pending_order_numbers if n not in new_order_numbers]
+
+        orders = list(self._iter_orders_full_details(new_orders))
+        orders += self._iter_concurrently(self.get_order, changed_order_numbers)
+
+        if orders:
+            if new_orders:
+                account_state["order_number"] = orders[0].order_number
+                # If the newest Order's date couldn't be parsed, the newest date that could is kept instead, which
+                # still bounds the next sync's paging, as the Order is reached before it
+                order_placed_date = next((order.order_placed_date for order in orders[:len(new_orders)]
+                                          if order.order_placed_date), known_order_placed_date)
+                account_state["order_placed_date"] = order_placed_date.isoformat() if order_placed_date else None
+            account_state["pending_order_numbers"] = [order.order_number for order in orders
+                                                      if not self._is_settled(order)]
+            state[account] = account_state
+
+            state_dir = os.path.dirname(state_path)
+            if state_dir and not os.path.exists(state_dir):
+                os.makedirs(state_dir)
+            with open(state_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(state))
+
         return orders
 
+    def _is_settled(self,
+                    order: Order) -> bool:
+        # Older Orders don't show a delivery status, and are settled
+        return all(not shipment.delivery_status or
+                   any(shipment.delivery_status.startswith(p) for p in constants.SETTLED_DELIVERY_STATUS_PREFIXES)
+                   for shipment in order.shipments)
+
+    def _iter_concurrently(self,
+                           function: Callable[[Any], Any],
+                           values: List[Any]) -> Iterable[Any]:
+        if self.max_workers > 1 and len(values) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(values))) as executor:
+                # Results are yielded in submission order, so they are returned as they would be serially. No more
+                # than max_workers values are submitted at once, so if the caller stops early, only those already
+                # submitted are waited on, and any not yet started are cancelled
+                pending: Deque[Future] = deque()
+                try:
+                    for value in values:
+                        pending.append(executor.submit(function, value))
+                        if len(pending) >= self.max_workers:
+                            yield pending.popleft().result()
+                    while pending:
+                        yield pending.popleft().result()
+                finally:
+                    for future in pending:
+                        future.cancel()
+        else:
+            for value in values:
+                yield function(value)
+
+    def _iter_page_orders(self,
+                          page_orders: List[Order],
+                          full_details: bool) -> Iterator[Order]:
+        if full_details:
+            return self._iter_orders_full_details(page_orders)
+
+        return iter(page_orders)
+
+    def _iter_orders_full_details(self,
+                                  orders: List[Order]) -> Iterator[Order]:
+        # With a parse pool, up to parse_processes pages are parsed while the next are fetched
+        pending: Deque[Union[Order, Future]] = deque()
+        for submitted in self._iter_concurrently(self._submit_order_full_details, orders):
+            pending.append(submitted)
+            if len(pending) > self.parse_processes:
+                yield self._get_submitted_order(pending.popleft())
+        while pending:
+            yield self._get_submitted_order(pending.popleft())
+
+    def _submit_order_full_details(self,
+                                   order: Order) -> Union[Order, Future]:
+        if "order-details" not in order.order_details_link:
+            return order
+
+        if self._parse_executor:
+            self.amazon_session.get(order.order_details_link)
+
+            return self._parse_executor.submit(parse_order_details_page, self.amazon_session.last_response.text,
+                                               self.html_parser, order, self.compact)
+
+        self.amazon_session.get(order.order_details_link,
+                                parse_only=css.compile_strainer(*constants.ORDER_DETAILS_PARSE_ONLY_SELECTORS))
+        order_details_tag = css.select_one(self.amazon_session.last_response_parsed,
+                                           constants.ORDER_DETAILS_ENTITY_SELECTOR)
+
+        order = Order(order_details_tag, full_details=True, clone=order, html_parser=self.html_parser)
+        order = self._detach([order], self.amazon_session.last_response_parsed)[0]
+        self._pin_if_immutable(order.order_details_link, order)
+
+        return order
+
+    def _get_submitted_order(self,
+                             submitted: Union[Order, Future]) -> Order:
+        if not isinstance(submitted, Future):
+            return submitted
+
+        order = submitted.result()
+        self._pin_if_immutable(order.order_details_link, order)
+
+        return order
+
+    def _pin_if_immutable(self,
+                          url: str,
+                          order: Order) -> None:
+        response_cache = self.amazon_session.response_cache
+        if response_cache and order.order_placed_date and \
+                (datetime.date.today() - order.order_placed_date).days > response_cache.immutable_after_days:
+            response_cache.pin(url)
+
     def get_order(self,
                   order_id: str) -> Order:
         """
@@ -109,10 +578,40 @@ class AmazonOrders:
         if not self.amazon_session.is_authenticated:
             raise AmazonOrdersError("Call AmazonSession.login() to authenticate first.")
 
-        self.amazon_session.get(f"{constants.ORDER_DETAILS_URL}?orderID={order_id}")
+        url = f"{constants.ORDER_DETAILS_URL}?orderID={order_id}"
+        # A single page is parsed here, as waiting on the parse pool for it would only add the cost of sending it
+        self.amazon_session.get(url, parse_only=css.compile_strainer(*constants.ORDER_DETAILS_PARSE_ONLY_SELECTORS))
 
-        order_details_tag = self.amazon_session.last_response_parsed.select_one(
-            constants.ORDER_DETAILS_ENTITY_SELECTOR)
-        order = Order(order_details_tag, full_details=True)
+        order_details_tag = css.select_one(self.amazon_session.last_response_parsed,
+                                           constants.ORDER_DETAILS_ENTITY_SELECTOR)
+        order = Order(order_details_tag, full_details=True, html_parser=self.html_parser)
+        self._pin_if_immutable(url, order)
 
         return order
+
+
+def parse_order_details_page(html: str,
+                             html_parser: str,
+                             clone: Optional[Order] = None,
+                             compact_order: bool = False) -> Order:
+    """
+    Parse an Order from the HTML of its details page, and detach it. This is what ``parse_processes`` workers run,
+    so it is given the page's HTML, rather than a tree, and only the Order's fields are sent back.
+
+    :param html: The HTML of the Order details page.
+    :param html_parser: The BeautifulSoup parser to build the tree with.
+    :param clone: The Order, from history, to clone fields from.
+    :param compact_order: Return a compact entity (see :func:`~amazonorders.entity.compact.compact`).
+    :return: The detached Order.
+    """
+    parse_only = None
+    if supports_parse_only(html_parser):
+        parse_only = css.compile_strainer(*constants.ORDER_DETAILS_PARSE_ONLY_SELECTORS)
+    response_parsed = BeautifulSoup(html, html_parser, parse_only=parse_only)
+
+    order_details_tag = css.select_one(response_parsed, constants.ORDER_DETAILS_ENTITY_SELECTOR)
+    order = Order(order_details_tag, full_details=True, clone=clone, html_parser=html_parser)
+    order.detach()
+    response_parsed.decompose()
+
+    return compact(order) if compact_order else order
@@ -0,0 +1,87 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import functools
+import logging
+import re
+from decimal import Decimal
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+#: Month names, full and abbreviated, in lowercase, to their number. Used instead of ``strptime()``'s ``%B`` and
+#: ``%b``, which depend on the locale.
+MONTHS = {name: number for number, month in enumerate(["january", "february", "march", "april", "may", "june",
+                                                       "july", "august", "september", "october", "november",
+                                                       "december"], start=1)
+          for name in [month, month[:3]]}
+MONTHS["sept"] = 9
+
+DATE_REGEX = re.compile(r"(?P<month>[A-Za-z]+)\.?\s+(?P<day>\d{1,2}),\s*(?P<year>\d{4})")
+# Matches the whole value, so the currency symbol is optional
+MONEY_REGEX = re.compile(r"(?P<negative>[-−(])?\s*(?:[A-Z]{0,3}[$£€¥₹])?\s*(?P<negative_after_symbol>-)?\s*"
+                         r"(?P<number>\d[\d,.\s]*?)\s*[$£€¥₹]?\s*\)?")
+# Match an amount within other text, so the currency symbol is required, and other numbers in the text (like a
+# quantity) aren't mistaken for it. An amount with the symbol before it is preferred, so in "Qty 2 $3.00", the $
+# belongs to 3.00, and the symbol after a number only counts if no other number follows it
+MONEY_IN_TEXT_REGEX = re.compile(r"(?P<negative>[-−(])?\s*[A-Z]{0,3}[$£€¥₹]\s*(?P<negative_after_symbol>-)?\s*"
+                                 r"(?P<number>\d(?:[\d,.]*\d)?)")
+MONEY_SYMBOL_AFTER_IN_TEXT_REGEX = re.compile(r"(?P<negative>[-−(])?\s*(?P<number>\d(?:[\d,.]*\d)?)\s*"
+                                              r"[$£€¥₹](?!\s*\d)")
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date(value: str) -> datetime.date:
+    """
+    Parse a date formatted like ``December 7, 2023`` or ``Dec 7, 2023``, as Amazon formats them. Dates repeat often
+    across a history, so parsed dates are cached.
+
+    :param value: The date text.
+    :return: The parsed date.
+    """
+    match = DATE_REGEX.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"`{value}` is not a date")
+
+    try:
+        month = MONTHS[match.group("month").lower()]
+    except KeyError:
+        raise ValueError(f"`{value}` does not have a valid month")
+
+    return datetime.date(int(match.group("year")), month, int(match.group("day")))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_money(value: str,
+                as_decimal: bool = False) -> Union[float, Decimal]:
+    """
+    Parse an amount of money, like ``$1,234.56``, ``-$4.99``, ``($4.99)``, or ``€1.234,56``. Currency symbols and
+    thousands separators are ignored. If both ``,`` and ``.`` are present, whichever is last is the decimal separator.
+    If only ``,`` is present, it is the decimal separator when exactly two digits follow it. An amount within other
+    text, like ``2 items: $1,234.56``, must have a currency symbol. Like dates, parsed amounts are cached.
+
+    :param value: The money text.
+    :param as_decimal: Return a ``Decimal`` instead of a ``float``.
+    :return: The parsed amount.
+    """
+    match = MONEY_REGEX.fullmatch(value.strip()) or MONEY_IN_TEXT_REGEX.search(value) or \
+        MONEY_SYMBOL_AFTER_IN_TEXT_REGEX.search(value)
+    if not match:
+        raise ValueError(f"`{value}` is not an amount of money")
+
+    number = "".join(match.group("number").split())
+    if "," in number and "." in number:
+        if number.rindex(",") > number.rindex("."):
+            number = number.replace(".", "").replace(",", ".")
+        else:
+            number = number.replace(",", "")
+    elif "," in number:
+        whole, _, fraction = number.rpartition(",")
+        number = f"{whole.replace(',', '')}.{fraction}" if len(fraction) == 2 else number.replace(",", "")
+    number = number.rstrip(".")
+
+    if match.group("negative") or match.groupdict().get("negative_after_symbol"):
+        number = f"-{number}"
+
+    return Decimal(number) if as_decimal else float(number)
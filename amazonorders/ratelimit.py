@@ -0,0 +1,138 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    A token bucket that paces requests to ``requests_per_second``, while allowing bursts of up to ``burst`` requests.
+    When given to an :class:`~amazonorders.session.AmazonSession`, each request made on the session first takes a
+    token, waiting if none are available.
+
+    The bucket is shared by all threads using the limiter. When ``state_path`` is set, the bucket is kept in a SQLite
+    file there instead, so it is shared by all processes using that file. ``AmazonSession`` sets ``state_path``
+    alongside its cookie jar, if it is not already set, so processes sharing a cookie jar share a bucket.
+    """
+
+    def __init__(self,
+                 requests_per_second: float = 1.0,
+                 burst: int = 1,
+                 state_path: Optional[str] = None) -> None:
+        #: The rate at which tokens are added to the bucket.
+        self.requests_per_second: float = requests_per_second
+        #: The maximum number of tokens the bucket holds, and so the number of requests that can be made at once.
+        self.burst: int = burst
+        #: If set, the path to a SQLite file in which the bucket is shared across processes.
+        self.state_path: Optional[str] = state_path
+        #: The number of tokens taken from the bucket.
+        self.requests: int = 0
+        #: The number of tokens taken that had to wait.
+        self.waits: int = 0
+        #: The total seconds callers waited for tokens.
+        self.total_wait: float = 0.0
+        #: The longest, in seconds, a caller waited for a token.
+        self.max_wait: float = 0.0
+
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._tokens: float = burst
+        self._updated_at: float = time.time()
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket, without waiting for it. If the bucket is empty, the token is borrowed from the
+        future, and the caller must wait before making its request.
+
+        :return: The seconds the caller must wait before making its request.
+        """
+        with self._lock:
+            if self.state_path:
+                wait = self._reserve_shared()
+            else:
+                self._tokens, self._updated_at, wait = self._take(self._tokens, self._updated_at)
+
+            self.requests += 1
+            if wait > 0:
+                self.waits += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+        return wait
+
+    def acquire(self) -> float:
+        """
+        Take a token from the bucket, waiting until it is available.
+
+        :return: The seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Waiting {wait:.2f}s for the rate limiter")
+
+            time.sleep(wait)
+
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the limiter's counters for this process, suitable for exporting as metrics.
+
+        :return: The number of ``requests``, how many ``waits`` there were, and the ``total_wait`` and ``max_wait``
+            in seconds.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "waits": self.waits,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+            }
+
+    def _take(self,
+              tokens: float,
+              updated_at: float) -> tuple:
+        now = time.time()
+        tokens = min(float(self.burst), tokens + max(0.0, now - updated_at) * self.requests_per_second) - 1
+
+        wait = max(0.0, -tokens / self.requests_per_second)
+
+        return tokens, now, wait
+
+    def _reserve_shared(self) -> float:
+        if self._connection is None:
+            state_dir = os.path.dirname(self.state_path)
+            if state_dir and not os.path.exists(state_dir):
+                os.makedirs(state_dir)
+
+            # Transactions are managed explicitly, so the bucket can be locked against other processes
+            self._connection = sqlite3.connect(self.state_path, timeout=30, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS bucket ("
+                                     "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                                     "tokens REAL NOT NULL, "
+                                     "updated_at REAL NOT NULL)")
+
+        # BEGIN IMMEDIATE takes the file's write lock, so no other process can take a token until we commit
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute("SELECT tokens, updated_at FROM bucket WHERE id = 0").fetchone()
+            tokens, updated_at = row if row else (float(self.burst), time.time())
+
+            tokens, updated_at, wait = self._take(tokens, updated_at)
+
+            self._connection.execute("INSERT OR REPLACE INTO bucket (id, tokens, updated_at) VALUES (0, ?, ?)",
+                                     (tokens, updated_at))
+            self._connection.execute("COMMIT")
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+
+        return wait
@@ -0,0 +1,212 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import email.utils
+import logging
+import random
+import threading
+from typing import Dict, List, Optional, Union
+
+from amazonorders import constants
+from amazonorders.exception import AmazonOrdersError
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Determines when a request made by an :class:`~amazonorders.session.AmazonSession` should be retried, and how
+    long to wait before retrying it.
+
+    A response is retried if its status is in ``retry_statuses``, or if it is one of Amazon's "Sorry, something went
+    wrong" interstitial pages (see ``constants.TRANSIENT_ERROR_PAGE_TEXTS``), which are served with a ``200``. Waits
+    back off exponentially, with full jitter, unless the response has a ``Retry-After`` header, which is honored.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_factor: float = 1.0,
+                 max_backoff: float = 60.0,
+                 jitter: bool = True,
+                 retry_statuses: Optional[List[int]] = None,
+                 retry_methods: Optional[List[str]] = None) -> None:
+        if retry_statuses is None:
+            retry_statuses = [429, 500, 502, 503, 504]
+        if retry_methods is None:
+            retry_methods = ["GET"]
+
+        #: The maximum number of times a single request will be retried.
+        self.max_retries: int = max_retries
+        #: The wait before the first retry, doubled for each retry after.
+        self.backoff_factor: float = backoff_factor
+        #: The longest, in seconds, that will be waited before a retry, including when given by ``Retry-After``.
+        self.max_backoff: float = max_backoff
+        #: Wait a random time up to the backoff, so concurrent requests don't retry in lockstep.
+        self.jitter: bool = jitter
+        #: Response statuses that will be retried.
+        self.retry_statuses: List[int] = retry_statuses
+        #: Request methods that will be retried. By default, only ``GET``, as retrying a form submission may
+        #: submit it twice.
+        self.retry_methods: List[str] = retry_methods
+        #: The number of retries made.
+        self.retries: int = 0
+        #: The number of retries made, by reason (the response status, or ``interstitial``).
+        self.retries_by_reason: Dict[str, int] = {}
+        #: The number of requests that still failed after ``max_retries``.
+        self.exhausted: int = 0
+        #: The total seconds waited before retries.
+        self.total_backoff: float = 0.0
+
+        self._lock = threading.Lock()
+
+    def next_backoff(self,
+                     method: str,
+                     url: str,
+                     attempt: int,
+                     status_code: int,
+                     text: str,
+                     retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Check if a response should be retried and, if so, count the retry and get how long to wait before it.
+
+        If the response is an interstitial page and ``max_retries`` has been reached, an exception is raised, as the
+        page contains nothing to parse.
+
+        :param method: The request method.
+        :param url: The request URL.
+        :param attempt: The number of retries already made for the request.
+        :param status_code: The response status.
+        :param text: The response body.
+        :param retry_after: The value of the response's ``Retry-After`` header, if any.
+        :return: The seconds to wait before retrying, or ``None`` if the response should not be retried.
+        """
+        reason = self.get_retry_reason(method, status_code, text)
+        if not reason:
+            return None
+
+        if attempt >= self.max_retries:
+            self.record_exhausted()
+
+            if reason == "interstitial":
+                raise AmazonOrdersError(f"Amazon returned an error page for {url}, and it was retried {attempt} "
+                                        f"times. Wait a bit before trying again.")
+
+            return None
+
+        backoff = self.get_backoff(attempt, retry_after)
+        self.record_retry(reason, backoff)
+
+        logger.debug(f"Retrying {url} in {backoff:.2f}s, reason: {reason}")
+
+        return backoff
+
+    def get_retry_reason(self,
+                         method: str,
+                         status_code: int,
+                         text: str) -> Optional[str]:
+        """
+        Check if a response should be retried.
+
+        :param method: The request method.
+        :param status_code: The response status.
+        :param text: The response body.
+        :return: The reason the response should be retried, or ``None`` if it should not be.
+        """
+        if method not in self.retry_methods:
+            return None
+
+        if status_code in self.retry_statuses:
+            return str(status_code)
+
+        if status_code == 200 and is_transient_error_page(text):
+            return "interstitial"
+
+        return None
+
+    def get_backoff(self,
+                    attempt: int,
+                    retry_after: Optional[str] = None) -> float:
+        """
+        Get the seconds to wait before the given retry.
+
+        :param attempt: The number of retries already made for the request.
+        :param retry_after: The value of the response's ``Retry-After`` header, if any.
+        :return: The seconds to wait.
+        """
+        backoff = parse_retry_after(retry_after) if retry_after else None
+
+        if backoff is None:
+            backoff = self.backoff_factor * (2 ** attempt)
+            if self.jitter:
+                backoff = random.uniform(0, backoff)
+
+        return min(backoff, self.max_backoff)
+
+    def record_retry(self,
+                     reason: str,
+                     backoff: float) -> None:
+        """
+        Count a retry in the policy's metrics.
+
+        :param reason: The reason for the retry.
+        :param backoff: The seconds waited before the retry.
+        """
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+            self.total_backoff += backoff
+
+    def record_exhausted(self) -> None:
+        """
+        Count a request that still failed after ``max_retries`` in the policy's metrics.
+        """
+        with self._lock:
+            self.exhausted += 1
+
+    def stats(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        """
+        Get the policy's counters, suitable for exporting as metrics.
+
+        :return: The number of ``retries``, ``retries_by_reason``, the number of requests ``exhausted``, and the
+            ``total_backoff`` in seconds.
+        """
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "retries_by_reason": dict(self.retries_by_reason),
+                "exhausted": self.exhausted,
+                "total_backoff": self.total_backoff,
+            }
+
+
+def is_transient_error_page(text: str) -> bool:
+    """
+    Check if a page is one of Amazon's "Sorry, something went wrong" interstitials.
+
+    :param text: The page's body.
+    :return: ``True`` if the page is an interstitial.
+    """
+    return any(error_text in text for error_text in constants.TRANSIENT_ERROR_PAGE_TEXTS)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header, which is either a number of seconds or an HTTP date.
+
+    :param value: The header value.
+    :return: The seconds to wait, or ``None`` if the value could not be parsed.
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -4,18 +4,25 @@ __license__ = "MIT"
 import json
 import logging
 import os
-from typing import Optional, Any
+import threading
+import time
+from typing import Optional, Any, Dict
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from bs4.builder import builder_registry
 from requests import Session, Response
+from requests.adapters import HTTPAdapter
 from requests.utils import dict_from_cookiejar
 
 from amazonorders import constants
-from amazonorders.conf import DEFAULT_COOKIE_JAR_PATH, DEFAULT_OUTPUT_DIR
-from amazonorders.exception import AmazonOrdersAuthError
+from amazonorders.cache import ResponseCache
+from amazonorders.conf import DEFAULT_COOKIE_JAR_PATH, DEFAULT_OUTPUT_DIR, DEFAULT_HTML_PARSER
+from amazonorders.exception import AmazonOrdersError, AmazonOrdersAuthError
 from amazonorders.forms import SignInForm, MfaDeviceSelectForm, MfaForm, CaptchaForm
+from amazonorders.ratelimit import RateLimiter
+from amazonorders.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +36,40 @@ AUTH_FORMS = [SignInForm(),
               MfaForm(constants.CAPTCHA_OTP_FORM_SELECTOR)]
 
 
+def validate_html_parser(html_parser: str) -> str:
+    """
+    Ensure the given BeautifulSoup parser is installed.
+
+    :param html_parser: The name of the parser, for example ``html.parser`` or ``lxml``.
+    :return: The name of the parser.
+    """
+    if builder_registry.lookup(html_parser) is None:
+        raise AmazonOrdersError(f"The HTML parser `{html_parser}` is not installed.")
+
+    return html_parser
+
+
+def supports_parse_only(html_parser: str) -> bool:
+    """
+    Whether the given BeautifulSoup parser can build only part of a page, when given ``parse_only``. ``html5lib``
+    can't, and builds the whole page.
+
+    :param html_parser: The name of the parser, for example ``html.parser`` or ``lxml``.
+    :return: ``True`` if the parser supports ``parse_only``.
+    """
+    return "html5lib" not in builder_registry.lookup(html_parser).features
+
+
+def get_rate_limit_state_path(cookie_jar_path: str) -> str:
+    """
+    Get the path of the shared rate limit state for the given cookie jar.
+
+    :param cookie_jar_path: The path of the cookie jar.
+    :return: The path of the rate limit state.
+    """
+    return f"{os.path.splitext(cookie_jar_path)[0]}-rate-limit.sqlite3"
+
+
 class IODefault:
     """
     Handles input/output from the application. By default, this uses console commands, but
@@ -78,11 +119,21 @@ class AmazonSession:
                  max_auth_attempts: int = 10,
                  cookie_jar_path: str = None,
                  io: IODefault = IODefault(),
-                 output_dir: str = None) -> None:
+                 output_dir: str = None,
+                 html_parser: str = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None) -> None:
         if not cookie_jar_path:
             cookie_jar_path = DEFAULT_COOKIE_JAR_PATH
         if not output_dir:
             output_dir = DEFAULT_OUTPUT_DIR
+        if not html_parser:
+            html_parser = DEFAULT_HTML_PARSER
 
         #: An Amazon username.
         self.username: str = username
@@ -101,16 +152,44 @@ class AmazonSession:
         self.io: IODefault = io
         #: The directory where any output files will be produced, defaults to ``conf.DEFAULT_OUTPUT_DIR``.
         self.output_dir = output_dir
+        #: The BeautifulSoup parser to build trees with, defaults to ``conf.DEFAULT_HTML_PARSER``. A C-accelerated
+        #: parser, like ``lxml``, is significantly faster, but must be installed separately.
+        self.html_parser: str = validate_html_parser(html_parser)
+        #: If set, ``GET`` requests for cacheable URLs will be served from this cache while fresh.
+        self.response_cache: Optional[ResponseCache] = response_cache
+        #: If set, each request will first take a token from this limiter, waiting if necessary. If its
+        #: ``state_path`` is not set, it is set alongside ``cookie_jar_path``, so processes sharing a cookie jar also
+        #: share a limit.
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        if self.rate_limiter and not self.rate_limiter.state_path:
+            self.rate_limiter.state_path = get_rate_limit_state_path(self.cookie_jar_path)
+        #: If set, requests that fail with a transient error will be retried as determined by this policy.
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        #: The number of hosts the session will keep a connection pool for.
+        self.pool_connections: int = pool_connections
+        #: The maximum number of connections kept open per host. This should be at least the number of threads
+        #: making requests concurrently, or they will open (and close) connections beyond it.
+        self.pool_maxsize: int = pool_maxsize
+        #: Seconds to wait for a connection to be established, or ``None`` to wait forever.
+        self.connect_timeout: Optional[float] = connect_timeout
+        #: Seconds to wait for the server to send data, or ``None`` to wait forever.
+        self.read_timeout: Optional[float] = read_timeout
 
         #: The shared session to be used across all requests.
-        self.session: Session = Session()
-        #: The last response executed on the Session.
-        self.last_response: Optional[Response] = None
-        #: A parsed representation of the last response executed on the Session.
-        self.last_response_parsed: Optional[Tag] = None
+        self.session: Session = self._build_session()
         #: If :func:`login` has been executed and successfully logged in the session.
         self.is_authenticated: bool = False
 
+        # The last response is tracked per thread, so concurrent requests on a shared session don't clobber
+        # each other, and a lock guards the persisted cookie jar
+        self._thread_local: threading.local = threading.local()
+        self._cookie_jar_lock: threading.Lock = threading.Lock()
+
+        self._stats_lock: threading.Lock = threading.Lock()
+        self._requests: int = 0
+        self._total_elapsed: float = 0.0
+        self._max_elapsed: float = 0.0
+
         cookie_dir = os.path.dirname(self.cookie_jar_path)
         if not os.path.exists(cookie_dir):
             os.makedirs(cookie_dir)
@@ -120,36 +199,110 @@ class AmazonSession:
                 cookies = requests.utils.cookiejar_from_dict(data)
                 self.session.cookies.update(cookies)
 
+    @property
+    def last_response(self) -> Optional[Response]:
+        """
+        The last response executed on the Session by the current thread.
+        """
+        return getattr(self._thread_local, "last_response", None)
+
+    @last_response.setter
+    def last_response(self,
+                      value: Optional[Response]) -> None:
+        self._thread_local.last_response = value
+        self._thread_local.last_response_parsed = None
+        self._thread_local.last_response_parse_only = None
+
+    @property
+    def last_response_parsed(self) -> Optional[Tag]:
+        """
+        A parsed representation of the last response executed on the Session by the current thread. The response
+        is only parsed the first time this is accessed, so requests whose response is never queried (for example,
+        when only the raw ``last_response.content`` is needed) skip parsing entirely. If the request was given
+        ``parse_only``, only the parts of the response it matches are built.
+        """
+        if getattr(self._thread_local, "last_response_parsed", None) is None and self.last_response is not None:
+            parse_only = None
+            if supports_parse_only(self.html_parser):
+                parse_only = self._thread_local.last_response_parse_only
+            self._thread_local.last_response_parsed = BeautifulSoup(self.last_response.text,
+                                                                    self.html_parser,
+                                                                    parse_only=parse_only)
+
+        return getattr(self._thread_local, "last_response_parsed", None)
+
+    @last_response_parsed.setter
+    def last_response_parsed(self,
+                             value: Optional[Tag]) -> None:
+        self._thread_local.last_response_parsed = value
+
     def request(self,
                 method: str,
                 url: str,
+                parse_only: Optional[SoupStrainer] = None,
                 **kwargs: Any) -> Response:
         """
-        Execute the request against Amazon with base headers, parsing and storing the response
-        and persisting response cookies.
+        Execute the request against Amazon with base headers, storing the response (which is parsed lazily, see
+        ``last_response_parsed``) and persisting response cookies. If a ``retry_policy`` is set, transient failures
+        are retried before the response is returned.
 
         :param method: The request method to execute.
         :param url: The URL to execute ``method`` on.
+        :param parse_only: Only build the parts of the response this matches when it's parsed, see
+            :func:`~amazonorders.css.compile_strainer`.
         :param kwargs: Remaining ``kwargs`` will be passed to :func:`requests.request`.
         :return: The Response from the executed request.
         """
         if "headers" not in kwargs:
             kwargs["headers"] = {}
         kwargs["headers"].update(constants.BASE_HEADERS)
+        if "timeout" not in kwargs and (self.connect_timeout is not None or self.read_timeout is not None):
+            kwargs["timeout"] = (self.connect_timeout, self.read_timeout)
 
         logger.debug(f"{method} request to {url}")
 
-        self.last_response = self.session.request(method, url, **kwargs)
-        self.last_response_parsed = BeautifulSoup(self.last_response.text,
-                                                  "html.parser")
+        if self.response_cache and method == "GET":
+            body = self.response_cache.get(url)
+            if body is not None:
+                self.last_response = self._build_cached_response(url, body)
+                self._thread_local.last_response_parse_only = parse_only
 
-        cookies = dict_from_cookiejar(self.session.cookies)
-        if os.path.exists(self.cookie_jar_path):
-            os.remove(self.cookie_jar_path)
-        with open(self.cookie_jar_path, "w", encoding="utf-8") as f:
-            f.write(json.dumps(cookies))
+                return self.last_response
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            self.last_response = self.session.request(method, url, **kwargs)
+            self._record_elapsed(self.last_response.elapsed.total_seconds())
+
+            if not self.retry_policy:
+                break
 
-        logger.debug(f"Response: {self.last_response.url} - {self.last_response.status_code}")
+            backoff = self.retry_policy.next_backoff(method, url, attempt, self.last_response.status_code,
+                                                     self.last_response.text,
+                                                     self.last_response.headers.get("Retry-After"))
+            if backoff is None:
+                break
+
+            time.sleep(backoff)
+            attempt += 1
+
+        self._thread_local.last_response_parse_only = parse_only
+
+        if self.response_cache and method == "GET" and self.last_response.ok:
+            self.response_cache.put(url, self.last_response.text)
+
+        with self._cookie_jar_lock:
+            cookies = dict_from_cookiejar(self.session.cookies)
+            if os.path.exists(self.cookie_jar_path):
+                os.remove(self.cookie_jar_path)
+            with open(self.cookie_jar_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(cookies))
+
+        logger.debug(f"Response: {self.last_response.url} - {self.last_response.status_code} "
+                     f"in {self.last_response.elapsed.total_seconds():.3f}s")
 
         if self.debug:
             page_name = self._get_page_from_url(self.last_response.url)
@@ -237,18 +390,75 @@ class AmazonSession:
 
     def logout(self) -> None:
         """
-        Logout and close the existing Amazon session and clear cookies.
+        Logout of the existing Amazon session and clear cookies.
         """
         self.get(constants.SIGN_OUT_URL)
 
         if os.path.exists(self.cookie_jar_path):
             os.remove(self.cookie_jar_path)
 
-        self.session.close()
-        self.session = Session()
+        # Only cookies are cleared, so pooled connections can be reused by the next login
+        self.session.cookies.clear()
+
+        # Cached pages belong to the account that was logged in
+        if self.response_cache:
+            self.response_cache.clear()
 
         self.is_authenticated = False
 
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the session's counters for this process, suitable for exporting as metrics. Comparing the number of
+        ``connections`` opened to the number of ``requests`` made shows how well connections are being reused.
+
+        :return: The number of ``requests`` sent (responses served from ``response_cache`` are not counted), their
+            ``total_elapsed`` and ``max_elapsed`` in seconds, and the number of ``connections`` opened by the
+            session's current connection pools.
+        """
+        connections = 0
+        for adapter in set(self.session.adapters.values()):
+            if isinstance(adapter, HTTPAdapter):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is not None:
+                        connections += pool.num_connections
+
+        with self._stats_lock:
+            return {
+                "requests": self._requests,
+                "total_elapsed": self._total_elapsed,
+                "max_elapsed": self._max_elapsed,
+                "connections": connections,
+            }
+
+    def _record_elapsed(self,
+                        elapsed: float) -> None:
+        with self._stats_lock:
+            self._requests += 1
+            self._total_elapsed += elapsed
+            self._max_elapsed = max(self._max_elapsed, elapsed)
+
+    def _build_session(self) -> Session:
+        session = Session()
+
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def _build_cached_response(self,
+                               url: str,
+                               body: str) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = body.encode("utf-8")
+
+        return response
+
     def _get_page_from_url(self,
                            url: str) -> str:
         page_name = os.path.splitext(os.path.basename(urlparse(url).path))[0]
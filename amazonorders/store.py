@@ -0,0 +1,429 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+
+from amazonorders.conf import DEFAULT_STORE_PATH, DEFAULT_HTML_PARSER
+from amazonorders.entity.item import Item
+from amazonorders.entity.order import Order
+from amazonorders.entity.parsable import Parsable
+from amazonorders.entity.recipient import Recipient
+from amazonorders.entity.seller import Seller
+from amazonorders.entity.shipment import Shipment
+from amazonorders.entity.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+Entity = TypeVar("Entity", bound=Parsable)
+
+ORDER_COLUMNS = ["order_number", "full_details", "order_details_link", "grand_total", "order_placed_date",
+                 "payment_method", "payment_method_last_4", "subtotal", "shipping_total", "subscription_discount",
+                 "total_before_tax", "estimated_tax", "refund_total", "order_shipped_date", "refund_completed_date",
+                 "recipient_name", "recipient_address", "subtotals"]
+SHIPMENT_COLUMNS = ["order_number", "position", "delivery_status", "tracking_link"]
+ITEM_COLUMNS = ["order_number", "order_position", "shipment_position", "position", "title", "link", "price",
+                "seller_name", "seller_link", "condition", "return_eligible_date", "image_link", "quantity"]
+TRANSACTION_COLUMNS = ["order_number", "position", "type", "purpose", "date", "source", "amount", "text"]
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS orders ("
+    "order_number TEXT PRIMARY KEY, "
+    "full_details INTEGER NOT NULL, "
+    "order_details_link TEXT, "
+    "grand_total REAL, "
+    "order_placed_date TEXT, "
+    "payment_method TEXT, "
+    "payment_method_last_4 TEXT, "
+    "subtotal REAL, "
+    "shipping_total REAL, "
+    "subscription_discount REAL, "
+    "total_before_tax REAL, "
+    "estimated_tax REAL, "
+    "refund_total REAL, "
+    "order_shipped_date TEXT, "
+    "refund_completed_date TEXT, "
+    "recipient_name TEXT, "
+    "recipient_address TEXT, "
+    "subtotals TEXT)",
+    "CREATE TABLE IF NOT EXISTS shipments ("
+    "order_number TEXT NOT NULL, "
+    "position INTEGER NOT NULL, "
+    "delivery_status TEXT, "
+    "tracking_link TEXT, "
+    "PRIMARY KEY (order_number, position))",
+    # An Item is stored once, even if it is in both the Order's and a Shipment's Items. order_position is its
+    # position in the Order's Items, if it's there, and shipment_position is the Shipment it belongs to, if any
+    "CREATE TABLE IF NOT EXISTS items ("
+    "order_number TEXT NOT NULL, "
+    "order_position INTEGER, "
+    "shipment_position INTEGER, "
+    "position INTEGER NOT NULL, "
+    "title TEXT, "
+    "link TEXT, "
+    "price REAL, "
+    "seller_name TEXT, "
+    "seller_link TEXT, "
+    "condition TEXT, "
+    "return_eligible_date TEXT, "
+    "image_link TEXT, "
+    "quantity INTEGER)",
+    "CREATE TABLE IF NOT EXISTS transactions ("
+    "order_number TEXT NOT NULL, "
+    "position INTEGER NOT NULL, "
+    "type TEXT, "
+    "purpose TEXT, "
+    "date TEXT, "
+    "source TEXT, "
+    "amount REAL, "
+    "text TEXT, "
+    "PRIMARY KEY (order_number, position))",
+    "CREATE INDEX IF NOT EXISTS orders_order_placed_date ON orders (order_placed_date)",
+    "CREATE INDEX IF NOT EXISTS items_order_number ON items (order_number)",
+    "CREATE INDEX IF NOT EXISTS items_seller_name ON items (seller_name)",
+]
+
+
+class OrderStore:
+    """
+    A local SQLite store of Orders, including their Shipments, Items, Recipients, Sellers, and Transactions, so
+    questions about order history can be answered without making requests to Amazon.
+
+    Orders are upserted by their ``order_number``, so storing an Order again (for example, once its full details
+    have been fetched) replaces what was stored before. Orders built from the store have no ``parsed`` data.
+    """
+
+    def __init__(self,
+                 store_path: Optional[str] = None,
+                 batch_size: int = 500) -> None:
+        if not store_path:
+            store_path = DEFAULT_STORE_PATH
+
+        #: The path to the SQLite store file, defaults to ``conf.DEFAULT_STORE_PATH``.
+        self.store_path: str = store_path
+        #: The number of Orders written per transaction by :func:`upsert`.
+        self.batch_size: int = batch_size
+
+        store_dir = os.path.dirname(self.store_path)
+        if store_dir and not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.store_path, check_same_thread=False)
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def upsert(self,
+               orders: Iterable[Order]) -> int:
+        """
+        Insert the given Orders, replacing any that are already stored. Orders are written in batches of
+        ``batch_size``, each in a single transaction.
+
+        :param orders: The Orders to store.
+        :return: The number of Orders stored.
+        """
+        count = 0
+        batch = []
+        for order in orders:
+            batch.append(order)
+            if len(batch) >= self.batch_size:
+                self._upsert_batch(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._upsert_batch(batch)
+            count += len(batch)
+
+        logger.debug(f"Stored {count} Orders")
+
+        return count
+
+    def get_order(self,
+                  order_number: str) -> Optional[Order]:
+        """
+        Get the stored Order with the given number.
+
+        :param order_number: The Amazon Order ID to lookup.
+        :return: The stored Order, or ``None``.
+        """
+        orders = self.query_orders(order_numbers=[order_number])
+        return orders[0] if orders else None
+
+    def query_orders(self,
+                     order_numbers: Optional[List[str]] = None,
+                     start_date: Optional[datetime.date] = None,
+                     end_date: Optional[datetime.date] = None,
+                     seller: Optional[str] = None,
+                     item_title_contains: Optional[str] = None) -> List[Order]:
+        """
+        Query stored Orders, newest first. Filters that are given are combined.
+
+        :param order_numbers: Only include Orders with these numbers.
+        :param start_date: Only include Orders placed on or after this date.
+        :param end_date: Only include Orders placed on or before this date.
+        :param seller: Only include Orders with an Item sold by this Seller.
+        :param item_title_contains: Only include Orders with an Item whose title contains this (case-insensitive).
+        :return: A list of the matching Orders.
+        """
+        where = []
+        params: List[Any] = []
+        if order_numbers is not None:
+            where.append(f"order_number IN ({', '.join('?' * len(order_numbers))})")
+            params += order_numbers
+        if start_date:
+            where.append("order_placed_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            where.append("order_placed_date <= ?")
+            params.append(end_date.isoformat())
+        if seller:
+            where.append("order_number IN (SELECT order_number FROM items WHERE seller_name = ?)")
+            params.append(seller)
+        if item_title_contains:
+            where.append("order_number IN (SELECT order_number FROM items WHERE title LIKE ?)")
+            params.append(f"%{item_title_contains}%")
+
+        where_clause = f" WHERE {' AND '.join(where)}" if where else ""
+        order_numbers_query = f"SELECT order_number FROM orders{where_clause}"
+
+        with self._lock:
+            order_rows = self._select(f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders{where_clause} "
+                                      f"ORDER BY order_placed_date DESC, order_number", params)
+            children = {}
+            for table, columns in [("shipments", SHIPMENT_COLUMNS),
+                                   ("items", ITEM_COLUMNS),
+                                   ("transactions", TRANSACTION_COLUMNS)]:
+                children[table] = {}
+                for row in self._select(f"SELECT {', '.join(columns)} FROM {table} "
+                                        f"WHERE order_number IN ({order_numbers_query}) ORDER BY position", params):
+                    children[table].setdefault(row["order_number"], []).append(row)
+
+        return [self._build_order(row,
+                                  children["shipments"].get(row["order_number"], []),
+                                  children["items"].get(row["order_number"], []),
+                                  children["transactions"].get(row["order_number"], []))
+                for row in order_rows]
+
+    def spend_by_month(self,
+                       year: Optional[int] = None) -> Dict[str, float]:
+        """
+        Sum the grand totals of stored Orders by the month they were placed. Orders without a grand total add nothing.
+
+        :param year: Only include Orders placed in this year.
+        :return: A ``dict`` of month (``YYYY-MM``) to total spend, in month order.
+        """
+        query = "SELECT substr(order_placed_date, 1, 7) AS month, COALESCE(SUM(grand_total), 0) FROM orders"
+        params = []
+        if year:
+            query += " WHERE order_placed_date >= ? AND order_placed_date < ?"
+            params += [f"{year}-01-01", f"{year + 1}-01-01"]
+        query += " GROUP BY month ORDER BY month"
+
+        with self._lock:
+            return {month: round(total, 2) for month, total in self._connection.execute(query, params).fetchall()}
+
+    def count(self) -> int:
+        """
+        :return: The number of stored Orders.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Close the connection to the store.
+        """
+        self._connection.close()
+
+    def _upsert_batch(self,
+                      orders: List[Order]) -> None:
+        order_numbers = [(order.order_number,) for order in orders]
+
+        order_rows = []
+        shipment_rows = []
+        item_rows = []
+        transaction_rows = []
+        for order in orders:
+            recipient = order.recipient
+            order_rows.append((order.order_number,
+                               int(order.full_details),
+                               order.order_details_link,
+                               order.grand_total,
+                               self._to_iso(order.order_placed_date),
+                               order.payment_method,
+                               order.payment_method_last_4,
+                               order.subtotal,
+                               order.shipping_total,
+                               order.subscription_discount,
+                               order.total_before_tax,
+                               order.estimated_tax,
+                               order.refund_total,
+                               self._to_iso(order.order_shipped_date),
+                               self._to_iso(order.refund_completed_date),
+                               recipient.name if recipient else None,
+                               recipient.address if recipient else None,
+                               json.dumps(order.subtotals) if order.subtotals is not None else None))
+
+            # Items shared by the Order and a Shipment are the same object, so they are matched by identity
+            item_positions = {id(item): i for i, item in enumerate(order.items)}
+            for i, shipment in enumerate(order.shipments):
+                shipment_rows.append((order.order_number, i, shipment.delivery_status, shipment.tracking_link))
+                for j, item in enumerate(shipment.items):
+                    item_rows.append(self._item_row(order.order_number, item_positions.pop(id(item), None), i, j,
+                                                    item))
+            for item in order.items:
+                if id(item) in item_positions:
+                    i = item_positions[id(item)]
+                    item_rows.append(self._item_row(order.order_number, i, None, i, item))
+            for i, transaction in enumerate(order.transactions or []):
+                transaction_rows.append((order.order_number,
+                                         i,
+                                         transaction.type,
+                                         transaction.purpose,
+                                         self._to_iso(transaction.date),
+                                         transaction.source,
+                                         transaction.amount,
+                                         transaction.text))
+
+        with self._lock, self._connection:
+            for table in ["shipments", "items", "transactions"]:
+                self._connection.executemany(f"DELETE FROM {table} WHERE order_number = ?", order_numbers)
+            self._connection.executemany(self._insert_statement("orders", ORDER_COLUMNS, replace=True), order_rows)
+            self._connection.executemany(self._insert_statement("shipments", SHIPMENT_COLUMNS), shipment_rows)
+            self._connection.executemany(self._insert_statement("items", ITEM_COLUMNS), item_rows)
+            self._connection.executemany(self._insert_statement("transactions", TRANSACTION_COLUMNS),
+                                         transaction_rows)
+
+    def _item_row(self,
+                  order_number: str,
+                  order_position: Optional[int],
+                  shipment_position: Optional[int],
+                  position: int,
+                  item: Item) -> tuple:
+        seller = item.seller
+        return (order_number,
+                order_position,
+                shipment_position,
+                position,
+                item.title,
+                item.link,
+                item.price,
+                seller.name if seller else None,
+                seller.link if seller else None,
+                item.condition,
+                self._to_iso(item.return_eligible_date),
+                item.image_link,
+                item.quantity)
+
+    def _insert_statement(self,
+                          table: str,
+                          columns: List[str],
+                          replace: bool = False) -> str:
+        verb = "INSERT OR REPLACE" if replace else "INSERT"
+        return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    def _select(self,
+                query: str,
+                params: List[Any]) -> List[Dict[str, Any]]:
+        cursor = self._connection.execute(query, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _build_order(self,
+                     row: Dict[str, Any],
+                     shipment_rows: List[Dict[str, Any]],
+                     item_rows: List[Dict[str, Any]],
+                     transaction_rows: List[Dict[str, Any]]) -> Order:
+        items = [(r, self._build_item(r)) for r in item_rows]
+
+        shipments = []
+        for shipment_row in shipment_rows:
+            shipment = self._build(Shipment,
+                                   items=[item for r, item in items
+                                          if r["shipment_position"] == shipment_row["position"]],
+                                   delivery_status=shipment_row["delivery_status"],
+                                   tracking_link=shipment_row["tracking_link"])
+            for item in shipment.items:
+                item.shipment = shipment
+            shipments.append(shipment)
+
+        recipient = None
+        if row["recipient_name"] is not None:
+            recipient = self._build(Recipient, name=row["recipient_name"], address=row["recipient_address"])
+
+        transactions = None
+        if row["full_details"]:
+            transactions = [self._build(Transaction,
+                                        type=r["type"],
+                                        purpose=r["purpose"],
+                                        date=self._from_iso(r["date"]),
+                                        source=r["source"],
+                                        amount=r["amount"],
+                                        text=r["text"]) for r in transaction_rows]
+
+        return self._build(Order,
+                           full_details=bool(row["full_details"]),
+                           html_parser=DEFAULT_HTML_PARSER,
+                           shipments=shipments,
+                           items=[item for r, item in sorted(items, key=lambda x: x[0]["order_position"] or 0)
+                                  if r["order_position"] is not None],
+                           order_number=row["order_number"],
+                           order_details_link=row["order_details_link"],
+                           grand_total=row["grand_total"],
+                           order_placed_date=self._from_iso(row["order_placed_date"]),
+                           recipient=recipient,
+                           payment_method=row["payment_method"],
+                           payment_method_last_4=row["payment_method_last_4"],
+                           subtotals=json.loads(row["subtotals"]) if row["subtotals"] is not None else None,
+                           subtotal=row["subtotal"],
+                           shipping_total=row["shipping_total"],
+                           subscription_discount=row["subscription_discount"],
+                           total_before_tax=row["total_before_tax"],
+                           estimated_tax=row["estimated_tax"],
+                           refund_total=row["refund_total"],
+                           order_shipped_date=self._from_iso(row["order_shipped_date"]),
+                           refund_completed_date=self._from_iso(row["refund_completed_date"]),
+                           transactions=transactions)
+
+    def _build_item(self,
+                    row: Dict[str, Any]) -> Item:
+        seller = None
+        if row["seller_name"] is not None:
+            seller = self._build(Seller, name=row["seller_name"], link=row["seller_link"])
+
+        return self._build(Item,
+                           title=row["title"],
+                           link=row["link"],
+                           price=row["price"],
+                           seller=seller,
+                           condition=row["condition"],
+                           return_eligible_date=self._from_iso(row["return_eligible_date"]),
+                           image_link=row["image_link"],
+                           quantity=row["quantity"],
+                           shipment=None)
+
+    def _build(self,
+               entity_class: Type[Entity],
+               **fields: Any) -> Entity:
+        # An entity's __init__ needs the parsed page its fields are parsed from, which the store doesn't keep, so
+        # entities are built the way they are unpickled instead, detached, with every field populated from its row.
+        # The values shadow any LazyField, so nothing is ever parsed. Each field is read from the column of the same
+        # name, except an Order's subtotals, which are stored as JSON, and an Item's shipment, which is set from its
+        # shipment_position, so the Item is shared with its Shipment's Items
+        entity = entity_class.__new__(entity_class)
+        entity.__dict__.update(parsed=None, **fields)
+        return entity
+
+    def _to_iso(self,
+                value: Optional[datetime.date]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    def _from_iso(self,
+                  value: Optional[str]) -> Optional[datetime.date]:
+        return datetime.date.fromisoformat(value) if value else None
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import gc
+import os
+import sys
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants
+from amazonorders.entity.compact import compact
+from amazonorders.entity.order import Order
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+RESOURCES_DIR = os.path.join(ROOT_DIR, "tests", "resources")
+
+
+def _parse_orders(pages, mode):
+    orders = []
+    for html, details in pages:
+        parsed = BeautifulSoup(html, "html.parser")
+        if details:
+            page_orders = [Order(parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR), full_details=True)]
+        else:
+            page_orders = [Order(order_tag) for order_tag in parsed.select(constants.ORDER_HISTORY_ENTITY_SELECTOR)]
+
+        if mode == "attached":
+            # Parse every field, but keep the tree, as Orders did before they could be detached
+            for order in page_orders:
+                order.__getstate__()
+        else:
+            for order in page_orders:
+                order.detach()
+            parsed.decompose()
+
+            if mode == "compact":
+                page_orders = compact(page_orders)
+
+        orders += page_orders
+
+    return orders
+
+
+def benchmark_memory(args):
+    """
+    The purpose of this script is to compare the memory held by Orders parsed from the pages in tests/resources
+    when they keep their trees ("attached"), once they are detached, and once they are compacted. Memory is measured
+    with tracemalloc after the Orders are built, and reported per 10,000 Orders.
+
+    Pass the number of times to parse each page as the first argument (defaults to 20).
+    """
+    iterations = int(args[0]) if args else 20
+
+    pages = []
+    for resource in sorted(os.listdir(RESOURCES_DIR)):
+        if resource.startswith("order-"):
+            with open(os.path.join(RESOURCES_DIR, resource), "r", encoding="utf-8") as f:
+                pages.append((f.read(), resource.startswith("order-details")))
+    pages *= iterations
+
+    results = {}
+    for mode in ["attached", "detached", "compact"]:
+        gc.collect()
+        tracemalloc.start()
+
+        orders = _parse_orders(pages, mode)
+        gc.collect()
+        results[mode] = tracemalloc.get_traced_memory()[0] / len(orders) * 10000
+
+        tracemalloc.stop()
+        del orders
+
+    for mode, size in results.items():
+        print(f"{mode:>10}  {size / 1024 / 1024:10.1f} MB per 10,000 Orders  "
+              f"attached / {mode} {results['attached'] / size:8.2f}x  "
+              f"detached / {mode} {results['detached'] / size:6.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark_memory(sys.argv[1:])
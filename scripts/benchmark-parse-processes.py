@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from amazonorders.conf import DEFAULT_HTML_PARSER
+from amazonorders.orders import parse_order_details_page
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+RESOURCES_DIR = os.path.join(ROOT_DIR, "tests", "resources")
+
+
+def _parse_pages(pages, parse_processes):
+    if not parse_processes:
+        start = time.perf_counter()
+        orders = [parse_order_details_page(html, DEFAULT_HTML_PARSER) for html in pages]
+        return orders, time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=parse_processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+        # The pool's processes are started before timing, as AmazonOrders keeps its pool between pages
+        list(executor.map(parse_order_details_page, pages[:parse_processes], [DEFAULT_HTML_PARSER] * parse_processes))
+
+        start = time.perf_counter()
+        orders = list(executor.map(parse_order_details_page, pages, [DEFAULT_HTML_PARSER] * len(pages)))
+        return orders, time.perf_counter() - start
+
+
+def benchmark_parse_processes(args):
+    """
+    The purpose of this script is to compare the time it takes to parse the Order details pages in tests/resources
+    in this process, as ``AmazonOrders`` does by default, to parsing them in a pool of processes, as it does when
+    given ``parse_processes``.
+
+    Pass the number of times to parse each page as the first argument (defaults to 20).
+    """
+    iterations = int(args[0]) if args else 20
+
+    pages = []
+    for resource in sorted(os.listdir(RESOURCES_DIR)):
+        if resource.startswith("order-details"):
+            with open(os.path.join(RESOURCES_DIR, resource), "r", encoding="utf-8") as f:
+                pages.append(f.read())
+    pages *= iterations
+
+    _, serial_seconds = _parse_pages(pages, 0)
+    print(f"{'serial':>12}  {serial_seconds * 1000:8.1f} ms  {len(pages) / serial_seconds:8.1f} pages/s")
+
+    parse_processes = 1
+    while parse_processes <= (os.cpu_count() or 1):
+        _, seconds = _parse_pages(pages, parse_processes)
+        print(f"{parse_processes:>12}  {seconds * 1000:8.1f} ms  {len(pages) / seconds:8.1f} pages/s  "
+              f"({serial_seconds / seconds:.2f}x)")
+        parse_processes *= 2
+
+
+if __name__ == "__main__":
+    benchmark_parse_processes(sys.argv[1:])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from amazonorders import constants, css
+from amazonorders.entity.order import Order
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+RESOURCES_DIR = os.path.join(ROOT_DIR, "tests", "resources")
+
+
+def _build_tree(html, html_parser, details, strained):
+    parse_only = None
+    if strained:
+        parse_only = css.compile_strainer(*(constants.ORDER_DETAILS_PARSE_ONLY_SELECTORS if details
+                                            else constants.ORDER_HISTORY_PARSE_ONLY_SELECTORS))
+
+    return BeautifulSoup(html, html_parser, parse_only=parse_only)
+
+
+def _parse_page(html, html_parser, details, strained):
+    parsed = _build_tree(html, html_parser, details, strained)
+    if details:
+        orders = [Order(parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR), full_details=True,
+                        html_parser=html_parser)]
+    else:
+        orders = [Order(order_tag, html_parser=html_parser)
+                  for order_tag in parsed.select(constants.ORDER_HISTORY_ENTITY_SELECTOR)]
+
+    # Fields are parsed lazily, so detaching is what parses them
+    for order in orders:
+        order.detach()
+
+
+def _peak_memory(html, html_parser, details, strained):
+    tracemalloc.start()
+    _parse_page(html, html_parser, details, strained)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+
+def benchmark_parsers(args):
+    """
+    The purpose of this script is to compare the time it takes to build the tree for, and then parse the Orders
+    from, the pages in tests/resources with each installed BeautifulSoup parser, both building the whole page and
+    only the parts Orders are parsed from (see ``constants.ORDER_HISTORY_PARSE_ONLY_SELECTORS``). Tree building is
+    reported on its own, since that is the only part of the work the parser changes, along with the peak memory
+    parsing each page takes.
+
+    Pass the number of iterations per page as the first argument (defaults to 5).
+    """
+    iterations = int(args[0]) if args else 5
+
+    pages = []
+    for resource in sorted(os.listdir(RESOURCES_DIR)):
+        if resource.startswith("order-"):
+            with open(os.path.join(RESOURCES_DIR, resource), "r", encoding="utf-8") as f:
+                pages.append((resource, f.read(), resource.startswith("order-details")))
+
+    html_parsers = [p for p in ["html.parser", "lxml", "html5lib"] if builder_registry.lookup(p)]
+
+    results = {}
+    for html_parser in html_parsers:
+        # html5lib doesn't support building only part of a page
+        for strained in [False, True] if html_parser != "html5lib" else [False]:
+            name = f"{html_parser}{' strained' if strained else ''}"
+            results[name] = [0, 0, 0]
+            for resource, html, details in pages:
+                build_seconds = timeit.timeit(lambda: _build_tree(html, html_parser, details, strained),
+                                              number=iterations) / iterations
+                total_seconds = timeit.timeit(lambda: _parse_page(html, html_parser, details, strained),
+                                              number=iterations) / iterations
+                peak = _peak_memory(html, html_parser, details, strained)
+                results[name][0] += build_seconds
+                results[name][1] += total_seconds
+                results[name][2] = max(results[name][2], peak)
+                print(f"{name:>20}  {resource:<45} build {build_seconds * 1000:8.1f} ms  "
+                      f"total {total_seconds * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MB")
+
+    print("")
+    baseline_build, baseline_total, baseline_peak = results["html.parser"]
+    for name, (build_seconds, total_seconds, peak) in results.items():
+        print(f"{name:>20}  build {build_seconds * 1000:8.1f} ms ({baseline_build / build_seconds:.2f}x)  "
+              f"total {total_seconds * 1000:8.1f} ms ({baseline_total / total_seconds:.2f}x)  "
+              f"peak {peak / 1024 / 1024:6.1f} MB ({baseline_peak / peak:.2f}x)")
+
+if __name__ == "__main__":
+    benchmark_parsers(sys.argv[1:])
@@ -0,0 +1,161 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import unittest
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import httpx
+
+from amazonorders.async_orders import AsyncAmazonOrders
+from amazonorders.async_session import AsyncAmazonSession
+from amazonorders.constants import BASE_URL, SIGN_IN_URL, SIGN_IN_REDIRECT_URL, ORDER_HISTORY_LANDING_URL, \
+    ORDER_HISTORY_URL, ORDER_DETAILS_URL
+from amazonorders.entity.compact import CompactOrder
+from amazonorders.exception import AmazonOrdersError
+from tests.unittestcase import UnitTestCase
+
+
+class TestAsync(UnitTestCase, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.requested_urls = []
+        self.requests = []
+        self.routes = {}
+
+        self.amazon_session = AsyncAmazonSession("some-username", "some-password")
+
+        self.amazon_orders = AsyncAmazonOrders(self.amazon_session)
+
+    async def asyncSetUp(self):
+        # The session's own client is closed, and replaced with one whose requests are handled by the test
+        await self.amazon_session.session.aclose()
+        self.amazon_session.session = httpx.AsyncClient(transport=httpx.MockTransport(self._handle_request),
+                                                        follow_redirects=True)
+
+    async def asyncTearDown(self):
+        await self.amazon_session.close()
+
+    def given_route_exists(self, method, url, resource, startswith=False):
+        with open(os.path.join(self.RESOURCES_DIR, resource), "rb") as f:
+            self.routes[(method, url, startswith)] = f.read()
+
+    def _handle_request(self, request):
+        url = str(request.url)
+        self.requested_urls.append(url)
+        self.requests.append(request)
+        for (method, route_url, startswith), body in self.routes.items():
+            if request.method == method and (url.startswith(route_url) if startswith else url == route_url):
+                return httpx.Response(200, content=body)
+        return httpx.Response(404)
+
+    async def test_get_orders_unauthenticated(self):
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            await self.amazon_orders.get_order_history()
+
+    async def test_login(self):
+        # GIVEN
+        self.given_route_exists("GET", SIGN_IN_URL, "signin.html")
+        self.given_route_exists("POST", SIGN_IN_REDIRECT_URL, "order-history-2018-0.html")
+
+        # WHEN
+        await self.amazon_session.login()
+
+        # THEN
+        self.assertTrue(self.amazon_session.is_authenticated)
+        self.assertEqual([SIGN_IN_URL, SIGN_IN_REDIRECT_URL], self.requested_urls)
+        self.assertEqual(2, self.amazon_session.stats()["requests"])
+
+    async def test_login_captcha(self):
+        # GIVEN
+        captcha_img_url = "https://opfcaptcha-prod.s3.amazonaws.com/d32ff4fa043d4f969a1693adfb5d663a.jpg"
+        self.given_route_exists("GET", SIGN_IN_URL, "signin.html")
+        self.given_route_exists("POST", SIGN_IN_REDIRECT_URL, "post-signin-captcha-1.html")
+        self.given_route_exists("GET", captcha_img_url, "captcha_easy.jpg")
+        self.given_route_exists("POST", f"{BASE_URL}/ap/verify", "order-history-2018-0.html")
+
+        # WHEN
+        await self.amazon_session.login()
+
+        # THEN
+        self.assertTrue(self.amazon_session.is_authenticated)
+        # The Captcha image is fetched with the session's client
+        self.assertEqual([SIGN_IN_URL, SIGN_IN_REDIRECT_URL, captcha_img_url, f"{BASE_URL}/ap/verify"],
+                         self.requested_urls)
+        self.assertEqual(["FBJRAC"], parse_qs(self.requests[-1].content.decode())["cvf_captcha_input"])
+
+    async def test_get_order_history_full_details(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2020
+        start_index = 40
+        history_url = f"{ORDER_HISTORY_URL}?timeFilter=year-{year}&startIndex={start_index}"
+        self.given_route_exists("GET", ORDER_HISTORY_LANDING_URL, "order-history-2023-10.html")
+        self.given_route_exists("GET", history_url, f"order-history-{year}-{start_index}.html")
+        self.given_route_exists("GET", ORDER_DETAILS_URL, "order-details-114-9460922-7737063.html", startswith=True)
+
+        # WHEN
+        orders = await self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assert_order_114_9460922_7737063(orders[3], True)
+        self.assertEqual(12, len(self.requested_urls))
+
+    async def test_get_order_history_full_details_parse_processes(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2020
+        start_index = 40
+        history_url = f"{ORDER_HISTORY_URL}?timeFilter=year-{year}&startIndex={start_index}"
+        self.given_route_exists("GET", ORDER_HISTORY_LANDING_URL, "order-history-2023-10.html")
+        self.given_route_exists("GET", history_url, f"order-history-{year}-{start_index}.html")
+        self.given_route_exists("GET", ORDER_DETAILS_URL, "order-details-114-9460922-7737063.html", startswith=True)
+        amazon_orders = AsyncAmazonOrders(self.amazon_session, parse_processes=2, compact=True)
+
+        # WHEN
+        try:
+            orders = await amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+        finally:
+            await amazon_orders.close()
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assertIsInstance(orders[3], CompactOrder)
+        self.assert_order_114_9460922_7737063(orders[3], True)
+        self.assertEqual(12, len(self.requested_urls))
+
+    async def test_get_order_parse_processes(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        self.given_route_exists("GET", f"{ORDER_DETAILS_URL}?orderID={order_id}", f"order-details-{order_id}.html")
+        amazon_orders = AsyncAmazonOrders(self.amazon_session, parse_processes=2)
+
+        # WHEN
+        try:
+            with patch.object(amazon_orders._parse_executor, "submit") as submit_mock:
+                order = await amazon_orders.get_order(order_id)
+        finally:
+            await amazon_orders.close()
+
+        # THEN
+        # A single Order is parsed in process, as the sync API does
+        submit_mock.assert_not_called()
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+
+    async def test_get_order(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        self.given_route_exists("GET", f"{ORDER_DETAILS_URL}?orderID={order_id}", f"order-details-{order_id}.html")
+
+        # WHEN
+        order = await self.amazon_orders.get_order(order_id)
+
+        # THEN
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assertEqual(1, len(self.requested_urls))
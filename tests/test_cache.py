@@ -0,0 +1,116 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+import responses
+
+from amazonorders.cache import ResponseCache
+from amazonorders.constants import ORDER_DETAILS_URL, ORDER_HISTORY_URL
+from amazonorders.orders import AmazonOrders
+from amazonorders.session import AmazonSession
+from tests.unittestcase import UnitTestCase
+
+
+class TestCache(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.response_cache = ResponseCache(os.path.join(self.cache_dir, "cache.sqlite3"))
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_get_uncacheable(self):
+        # GIVEN
+        url = f"{ORDER_HISTORY_URL}?timeFilter=year-2023"
+        self.response_cache.put(url, "<html></html>")
+
+        # WHEN
+        body = self.response_cache.get(url)
+
+        # THEN
+        self.assertIsNone(body)
+        self.assertEqual({"hits": 0, "misses": 0, "entries": 0, "size": 0}, self.response_cache.stats())
+
+    def test_get_fresh_and_stale(self):
+        # GIVEN
+        url = f"{ORDER_DETAILS_URL}?orderID=112-9685975-5907428"
+        self.response_cache.rules = {ORDER_DETAILS_URL: datetime.timedelta(hours=1)}
+        self.response_cache.put(url, "<html></html>")
+
+        # WHEN
+        fresh_body = self.response_cache.get(f"{url}&ref=ppx_yo_dt_b_order_details_o00")
+        self.response_cache.rules = {ORDER_DETAILS_URL: datetime.timedelta(0)}
+        stale_body = self.response_cache.get(url)
+
+        # THEN
+        self.assertEqual("<html></html>", fresh_body)
+        self.assertIsNone(stale_body)
+        self.assertEqual({"hits": 1, "misses": 1, "entries": 1, "size": 13}, self.response_cache.stats())
+
+    def test_pin(self):
+        # GIVEN
+        url = f"{ORDER_DETAILS_URL}?orderID=112-9685975-5907428"
+        self.response_cache.put(url, "<html></html>")
+
+        # WHEN
+        stale_body = self.response_cache.get(url)
+        self.response_cache.pin(url)
+        pinned_body = self.response_cache.get(url)
+
+        # THEN
+        self.assertIsNone(stale_body)
+        self.assertEqual("<html></html>", pinned_body)
+
+    def test_evict_least_recently_used(self):
+        # GIVEN
+        self.response_cache.max_size = 30
+        urls = [f"{ORDER_DETAILS_URL}?orderID={order_id}" for order_id in range(3)]
+        for url in urls[:2]:
+            self.response_cache.put(url, "<html></html>")
+            self.response_cache.pin(url)
+            time.sleep(0.01)
+        self.response_cache.get(urls[0])
+        time.sleep(0.01)
+
+        # WHEN
+        self.response_cache.put(urls[2], "<html></html>")
+        self.response_cache.pin(urls[2])
+
+        # THEN
+        self.assertEqual(2, self.response_cache.stats()["entries"])
+        self.assertIsNotNone(self.response_cache.get(urls[0]))
+        self.assertIsNone(self.response_cache.get(urls[1]))
+        self.assertIsNotNone(self.response_cache.get(urls[2]))
+
+    @responses.activate
+    def test_get_order_served_from_cache(self):
+        # GIVEN
+        amazon_session = AmazonSession("some-username", "some-password", response_cache=self.response_cache)
+        amazon_session.is_authenticated = True
+        amazon_orders = AmazonOrders(amazon_session)
+        order_id = "112-9685975-5907428"
+        with open(os.path.join(self.RESOURCES_DIR, f"order-details-{order_id}.html"), "r",
+                  encoding="utf-8") as f:
+            resp1 = responses.add(
+                responses.GET,
+                f"{ORDER_DETAILS_URL}?orderID={order_id}",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        amazon_orders.get_order(order_id)
+        order = amazon_orders.get_order(order_id)
+
+        # THEN
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, self.response_cache.hits)
+        self.assertEqual(1, self.response_cache.misses)
@@ -26,6 +26,17 @@ class TestCli(UnitTestCase):
         self.assertEqual(2, response.exit_code)
         self.assertTrue("Usage: " in response.output)
 
+    def test_history_command_all_years_with_dates(self):
+        # WHEN
+        response = self.runner.invoke(amazon_orders_cli,
+                                      ["--username", "some-username", "--password",
+                                       "some-password", "history", "--all-years",
+                                       "--start-date", "2023-01-01"])
+
+        # THEN
+        self.assertEqual(2, response.exit_code)
+        self.assertIn("--start-date and --end-date can't be given with --all-years.", response.output)
+
     @responses.activate
     def test_history_command(self):
         # GIVEN
@@ -0,0 +1,59 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import pickle
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants
+from amazonorders.entity.compact import CompactItem, CompactOrder, compact
+from amazonorders.entity.order import Order
+from tests.unittestcase import UnitTestCase
+
+
+class TestCompact(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-9685975-5907428.html"), "r",
+                  encoding="utf-8") as f:
+            parsed = BeautifulSoup(f.read(), "html.parser")
+        self.order = Order(parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR), full_details=True)
+
+    def test_compact(self):
+        # WHEN
+        compact_order = compact(self.order)
+
+        # THEN
+        self.assertIsInstance(compact_order, CompactOrder)
+        self.assertIsInstance(compact_order.items[0], CompactItem)
+        self.assertFalse(hasattr(compact_order, "__dict__"))
+        self.assertIsNone(compact_order.parsed)
+        self.assertEqual(repr(self.order), repr(compact_order))
+        self.assertEqual(repr(self.order.transactions), repr(compact_order.transactions))
+        self.assertEqual(self.order.subtotals, compact_order.subtotals)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(compact_order, True)
+        self.assert_items_shared_with_shipments(compact_order)
+
+    def test_compact_state_matches(self):
+        # WHEN
+        compact_order = compact(self.order)
+
+        # THEN
+        order_state = {k: v for k, v in self.order.__getstate__().items() if not k.startswith("_")}
+        self.assertEqual(sorted(order_state), sorted(compact_order.__getstate__()))
+        self.assertEqual(self.order.items[0].seller.__getstate__(), compact_order.items[0].seller.__getstate__())
+
+    def test_pickle(self):
+        # GIVEN
+        compact_order = compact(self.order)
+
+        # WHEN
+        unpickled_order = pickle.loads(pickle.dumps(compact_order))
+
+        # THEN
+        self.assertIsInstance(unpickled_order, CompactOrder)
+        self.assertEqual(repr(compact_order), repr(unpickled_order))
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(unpickled_order, True)
+        self.assert_items_shared_with_shipments(unpickled_order)
@@ -0,0 +1,110 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants, css
+from amazonorders.entity.order import Order
+from tests.unittestcase import UnitTestCase
+
+
+class TestCss(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-9685975-5907428.html"), "r",
+                  encoding="utf-8") as f:
+            self.parsed = BeautifulSoup(f.read(), "html.parser")
+
+    def test_compile_selector_registered(self):
+        # WHEN
+        compiled = css.compile_selector(constants.ITEM_ENTITY_SELECTOR)
+
+        # THEN
+        self.assertIs(compiled, css.compile_selector(constants.ITEM_ENTITY_SELECTOR))
+
+    def test_select_matches_bs4(self):
+        for selector in [constants.ITEM_ENTITY_SELECTOR,
+                         constants.SHIPMENT_ENTITY_SELECTOR,
+                         constants.FIELD_ORDER_SHIPPED_DATE_SELECTOR,
+                         constants.FIELD_ORDER_TRANSACTIONS_SELECTOR]:
+            with self.subTest(selector=selector):
+                # WHEN
+                tags = css.select(self.parsed, selector)
+
+                # THEN
+                self.assertEqual(self.parsed.select(selector), tags)
+                self.assertIs(self.parsed.select_one(selector), css.select_one(self.parsed, selector))
+
+    def test_precompile(self):
+        # WHEN
+        count = css.precompile()
+
+        # THEN
+        self.assertGreater(count, 0)
+        hits = css.compile_selector.cache_info().hits
+        css.compile_selector(constants.FIELD_RECIPIENT_NAME_SELECTOR[0])
+        self.assertEqual(hits + 1, css.compile_selector.cache_info().hits)
+
+    def test_selector_overridden_at_runtime(self):
+        # GIVEN
+        order_details_tag = css.select_one(self.parsed, constants.ORDER_DETAILS_ENTITY_SELECTOR)
+        original_selector = constants.FIELD_SHIPMENT_TRACKING_LINK_SELECTOR
+        constants.FIELD_SHIPMENT_TRACKING_LINK_SELECTOR = "span.not-a-track-package-button a"
+
+        # WHEN
+        try:
+            order = Order(order_details_tag, full_details=True)
+            tracking_links = [shipment.tracking_link for shipment in order.shipments]
+        finally:
+            constants.FIELD_SHIPMENT_TRACKING_LINK_SELECTOR = original_selector
+
+        # THEN
+        self.assertEqual([None, None], tracking_links)
+        self.assertIsNotNone(Order(order_details_tag, full_details=True).shipments[0].tracking_link)
+
+    def test_compile_strainer(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2018-0.html"), "r", encoding="utf-8") as f:
+            html = f.read()
+        strainer = css.compile_strainer(*constants.ORDER_HISTORY_PARSE_ONLY_SELECTORS)
+
+        # WHEN
+        parsed = BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+        # THEN
+        self.assertIs(strainer, css.compile_strainer(*constants.ORDER_HISTORY_PARSE_ONLY_SELECTORS))
+        full_parsed = BeautifulSoup(html, "html.parser")
+        self.assertEqual(len(css.select(full_parsed, constants.ORDER_HISTORY_ENTITY_SELECTOR)),
+                         len(css.select(parsed, constants.ORDER_HISTORY_ENTITY_SELECTOR)))
+        self.assertEqual(css.select_one(full_parsed, constants.NEXT_PAGE_LINK_SELECTOR),
+                         css.select_one(parsed, constants.NEXT_PAGE_LINK_SELECTOR))
+        self.assertEqual(css.select_one(full_parsed, constants.HISTORY_ORDER_COUNT_SELECTOR),
+                         css.select_one(parsed, constants.HISTORY_ORDER_COUNT_SELECTOR))
+        self.assertIsNone(parsed.select_one("head"))
+        self.assertLess(len(parsed.find_all()), len(full_parsed.find_all()))
+
+    def test_compile_strainer_matches(self):
+        # GIVEN
+        strainer = css.compile_strainer("div.order", "#orderDetails", "script[id^='shipToData']", "span[hidden]",
+                                        "a[href=\"/next\"]")
+        html = ("<div class='order-card'><div class='a-box order'>1</div></div><p id='orderDetails'>2</p>"
+                "<script id='shipToData-1'>3</script><script id='other'>no</script>"
+                "<span hidden>4</span><span>no</span><a href='/next'>5</a><a href='/next/2'>no</a>")
+
+        # WHEN
+        parsed = BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+        # THEN
+        self.assertEqual(["1", "2", "3", "4", "5"], [tag.string for tag in parsed.contents])
+
+    def test_compile_strainer_invalid(self):
+        for selector in ["div > a", "div a", "div:has(a)", "a[href*='x']", ""]:
+            with self.subTest(selector=selector):
+                # WHEN
+                with self.assertRaises(ValueError):
+                    css.compile_strainer(selector)
+
+        self.assertIsNone(css.compile_strainer())
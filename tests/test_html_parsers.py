@@ -0,0 +1,59 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from amazonorders import constants
+from amazonorders.entity.order import Order
+from amazonorders.entity.parsable import Parsable
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.session import AmazonSession
+from tests.unittestcase import UnitTestCase
+
+
+class TestHtmlParsers(UnitTestCase):
+    def _parse_orders(self, resource, html_parser):
+        with open(os.path.join(self.RESOURCES_DIR, resource), "r", encoding="utf-8") as f:
+            parsed = BeautifulSoup(f.read(), html_parser)
+
+        if resource.startswith("order-details"):
+            return [Order(parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR), full_details=True,
+                          html_parser=html_parser)]
+        else:
+            return [Order(order_tag, html_parser=html_parser)
+                    for order_tag in parsed.select(constants.ORDER_HISTORY_ENTITY_SELECTOR)]
+
+    def _state(self, value):
+        if isinstance(value, Parsable):
+            state = value.__getstate__()
+            state.pop("html_parser", None)
+            # The Item's Shipment back-reference is compared through the Shipment itself
+            state.pop("shipment", None)
+            return {k: self._state(v) for k, v in state.items()}
+        elif isinstance(value, list):
+            return [self._state(v) for v in value]
+        return value
+
+    @unittest.skipIf(builder_registry.lookup("lxml") is None, reason="lxml is not installed")
+    def test_lxml_matches_html_parser(self):
+        for resource in sorted(os.listdir(self.RESOURCES_DIR)):
+            if not resource.startswith("order-"):
+                continue
+
+            with self.subTest(resource=resource):
+                # WHEN
+                orders = self._parse_orders(resource, "html.parser")
+                lxml_orders = self._parse_orders(resource, "lxml")
+
+                # THEN
+                self.assertGreater(len(orders), 0)
+                self.assertEqual(self._state(orders), self._state(lxml_orders))
+
+    def test_unknown_html_parser(self):
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            AmazonSession("some-username", "some-password", html_parser="not-a-parser")
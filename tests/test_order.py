@@ -0,0 +1,67 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import copy
+import os
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants
+from amazonorders.entity.order import Order
+from tests.unittestcase import UnitTestCase
+
+
+class TestOrder(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-9685975-5907428.html"), "r",
+                  encoding="utf-8") as f:
+            self.order_details_tag = BeautifulSoup(f.read(), "html.parser").select_one(
+                constants.ORDER_DETAILS_ENTITY_SELECTOR)
+
+    def _given_clone(self):
+        clone = Order(self.order_details_tag, full_details=True)
+        clone.detach()
+        return clone
+
+    def test_clone_items_matched_by_product(self):
+        # GIVEN
+        clone = self._given_clone()
+        links = [shipment.items[0].link for shipment in clone.shipments]
+        # Titles aren't unique, so Items are matched by their product, even when the links' tracking differs
+        for shipment in clone.shipments:
+            shipment.items[0].title = "Same title"
+            shipment.items[0].link = shipment.items[0].link.replace("/ref=ppx_od_", "/ref=ppx_yo_")
+        clone_items = [shipment.items[0] for shipment in clone.shipments]
+
+        # WHEN
+        order = Order(self.order_details_tag, full_details=True, clone=clone)
+
+        # THEN
+        self.assertEqual(links, [shipment.items[0].link for shipment in order.shipments])
+        self.assertIsNot(order.shipments[0].items[0], order.shipments[1].items[0])
+        self.assertEqual(2, len(order.items))
+        self.assert_items_shared_with_shipments(order)
+        for shipment, clone_item in zip(clone.shipments, clone_items):
+            self.assertIs(shipment, clone_item.shipment)
+            self.assertEqual("Same title", clone_item.title)
+
+    def test_clone_items_mismatched(self):
+        # GIVEN
+        clone = self._given_clone()
+        missing_item = copy.copy(clone.shipments[1].items[0])
+        missing_item.title = "Not on the details page"
+        missing_item.link = "https://www.amazon.com/gp/product/B000000000/ref=ppx_yo_dt_b_asin_title_o00_s00"
+        clone.shipments[1].items = clone.shipments[1].items + [missing_item]
+
+        # WHEN
+        order = Order(self.order_details_tag, full_details=True, clone=clone)
+
+        # THEN
+        self.assertEqual(3, len(order.items))
+        self.assertEqual(2, len(order.shipments[1].items))
+        copied_item = next(item for item in order.items if item.title == "Not on the details page")
+        self.assertIsNot(missing_item, copied_item)
+        self.assertIs(clone.shipments[1], missing_item.shipment)
+        self.assert_items_shared_with_shipments(order)
@@ -1,11 +1,22 @@
 __copyright__ = "Copyright (c) 2024 Alex Laird"
 __license__ = "MIT"
 
+import datetime
+import json
 import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
 
 import responses
 
+from amazonorders import constants, css
 from amazonorders.constants import ORDER_HISTORY_URL, ORDER_DETAILS_URL
+from amazonorders.entity.compact import CompactOrder
 from amazonorders.exception import AmazonOrdersError
 from amazonorders.orders import AmazonOrders
 from amazonorders.session import AmazonSession
@@ -20,11 +31,29 @@ class TestOrders(UnitTestCase):
 
         self.amazon_orders = AmazonOrders(self.amazon_session)
 
+        self.state_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
     def test_get_orders_unauthenticated(self):
         # WHEN
         with self.assertRaises(AmazonOrdersError):
             self.amazon_orders.get_order_history()
 
+    def test_selectors_precompiled(self):
+        # GIVEN
+        css.compile_selector.cache_clear()
+
+        # WHEN
+        AmazonOrders(self.amazon_session)
+
+        # THEN
+        misses = css.compile_selector.cache_info().misses
+        self.assertGreater(misses, 0)
+        css.compile_selector(constants.ORDER_DETAILS_ENTITY_SELECTOR)
+        self.assertEqual(misses, css.compile_selector.cache_info().misses)
+
     @responses.activate
     def test_get_order_history(self):
         # GIVEN
@@ -41,9 +70,52 @@ class TestOrders(UnitTestCase):
         # Giving start_index=0 means we only got the first page, so just 10 results
         self.assertEqual(10, len(orders))
         self.assert_order_112_0399923_3070642(orders[3], False)
+        self.assertIsNone(orders[3].parsed)
+        self.assertIsNone(orders[3].items[0].parsed)
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
 
+    @responses.activate
+    def test_get_order_history_keep_parsed(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders.keep_parsed = True
+        year = 2018
+        start_index = 0
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(year, start_index)
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assertIsNotNone(orders[3].parsed)
+        self.assertIsNotNone(orders[3].parsed.parent)
+        # Only the parts of the page Orders are parsed from are built
+        self.assertIsNone(orders[3].parsed.find_parent("body"))
+        self.assert_order_112_0399923_3070642(orders[3], False)
+
+    @responses.activate
+    def test_get_order_history_compact(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders.compact = True
+        year = 2023
+        start_index = 10
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(year, start_index)
+        self.given_any_order_details_exists("order-details-112-9685975-5907428.html")
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assertIsInstance(orders[3], CompactOrder)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(orders[3], True)
+        self.assert_items_shared_with_shipments(orders[3])
+
     @responses.activate
     def test_get_order_history_paginated(self):
         # GIVEN
@@ -69,6 +141,92 @@ class TestOrders(UnitTestCase):
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(1, resp3.call_count)
 
+    @responses.activate
+    def test_get_order_history_paginated_concurrent(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders.max_workers = 4
+        year = 2010
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(year, 0)
+        # The page is requested by its startIndex, rather than by following the next page link
+        resp3 = self.given_order_history_exists(year, 10)
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year)
+
+        # THEN
+        self.assertEqual(12, len(orders))
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(1, resp3.call_count)
+
+    @responses.activate
+    def test_get_order_history_full_details_concurrent_bounded(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders.max_workers = 4
+        year = 2010
+        self.given_order_history_landing_exists()
+        self.given_order_history_exists(year, 0)
+        with open(os.path.join(self.RESOURCES_DIR, f"order-history-{year}-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp3 = responses.add(
+                responses.GET,
+                f"{ORDER_HISTORY_URL}?timeFilter=year-{year}&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+                body=f.read(),
+                status=200,
+            )
+        self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+        request = self.amazon_session.session.request
+
+        def counting_request(*args, **kwargs):
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            try:
+                time.sleep(0.01)
+                return request(*args, **kwargs)
+            finally:
+                with lock:
+                    in_flight.pop()
+
+        # WHEN
+        with patch.object(self.amazon_session.session, "request", side_effect=counting_request):
+            orders = self.amazon_orders.get_order_history(year=year, full_details=True)
+
+        # THEN
+        self.assertEqual(12, len(orders))
+        self.assertLessEqual(max(max_in_flight), 4)
+        # Pages are requested serially, by following the next page link
+        self.assertEqual(1, resp3.call_count)
+
+    @responses.activate
+    def test_iter_order_history_stops_early(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2010
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(year, 0)
+        resp3 = responses.add(
+            responses.GET,
+            f"{ORDER_HISTORY_URL}?timeFilter=year-{year}&startIndex=10&ref_=ppx_yo2ov_dt_b_pagination_1_2",
+            status=200,
+        )
+
+        # WHEN
+        orders = self.amazon_orders.iter_order_history(year=year)
+        order = next(orders)
+
+        # THEN
+        self.assertIsNotNone(order.order_number)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(0, resp3.call_count)
+
     @responses.activate
     def test_get_order_history_full_details(self):
         # GIVEN
@@ -85,10 +243,67 @@ class TestOrders(UnitTestCase):
         # THEN
         self.assertEqual(10, len(orders))
         self.assert_order_114_9460922_7737063(orders[3], True)
+        self.assertEqual({"Item(s) Subtotal": 38.84, "Shipping & Handling": 0.0, "Subscribe & Save": -5.83,
+                          "Total before tax": 33.01, "Estimated tax to be collected": 2.89, "Grand Total": 35.9},
+                         orders[3].subtotals)
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(10, resp3.call_count)
 
+    @responses.activate
+    def test_get_order_history_full_details_concurrent(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2020
+        start_index = 40
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(year, start_index)
+        resp3 = self.given_any_order_details_exists("order-details-114-9460922-7737063.html")
+        serial_orders = self.amazon_orders.get_order_history(year=year, start_index=start_index)
+        self.amazon_orders.max_workers = 4
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+
+        # THEN
+        self.assertEqual(10, len(orders))
+        self.assertEqual([o.order_number for o in serial_orders], [o.order_number for o in orders])
+        self.assert_order_114_9460922_7737063(orders[3], True)
+        self.assertEqual(2, resp1.call_count)
+        self.assertEqual(2, resp2.call_count)
+        self.assertEqual(10, resp3.call_count)
+
+    @responses.activate
+    def test_get_order_history_full_details_parse_processes(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2023
+        start_index = 10
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(year, start_index)
+        resp3 = self.given_any_order_details_exists("order-details-112-9685975-5907428.html")
+        serial_orders = self.amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+        amazon_orders = AmazonOrders(self.amazon_session, max_workers=4, parse_processes=2)
+        mp_context = amazon_orders._parse_executor._mp_context
+
+        # WHEN
+        try:
+            orders = amazon_orders.get_order_history(year=year, start_index=start_index, full_details=True)
+        finally:
+            amazon_orders.close()
+
+        # THEN
+        # Workers are spawned, as forking while the session's threads hold locks can deadlock
+        self.assertEqual("spawn", mp_context.get_start_method())
+        self.assertEqual(10, len(orders))
+        self.assertEqual([repr(o) for o in serial_orders], [repr(o) for o in orders])
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(orders[3], True)
+        self.assert_items_shared_with_shipments(orders[3])
+        self.assertIsNone(orders[3].parsed)
+        self.assertEqual(2, resp1.call_count)
+        self.assertEqual(2, resp2.call_count)
+        self.assertEqual(20, resp3.call_count)
+
     @responses.activate
     def test_get_order_history_multiple_items(self):
         # GIVEN
@@ -165,6 +380,8 @@ class TestOrders(UnitTestCase):
         # THEN
         self.assertEqual(10, len(orders))
         self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(orders[3], True)
+        self.assert_items_shared_with_shipments(orders[3])
+        self.assertIsNone(orders[3].parsed)
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(10, resp3.call_count)
@@ -188,4 +405,253 @@ class TestOrders(UnitTestCase):
 
         # THEN
         self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assert_items_shared_with_shipments(order)
+        self.assertEqual(1, resp1.call_count)
+
+    @responses.activate
+    def test_get_order_parse_processes(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        order_id = "112-9685975-5907428"
+        with open(os.path.join(self.RESOURCES_DIR, f"order-details-{order_id}.html"), "r",
+                  encoding="utf-8") as f:
+            resp1 = responses.add(
+                responses.GET,
+                f"{ORDER_DETAILS_URL}?orderID={order_id}",
+                body=f.read(),
+                status=200,
+            )
+        amazon_orders = AmazonOrders(self.amazon_session, parse_processes=1)
+
+        # WHEN
+        try:
+            with patch.object(amazon_orders._parse_executor, "submit") as submit_mock:
+                order = amazon_orders.get_order(order_id)
+        finally:
+            amazon_orders.close()
+
+        # THEN
+        # A single page is parsed in this process, rather than waiting on the pool
+        submit_mock.assert_not_called()
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assert_items_shared_with_shipments(order)
+        self.assertEqual(1, resp1.call_count)
+
+    @responses.activate
+    def test_sync(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        state_path = os.path.join(self.state_dir, "sync.json")
+        with open(state_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"some-username": {"order_number": "112-9685975-5907428",
+                                                  "order_placed_date": "2023-12-07",
+                                                  "pending_order_numbers": ["112-2961628-4757846"]}}))
+        resp1 = self.given_order_history_landing_exists()
+        empty_resps = [responses.add(responses.GET, f"{ORDER_HISTORY_URL}?timeFilter=year-{year}",
+                                     body="<html></html>", status=200)
+                       for year in range(datetime.date.today().year, 2023, -1)]
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2023-10.html"), "r",
+                  encoding="utf-8") as f:
+            resp2 = responses.add(responses.GET, f"{ORDER_HISTORY_URL}?timeFilter=year-2023", body=f.read(),
+                                  status=200)
+        resp3 = self.given_any_order_details_exists("order-details-112-9685975-5907428.html")
+
+        # WHEN
+        orders = self.amazon_orders.sync(state_path=state_path)
+
+        # THEN
+        # Only the Orders newer than the high-water mark, and the previously pending Order, are returned
+        self.assertEqual(["112-0069846-3887437", "113-1909885-6198667", "112-4188066-0547448",
+                          "112-9685975-5907428"], [o.order_number for o in orders])
+        self.assertEqual(1, resp1.call_count)
+        # Only years in the history filter are crawled
+        for year, resp in zip(range(datetime.date.today().year, 2023, -1), empty_resps):
+            self.assertEqual(1 if year <= 2024 else 0, resp.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(4, resp3.call_count)
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.loads(f.read())
+        self.assertEqual("112-0069846-3887437", state["some-username"]["order_number"])
+        self.assertEqual(orders[0].order_placed_date.isoformat(), state["some-username"]["order_placed_date"])
+
+    @responses.activate
+    def test_sync_newest_order_without_date(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        state_path = os.path.join(self.state_dir, "sync.json")
+        with open(state_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"some-username": {"order_number": "112-9685975-5907428",
+                                                  "order_placed_date": "2023-12-07"}}))
+        self.given_order_history_landing_exists()
+        responses.add(responses.GET, f"{ORDER_HISTORY_URL}?timeFilter=year-2024", body="<html></html>", status=200)
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2023-10.html"), "r",
+                  encoding="utf-8") as f:
+            responses.add(responses.GET, f"{ORDER_HISTORY_URL}?timeFilter=year-2023", body=f.read(), status=200)
+        self.given_any_order_details_exists("order-details-112-9685975-5907428.html")
+        iter_orders_full_details = self.amazon_orders._iter_orders_full_details
+
+        def iter_orders_full_details_without_first_date(orders):
+            for i, order in enumerate(iter_orders_full_details(orders)):
+                if i == 0:
+                    order.order_placed_date = None
+                yield order
+
+        # WHEN
+        with patch.object(self.amazon_orders, "_iter_orders_full_details",
+                          side_effect=iter_orders_full_details_without_first_date):
+            orders = self.amazon_orders.sync(state_path=state_path)
+
+        # THEN
+        self.assertIsNone(orders[0].order_placed_date)
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.loads(f.read())
+        self.assertEqual(orders[0].order_number, state["some-username"]["order_number"])
+        self.assertEqual(orders[1].order_placed_date.isoformat(), state["some-username"]["order_placed_date"])
+
+    @responses.activate
+    def test_get_available_years(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        resp1 = self.given_order_history_landing_exists()
+
+        # WHEN
+        years = self.amazon_orders.get_available_years()
+
+        # THEN
+        self.assertEqual(list(range(2024, 2006, -1)), years)
+        self.assertEqual(1, resp1.call_count)
+
+    @responses.activate
+    def test_get_all_order_history(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders.max_workers = 4
+        resp1 = self.given_order_history_landing_exists()
+        resp2 = self.given_order_history_exists(2018, 0)
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2020-40.html"), "r",
+                  encoding="utf-8") as f:
+            resp3 = responses.add(responses.GET, f"{ORDER_HISTORY_URL}?timeFilter=year-2020", body=f.read(),
+                                  status=200)
+        # Every other year, and any further pages, are empty
+        resp4 = responses.add(responses.GET, re.compile(f"{ORDER_HISTORY_URL}.*"), body="<html></html>", status=200)
+
+        # WHEN
+        orders = self.amazon_orders.get_all_order_history()
+
+        # THEN
+        self.assertEqual(20, len(orders))
+        self.assertEqual(sorted([o.order_placed_date for o in orders], reverse=True),
+                         [o.order_placed_date for o in orders])
+        self.assertEqual(2020, orders[0].order_placed_date.year)
+        self.assertEqual(2018, orders[-1].order_placed_date.year)
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(1, resp2.call_count)
+        self.assertEqual(1, resp3.call_count)
+        # The 16 other years, and the second page of 2018 and 2020
+        self.assertEqual(18, resp4.call_count)
+
+    def given_dated_order_history_exists(self, year, order_count, with_count=True):
+        order_dates = [datetime.date(year, 12, 31) - datetime.timedelta(days=3 * i) for i in range(order_count)]
+        with open(os.path.join(self.RESOURCES_DIR, "order-history-2010-0.html"), "r", encoding="utf-8") as f:
+            order_html = re.search(r"<div class=\"a-box-group a-spacing-base order js-order-card\">.*?"
+                                   r"(?=<div class=\"a-box-group a-spacing-base order js-order-card\">)",
+                                   f.read(), re.DOTALL).group(0)
+
+        def history_page_callback(request):
+            start_index = int(parse_qs(urlparse(request.url).query).get("startIndex", ["0"])[0])
+            orders_html = "".join(order_html.replace("104-5796370-4938630", f"104-0000000-{i:07d}")
+                                  .replace("November 17, 2010", f"{order_dates[i]:%B} {order_dates[i].day}, {year}")
+                                  for i in range(start_index, min(start_index + 10, order_count)))
+            count_html = f"<span class=\"num-orders\">{order_count} orders</span>" if with_count else ""
+            next_page_html = ""
+            if start_index + 10 < order_count:
+                next_page_url = f"{ORDER_HISTORY_URL}?timeFilter=year-{year}&startIndex={start_index + 10}"
+                next_page_html = f"<ul class=\"a-pagination\"><li class=\"a-last\">" \
+                                 f"<a href=\"{next_page_url}\">Next</a></li></ul>"
+            return 200, {}, f"<html><body>{count_html}{orders_html}{next_page_html}</body></html>"
+
+        responses.add_callback(responses.GET, re.compile(f"{ORDER_HISTORY_URL}.*"), callback=history_page_callback)
+
+        return order_dates
+
+    @responses.activate
+    def test_get_order_history_date_window(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2010
+        resp1 = self.given_order_history_landing_exists()
+        order_dates = self.given_dated_order_history_exists(year, 100)
+        start_date = order_dates[77]
+        end_date = order_dates[71]
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_date=start_date, end_date=end_date)
+
+        # THEN
+        self.assertEqual([f"104-0000000-{i:07d}" for i in range(71, 78)], [o.order_number for o in orders])
         self.assertEqual(1, resp1.call_count)
+        # The first page, and the pages visited by the binary search (the last of which is the window's only page),
+        # rather than all 10
+        history_calls = [c for c in responses.calls if c.request.url.startswith(ORDER_HISTORY_URL)]
+        self.assertEqual(4, len(history_calls))
+
+    @responses.activate
+    def test_iter_order_history_concurrent_stop_early(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders = AmazonOrders(self.amazon_session, max_workers=2)
+        year = 2010
+        self.given_order_history_landing_exists()
+        self.given_dated_order_history_exists(year, 100)
+
+        # WHEN
+        for i, order in enumerate(self.amazon_orders.iter_order_history(year=year)):
+            if i == 10:
+                break
+
+        # THEN
+        # The first page, and no more than max_workers of the 9 remaining pages, rather than all of them
+        history_calls = [c for c in responses.calls if c.request.url.startswith(ORDER_HISTORY_URL)]
+        self.assertLessEqual(len(history_calls), 3)
+
+    @responses.activate
+    def test_get_order_history_date_window_stop_before_date(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        year = 2010
+        self.given_order_history_landing_exists()
+        order_dates = self.given_dated_order_history_exists(year, 100)
+
+        # WHEN
+        orders = self.amazon_orders.get_order_history(year=year, start_date=order_dates[77],
+                                                      end_date=order_dates[71], stop_before_date=order_dates[74])
+
+        # THEN
+        self.assertEqual([f"104-0000000-{i:07d}" for i in range(71, 75)], [o.order_number for o in orders])
+
+    @responses.activate
+    def test_get_order_history_date_window_count_unparsable(self):
+        # GIVEN
+        self.amazon_session.is_authenticated = True
+        self.amazon_orders = AmazonOrders(self.amazon_session, max_workers=4)
+        year = 2010
+        self.given_order_history_landing_exists()
+        order_dates = self.given_dated_order_history_exists(year, 100, with_count=False)
+        resp = self.given_any_order_details_exists("order-details-112-9685975-5907428.html")
+        start_date = order_dates[17]
+        end_date = order_dates[11]
+
+        # WHEN
+        with patch.object(self.amazon_orders, "_iter_orders_full_details",
+                          wraps=self.amazon_orders._iter_orders_full_details) as full_details_mock:
+            orders = self.amazon_orders.get_order_history(year=year, start_date=start_date, end_date=end_date,
+                                                          full_details=True)
+
+        # THEN
+        self.assertEqual(7, len(orders))
+        self.assertEqual(7, resp.call_count)
+        self.assertTrue(full_details_mock.called)
+        # The first page is followed to the second, rather than being requested again
+        history_urls = [c.request.url for c in responses.calls if c.request.url.startswith(ORDER_HISTORY_URL)]
+        self.assertEqual([f"{ORDER_HISTORY_URL}?timeFilter=year-{year}",
+                          f"{ORDER_HISTORY_URL}?timeFilter=year-{year}&startIndex=10"], history_urls)
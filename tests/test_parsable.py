@@ -0,0 +1,91 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import pickle
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants
+from amazonorders.entity.order import Order
+from tests.unittestcase import UnitTestCase
+
+
+class TestParsable(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-9685975-5907428.html"), "r",
+                  encoding="utf-8") as f:
+            parsed = BeautifulSoup(f.read(), "html.parser")
+        self.order_details_tag = parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR)
+
+    def test_lazy_fields_parsed_on_access(self):
+        # GIVEN
+        order = Order(self.order_details_tag, full_details=True)
+        self.assertNotIn("grand_total", order.__dict__)
+        self.assertNotIn("items", order.__dict__)
+
+        # WHEN
+        grand_total = order.grand_total
+
+        # THEN
+        self.assertEqual(46.61, grand_total)
+        self.assertEqual(46.61, order.__dict__["grand_total"])
+        self.assertNotIn("items", order.__dict__)
+        self.assertNotIn("transactions", order.__dict__)
+        self.assertIs(order.recipient, order.recipient)
+
+    def test_lazy_field_set(self):
+        # GIVEN
+        order = Order(self.order_details_tag, full_details=True)
+
+        # WHEN
+        order.grand_total = 1.23
+
+        # THEN
+        self.assertEqual(1.23, order.grand_total)
+
+    def test_lazy_fields_not_details(self):
+        # WHEN
+        order = Order(self.order_details_tag)
+
+        # THEN
+        self.assertIsNone(order.subtotals)
+        self.assertIsNone(order.transactions)
+        self.assertEqual("112-9685975-5907428", order.order_number)
+
+    def test_pickle(self):
+        # GIVEN
+        order = Order(self.order_details_tag, full_details=True)
+
+        # WHEN
+        unpickled_order = pickle.loads(pickle.dumps(order))
+
+        # THEN
+        self.assertIsNone(unpickled_order.parsed)
+        self.assertNotIn("_clone", unpickled_order.__dict__)
+        self.assertNotIn("_rows", unpickled_order.items[0].__dict__)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(unpickled_order, True)
+        self.assertEqual(order.transactions[0].amount, unpickled_order.transactions[0].amount)
+        self.assertIs(unpickled_order.shipments[0], unpickled_order.shipments[0].items[0].shipment)
+
+    def test_detach(self):
+        # GIVEN
+        order = Order(self.order_details_tag, full_details=True)
+
+        # WHEN
+        order.detach()
+        self.order_details_tag.decompose()
+
+        # THEN
+        self.assertIsNone(order.parsed)
+        self.assertNotIn("_clone", order.__dict__)
+        for item in order.items:
+            self.assertIsNone(item.parsed)
+            self.assertNotIn("_rows", item.__dict__)
+            self.assertIsNone(item.seller.parsed)
+        self.assertIsNone(order.recipient.parsed)
+        self.assertIsNone(order.transactions[0].parsed)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
+        self.assert_items_shared_with_shipments(order)
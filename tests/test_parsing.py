@@ -0,0 +1,77 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+from decimal import Decimal
+
+from amazonorders.parsing import parse_date, parse_money
+from tests.unittestcase import UnitTestCase
+
+
+class TestParsing(UnitTestCase):
+    def test_parse_date(self):
+        for value in ["December 7, 2023", "Dec 7, 2023", " dec. 07, 2023 ", "December 7,2023"]:
+            with self.subTest(value=value):
+                # WHEN
+                parsed_date = parse_date(value)
+
+                # THEN
+                self.assertEqual(datetime.date(2023, 12, 7), parsed_date)
+
+        self.assertEqual(datetime.date(2023, 9, 30), parse_date("Sept 30, 2023"))
+
+    def test_parse_date_invalid(self):
+        for value in ["", "December 2023", "Decembre 7, 2023", "February 30, 2023", "Items shipped: Dec 7, 2023"]:
+            with self.subTest(value=value):
+                # WHEN
+                with self.assertRaises(ValueError):
+                    parse_date(value)
+
+    def test_parse_money(self):
+        for value, expected in [("$46.61", 46.61),
+                                ("$1,234.56", 1234.56),
+                                ("-$4.99", -4.99),
+                                ("$-4.99", -4.99),
+                                ("($4.99)", -4.99),
+                                ("€1.234,56", 1234.56),
+                                ("12,50 €", 12.5),
+                                ("£3", 3.0),
+                                ("CDN$ 5.10", 5.1),
+                                (" 46.61 ", 46.61)]:
+            with self.subTest(value=value):
+                # WHEN
+                amount = parse_money(value)
+
+                # THEN
+                self.assertEqual(expected, amount)
+
+    def test_parse_money_in_text(self):
+        for value, expected in [("2 items: $1,234.56", 1234.56),
+                                ("Grand Total: $46.61", 46.61),
+                                ("Item(s) Subtotal (3 items): -$4.99", -4.99),
+                                ("Gesamtsumme (2 Artikel): 12,50 €", 12.5),
+                                ("Sold by 123 Store, $5 each", 5.0),
+                                ("Qty 2 $3.00", 3.0),
+                                ("2 x $3.00", 3.0),
+                                ("Menge 2 3,00 €", 3.0)]:
+            with self.subTest(value=value):
+                # WHEN
+                amount = parse_money(value)
+
+                # THEN
+                self.assertEqual(expected, amount)
+
+    def test_parse_money_as_decimal(self):
+        # WHEN
+        amount = parse_money("$1,234.10", as_decimal=True)
+
+        # THEN
+        self.assertEqual(Decimal("1234.10"), amount)
+        self.assertIsInstance(amount, Decimal)
+
+    def test_parse_money_invalid(self):
+        for value in ["", "FREE", "$", "2 items", "Qty: 3, total pending"]:
+            with self.subTest(value=value):
+                # WHEN
+                with self.assertRaises(ValueError):
+                    parse_money(value)
@@ -0,0 +1,89 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+from amazonorders.constants import ORDER_DETAILS_URL
+from amazonorders.ratelimit import RateLimiter
+from amazonorders.session import AmazonSession, get_rate_limit_state_path
+from tests.unittestcase import UnitTestCase
+
+
+class TestRateLimit(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.state_dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.state_dir, "rate-limit.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def test_burst_then_wait(self):
+        # GIVEN
+        rate_limiter = RateLimiter(requests_per_second=10, burst=2)
+
+        # WHEN
+        waits = [rate_limiter.reserve() for _ in range(4)]
+
+        # THEN
+        self.assertEqual([0, 0], waits[:2])
+        self.assertAlmostEqual(0.1, waits[2], delta=0.02)
+        self.assertAlmostEqual(0.2, waits[3], delta=0.02)
+        stats = rate_limiter.stats()
+        self.assertEqual(4, stats["requests"])
+        self.assertEqual(2, stats["waits"])
+        self.assertAlmostEqual(0.2, stats["max_wait"], delta=0.02)
+
+    def test_acquire_threads(self):
+        # GIVEN
+        rate_limiter = RateLimiter(requests_per_second=50, burst=1)
+
+        # WHEN
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            waits = list(executor.map(lambda _: rate_limiter.acquire(), range(5)))
+
+        # THEN
+        self.assertEqual(5, rate_limiter.requests)
+        self.assertGreater(max(waits), 0)
+        self.assertLessEqual(max(waits), 0.08 + 0.01)
+
+    def test_shared_state_path(self):
+        # GIVEN
+        # Separate limiters on the same state path stand in for separate processes
+        rate_limiter_1 = RateLimiter(requests_per_second=10, burst=1, state_path=self.state_path)
+        rate_limiter_2 = RateLimiter(requests_per_second=10, burst=1, state_path=self.state_path)
+
+        # WHEN
+        wait_1 = rate_limiter_1.reserve()
+        wait_2 = rate_limiter_2.reserve()
+
+        # THEN
+        self.assertEqual(0, wait_1)
+        self.assertAlmostEqual(0.1, wait_2, delta=0.02)
+        self.assertTrue(os.path.exists(self.state_path))
+
+    @responses.activate
+    def test_session_rate_limited(self):
+        # GIVEN
+        cookie_jar_path = os.path.join(self.state_dir, "cookies.json")
+        rate_limiter = RateLimiter(requests_per_second=50, burst=1)
+        amazon_session = AmazonSession("some-username", "some-password", cookie_jar_path=cookie_jar_path,
+                                       rate_limiter=rate_limiter)
+        url = f"{ORDER_DETAILS_URL}?orderID=112-9685975-5907428"
+        resp1 = responses.add(responses.GET, url, body="<html></html>", status=200)
+
+        # WHEN
+        for _ in range(3):
+            amazon_session.get(url)
+
+        # THEN
+        self.assertEqual(get_rate_limit_state_path(cookie_jar_path), rate_limiter.state_path)
+        self.assertEqual(3, resp1.call_count)
+        self.assertEqual(3, rate_limiter.requests)
+        self.assertEqual(2, rate_limiter.waits)
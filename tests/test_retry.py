@@ -0,0 +1,108 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import email.utils
+
+import responses
+
+from amazonorders.constants import ORDER_DETAILS_URL, SIGN_IN_REDIRECT_URL
+from amazonorders.exception import AmazonOrdersError
+from amazonorders.retry import RetryPolicy, parse_retry_after
+from amazonorders.session import AmazonSession
+from tests.unittestcase import UnitTestCase
+
+
+class TestRetry(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.retry_policy = RetryPolicy(max_retries=2, backoff_factor=0)
+        self.amazon_session = AmazonSession("some-username", "some-password", retry_policy=self.retry_policy)
+        self.url = f"{ORDER_DETAILS_URL}?orderID=112-9685975-5907428"
+
+    @responses.activate
+    def test_retry_status(self):
+        # GIVEN
+        responses.add(responses.GET, self.url, status=503)
+        responses.add(responses.GET, self.url, status=503)
+        responses.add(responses.GET, self.url, body="<html></html>", status=200)
+
+        # WHEN
+        response = self.amazon_session.get(self.url)
+
+        # THEN
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual({"retries": 2, "retries_by_reason": {"503": 2}, "exhausted": 0, "total_backoff": 0},
+                         self.retry_policy.stats())
+
+    @responses.activate
+    def test_retry_status_exhausted(self):
+        # GIVEN
+        for _ in range(3):
+            responses.add(responses.GET, self.url, status=500)
+
+        # WHEN
+        response = self.amazon_session.get(self.url)
+
+        # THEN
+        self.assertEqual(500, response.status_code)
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(1, self.retry_policy.exhausted)
+
+    @responses.activate
+    def test_retry_interstitial(self):
+        # GIVEN
+        responses.add(responses.GET, self.url, body="<html><h1>Sorry! Something went wrong!</h1></html>",
+                      status=200)
+        responses.add(responses.GET, self.url, body="<html></html>", status=200)
+
+        # WHEN
+        self.amazon_session.get(self.url)
+
+        # THEN
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual({"interstitial": 1}, self.retry_policy.retries_by_reason)
+
+    @responses.activate
+    def test_retry_interstitial_exhausted(self):
+        # GIVEN
+        responses.add(responses.GET, self.url, body="<html><h1>Sorry! Something went wrong!</h1></html>",
+                      status=200)
+
+        # WHEN
+        with self.assertRaises(AmazonOrdersError):
+            self.amazon_session.get(self.url)
+
+        # THEN
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(1, self.retry_policy.exhausted)
+
+    @responses.activate
+    def test_post_not_retried(self):
+        # GIVEN
+        responses.add(responses.POST, SIGN_IN_REDIRECT_URL, status=503)
+
+        # WHEN
+        response = self.amazon_session.post(SIGN_IN_REDIRECT_URL)
+
+        # THEN
+        self.assertEqual(503, response.status_code)
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(0, self.retry_policy.retries)
+
+    def test_backoff(self):
+        # GIVEN
+        retry_policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+        retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+
+        # WHEN
+        backoffs = [retry_policy.get_backoff(attempt) for attempt in range(4)]
+
+        # THEN
+        self.assertEqual([1, 2, 4, 5], backoffs)
+        self.assertEqual(3, retry_policy.get_backoff(0, "3"))
+        self.assertEqual(5, retry_policy.get_backoff(0, "120"))
+        self.assertAlmostEqual(30, parse_retry_after(email.utils.format_datetime(retry_at)), delta=2)
+        self.assertIsNone(parse_retry_after("not-a-date"))
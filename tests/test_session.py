@@ -3,13 +3,16 @@ __license__ = "MIT"
 
 import os
 import sys
+import threading
 import unittest
 from unittest.mock import patch
 
 import responses
+from bs4 import BeautifulSoup
 from responses.matchers import query_string_matcher, urlencoded_params_matcher
 
-from amazonorders.constants import BASE_URL, SIGN_IN_REDIRECT_URL
+from amazonorders import css
+from amazonorders.constants import BASE_URL, SIGN_IN_REDIRECT_URL, SIGN_OUT_URL
 from amazonorders.exception import AmazonOrdersAuthError
 from amazonorders.session import AmazonSession
 from tests.unittestcase import UnitTestCase
@@ -375,3 +378,121 @@ class TestSession(UnitTestCase):
         self.assertEqual(1, resp1.call_count)
         self.assertEqual(1, resp2.call_count)
         self.assertEqual(1, resp3.call_count)
+
+    @responses.activate
+    def test_last_response_parsed_lazily(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "signin.html"), "r", encoding="utf-8") as f:
+            resp1 = responses.add(
+                responses.GET,
+                f"{BASE_URL}/gp/sign-in.html",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        with patch("amazonorders.session.BeautifulSoup", wraps=BeautifulSoup) as beautiful_soup_mock:
+            self.amazon_session.get(f"{BASE_URL}/gp/sign-in.html")
+            parse_count_after_request = beautiful_soup_mock.call_count
+            parsed = self.amazon_session.last_response_parsed
+
+        # THEN
+        self.assertEqual(1, resp1.call_count)
+        self.assertEqual(0, parse_count_after_request)
+        self.assertEqual(1, beautiful_soup_mock.call_count)
+        self.assertIs(parsed, self.amazon_session.last_response_parsed)
+        self.assertIsNotNone(parsed.select_one("form[name='signIn']"))
+
+    @responses.activate
+    def test_last_response_parsed_only(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "signin.html"), "r", encoding="utf-8") as f:
+            responses.add(
+                responses.GET,
+                f"{BASE_URL}/gp/sign-in.html",
+                body=f.read(),
+                status=200,
+            )
+
+        # WHEN
+        self.amazon_session.get(f"{BASE_URL}/gp/sign-in.html", parse_only=css.compile_strainer("form"))
+        parsed_only = self.amazon_session.last_response_parsed
+        self.amazon_session.get(f"{BASE_URL}/gp/sign-in.html")
+        parsed = self.amazon_session.last_response_parsed
+
+        # THEN
+        self.assertIsNotNone(parsed_only.select_one("form[name='signIn']"))
+        self.assertIsNone(parsed_only.select_one("head"))
+        self.assertIsNotNone(parsed.select_one("head"))
+
+    def test_last_response_before_request(self):
+        # GIVEN
+        worker_results = []
+
+        def read_last_response():
+            worker_results.append((self.amazon_session.last_response, self.amazon_session.last_response_parsed))
+
+        # WHEN
+        worker = threading.Thread(target=read_last_response)
+        worker.start()
+        worker.join()
+
+        # THEN
+        self.assertIsNone(self.amazon_session.last_response)
+        self.assertIsNone(self.amazon_session.last_response_parsed)
+        self.assertEqual([(None, None)], worker_results)
+
+    def test_connection_pool(self):
+        # WHEN
+        amazon_session = AmazonSession("some-username", "some-password", pool_connections=2, pool_maxsize=20)
+
+        # THEN
+        adapter = amazon_session.session.get_adapter(BASE_URL)
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertEqual(20, adapter._pool_maxsize)
+
+    @responses.activate
+    def test_stats(self):
+        # GIVEN
+        responses.add(responses.GET, f"{BASE_URL}/gp/sign-in.html", body="<html></html>", status=200)
+
+        # WHEN
+        self.amazon_session.get(f"{BASE_URL}/gp/sign-in.html")
+        self.amazon_session.get(f"{BASE_URL}/gp/sign-in.html")
+
+        # THEN
+        stats = self.amazon_session.stats()
+        self.assertEqual(2, stats["requests"])
+        self.assertGreaterEqual(stats["total_elapsed"], stats["max_elapsed"])
+        self.assertGreaterEqual(stats["max_elapsed"], 0)
+        # The mocked adapter never opens a real connection
+        self.assertEqual(0, stats["connections"])
+
+    @responses.activate
+    def test_timeouts(self):
+        # GIVEN
+        amazon_session = AmazonSession("some-username", "some-password", connect_timeout=3.5, read_timeout=20)
+        responses.add(responses.GET, f"{BASE_URL}/gp/sign-in.html", body="<html></html>", status=200)
+
+        # WHEN
+        with patch.object(amazon_session.session, "request", wraps=amazon_session.session.request) as request_mock:
+            amazon_session.get(f"{BASE_URL}/gp/sign-in.html")
+
+        # THEN
+        self.assertEqual((3.5, 20), request_mock.call_args.kwargs["timeout"])
+
+    @responses.activate
+    def test_logout_reuses_session(self):
+        # GIVEN
+        self.amazon_session.session.cookies.set("session-token", "some-token")
+        session = self.amazon_session.session
+        resp1 = responses.add(responses.GET, SIGN_OUT_URL, body="<html></html>", status=200)
+
+        # WHEN
+        self.amazon_session.logout()
+
+        # THEN
+        self.assertEqual(1, resp1.call_count)
+        self.assertIs(session, self.amazon_session.session)
+        self.assertEqual(0, len(self.amazon_session.session.cookies))
+        self.assertFalse(self.amazon_session.is_authenticated)
@@ -0,0 +1,127 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import os
+import shutil
+import tempfile
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants
+from amazonorders.entity.order import Order
+from amazonorders.store import OrderStore
+from tests.unittestcase import UnitTestCase
+
+
+class TestStore(UnitTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.store_dir = tempfile.mkdtemp()
+        self.order_store = OrderStore(os.path.join(self.store_dir, "orders.sqlite3"))
+
+    def tearDown(self):
+        self.order_store.close()
+        shutil.rmtree(self.store_dir)
+
+    def _parse_orders(self, resource):
+        with open(os.path.join(self.RESOURCES_DIR, resource), "r", encoding="utf-8") as f:
+            parsed = BeautifulSoup(f.read(), "html.parser")
+
+        if resource.startswith("order-details"):
+            return [Order(parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR), full_details=True)]
+        else:
+            return [Order(order_tag) for order_tag in parsed.select(constants.ORDER_HISTORY_ENTITY_SELECTOR)]
+
+    def test_upsert_and_get_order(self):
+        # GIVEN
+        order = self._parse_orders("order-details-112-9685975-5907428.html")[0]
+
+        # WHEN
+        count = self.order_store.upsert([order])
+        stored_order = self.order_store.get_order("112-9685975-5907428")
+
+        # THEN
+        self.assertEqual(1, count)
+        self.assertIsNone(stored_order.parsed)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(stored_order, True)
+        self.assertEqual(order.transactions[0].amount, stored_order.transactions[0].amount)
+        self.assertEqual(order.items[0].seller.name, stored_order.items[0].seller.name)
+        self.assertEqual(order.subtotals, stored_order.subtotals)
+        self.assert_items_shared_with_shipments(stored_order)
+        self.assertIsNone(self.order_store.get_order("not-an-order"))
+
+    def test_upsert_replaces(self):
+        # GIVEN
+        history_orders = self._parse_orders("order-history-2023-10.html")
+        self.order_store.batch_size = 3
+        self.order_store.upsert(history_orders)
+        order = self._parse_orders("order-details-112-9685975-5907428.html")[0]
+
+        # WHEN
+        self.order_store.upsert([order])
+
+        # THEN
+        self.assertEqual(10, self.order_store.count())
+        stored_order = self.order_store.get_order("112-9685975-5907428")
+        self.assertTrue(stored_order.full_details)
+        self.assertEqual(2, len(stored_order.items))
+        self.assertEqual(2, len(stored_order.shipments))
+
+    def test_query_orders(self):
+        # GIVEN
+        self.order_store.upsert(self._parse_orders("order-history-2023-10.html"))
+        self.order_store.upsert(self._parse_orders("order-history-2020-50.html"))
+
+        # WHEN
+        orders = self.order_store.query_orders()
+        orders_2023 = self.order_store.query_orders(start_date=datetime.date(2023, 1, 1),
+                                                    end_date=datetime.date(2023, 12, 31))
+        cadeya_orders = self.order_store.query_orders(item_title_contains="cadeya")
+
+        # THEN
+        self.assertEqual(20, len(orders))
+        self.assertEqual(sorted([o.order_placed_date for o in orders], reverse=True),
+                         [o.order_placed_date for o in orders])
+        self.assertTrue(0 < len(orders_2023) < 20)
+        self.assertTrue(all(o.order_placed_date.year == 2023 for o in orders_2023))
+        self.assertIn("112-9685975-5907428", [o.order_number for o in cadeya_orders])
+
+    def test_query_orders_by_seller(self):
+        # GIVEN
+        order = self._parse_orders("order-details-112-9685975-5907428.html")[0]
+        self.order_store.upsert([order])
+        seller_name = next(i.seller.name for i in order.items if i.seller)
+
+        # WHEN
+        orders = self.order_store.query_orders(seller=seller_name)
+
+        # THEN
+        self.assertEqual(["112-9685975-5907428"], [o.order_number for o in orders])
+        self.assertEqual([], self.order_store.query_orders(seller="not-a-seller"))
+
+    def test_spend_by_month(self):
+        # GIVEN
+        orders = self._parse_orders("order-history-2023-10.html")
+        self.order_store.upsert(orders)
+
+        # WHEN
+        spend = self.order_store.spend_by_month(year=2023)
+
+        # THEN
+        self.assertEqual(round(sum(o.grand_total for o in orders if o.order_placed_date.year == 2023), 2),
+                         round(sum(spend.values()), 2))
+        self.assertTrue(all(month.startswith("2023-") for month in spend))
+
+    def test_spend_by_month_without_grand_totals(self):
+        # GIVEN
+        order = self._parse_orders("order-details-112-9685975-5907428.html")[0]
+        order.grand_total = None
+        self.order_store.upsert([order])
+
+        # WHEN
+        spend = self.order_store.spend_by_month()
+
+        # THEN
+        self.assertEqual({order.order_placed_date.strftime("%Y-%m"): 0}, spend)
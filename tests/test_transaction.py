@@ -0,0 +1,116 @@
+__copyright__ = "Copyright (c) 2024 Alex Laird"
+__license__ = "MIT"
+
+import datetime
+import os
+
+from bs4 import BeautifulSoup
+
+from amazonorders import constants
+from amazonorders.entity.order import Order
+from amazonorders.entity.transaction import Transaction
+from tests.unittestcase import UnitTestCase
+
+
+def _transaction_row(purpose, details):
+    return BeautifulSoup(f"""<div class="a-row">
+<span class="a-color-secondary">
+        {purpose}
+    </span>
+<span>
+        {details}
+    </span>
+</div>""", "html.parser").div
+
+
+class TestTransaction(UnitTestCase):
+    def test_items_shipped(self):
+        # GIVEN
+        parsed = _transaction_row("Items shipped:", "December 7, 2023\n - \nAmericanExpress ending in 1234:\n $46.26")
+
+        # WHEN
+        transaction = Transaction(parsed)
+
+        # THEN
+        self.assertEqual("purchase", transaction.type)
+        self.assertEqual("Items shipped", transaction.purpose)
+        self.assertEqual(datetime.date(2023, 12, 7), transaction.date)
+        self.assertEqual("AmericanExpress ending in 1234", transaction.source)
+        self.assertEqual(46.26, transaction.amount)
+
+    def test_refund(self):
+        # GIVEN
+        parsed = _transaction_row("Refund:", "Completed November 2, 2020\n - \n$76.11")
+
+        # WHEN
+        transaction = Transaction(parsed)
+
+        # THEN
+        self.assertEqual("refund", transaction.type)
+        self.assertEqual("Refund", transaction.purpose)
+        self.assertEqual(datetime.date(2020, 11, 2), transaction.date)
+        self.assertIsNone(transaction.source)
+        self.assertEqual(76.11, transaction.amount)
+
+    def test_known_types(self):
+        for purpose, expected_type in [("Partial charge:", "charge"),
+                                       ("Gift Card:", "gift card"),
+                                       ("Promotion:", "promotion")]:
+            with self.subTest(purpose=purpose):
+                # GIVEN
+                parsed = _transaction_row(purpose, "Jan 3, 2024 - Visa ending in 4321: $1,204.50")
+
+                # WHEN
+                transaction = Transaction(parsed)
+
+                # THEN
+                self.assertEqual(expected_type, transaction.type)
+                self.assertEqual(datetime.date(2024, 1, 3), transaction.date)
+                self.assertEqual("Visa ending in 4321", transaction.source)
+                self.assertEqual(1204.50, transaction.amount)
+
+    def test_unknown_purpose(self):
+        # GIVEN
+        parsed = _transaction_row("Store credit:", "March 4, 2022 - $5.00")
+
+        # WHEN
+        transaction = Transaction(parsed)
+
+        # THEN
+        self.assertIsNone(transaction.type)
+        self.assertEqual("Store credit", transaction.purpose)
+        self.assertEqual(datetime.date(2022, 3, 4), transaction.date)
+        self.assertEqual(5.00, transaction.amount)
+
+    def test_unparsable_row(self):
+        # GIVEN
+        parsed = _transaction_row("Something new", "happened to this order")
+
+        # WHEN
+        transaction = Transaction(parsed)
+
+        # THEN
+        self.assertEqual("Something new happened to this order", transaction.text)
+        self.assertIsNone(transaction.type)
+        self.assertIsNone(transaction.purpose)
+        self.assertIsNone(transaction.date)
+        self.assertIsNone(transaction.source)
+        self.assertIsNone(transaction.amount)
+
+    def test_order_with_unknown_transaction(self):
+        # GIVEN
+        with open(os.path.join(self.RESOURCES_DIR, "order-details-112-9685975-5907428.html"), "r",
+                  encoding="utf-8") as f:
+            parsed = BeautifulSoup(f.read(), "html.parser")
+        known_row = parsed.select_one(constants.FIELD_ORDER_TRANSACTIONS_SELECTOR)
+        known_row.insert_after(_transaction_row("Something new", "happened to this order"))
+
+        # WHEN
+        order = Order(parsed.select_one(constants.ORDER_DETAILS_ENTITY_SELECTOR), full_details=True)
+
+        # THEN
+        self.assertEqual(2, len(order.transactions))
+        self.assertIsNone(order.transactions[0].type)
+        self.assertEqual("purchase", order.transactions[1].type)
+        self.assertEqual(46.26, order.transactions[1].amount)
+        self.assert_order_112_9685975_5907428_multiple_items_shipments_sellers(order, True)
@@ -121,6 +121,13 @@ class TestCase(unittest.TestCase):
         self.assertEqual("112-8888666-5244209", order.order_number)
         self.assertEqual(2, order.items[0].quantity)
 
+    def assert_items_shared_with_shipments(self, order):
+        self.assertGreater(len(order.shipments), 0)
+        for shipment in order.shipments:
+            for item in shipment.items:
+                self.assertIs(shipment, item.shipment)
+                self.assertTrue(any(item is order_item for order_item in order.items))
+
     def assert_order_112_9685975_5907428_multiple_items_shipments_sellers(self, order, full_details):
         self.assertEqual(46.61, order.grand_total)
         self.assertEqual("112-9685975-5907428", order.order_number)